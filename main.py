@@ -10,85 +10,87 @@ Summary
 - Orchestrates metric execution and output generation.
 """
 
-import multiprocessing as mp
 import sys
-import time
-from typing import Any
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 
-from src.cli.cli import parse_args, parse_url_file
-from src.cli.output import build_output
+from huggingface_hub import constants as hf_constants
+
+from src.async_executor import AsyncExecutor
+from src.cache import configure_cache
+from src.cli.cli import CLIArgs, iter_url_file, parse_args
+from src.cli.output import NDJSONWriter
 from src.git import validate_github_token
+from src.lint import configure_lint
 from src.logging import setup_logger, validate_log_file
-from src.metrics.bus_factor import BusFactorMetric
-from src.metrics.code_quality import CodeQualityMetric
-from src.metrics.dataset_and_code import DatasetAndCodeMetric
-from src.metrics.dataset_quality import DatasetQualityMetric
-from src.metrics.license import LicenseMetric
-from src.metrics.performance_claims import PerformanceClaimsMetric
-from src.metrics.ramp_up_time import RampUpTimeMetric
-from src.metrics.size import SizeMetric
-
-
-def run_metric(metric: Any) -> Any:
-    metric.run()
-    return metric
+from src.metrics.llm import GENAI_URL
+from src.ratelimit import configure_ratelimit
+from src.scheduler import WEIGHTS, BatchScheduler
+from src.sessions import GITHUB_API_URL, configure_sessions
+from src.state import ScoreState
+from src.stats import RunStats, configure_stats
+from src.tracing import TraceWriter, configure_tracing
+from src.transport import configure_transport
+
+
+def configure_process(cli_args: CLIArgs) -> None:
+    """Per-process setup; runs in the main process and in every pool worker."""
+    configure_cache(cli_args.cache_dir)
+    configure_sessions(cli_args.pool_size, cli_args.retries)
+    # Before the transport hooks so replayed calls are traced and counted too
+    upstreams = {"hub": hf_constants.ENDPOINT, "github": GITHUB_API_URL, "genai": GENAI_URL}
+    configure_tracing(cli_args.trace_file is not None)
+    configure_stats(cli_args.stats_file is not None, upstreams)
+    # Inside the stats hook: a retried request counts once, plus its retries
+    configure_ratelimit(True, upstreams, cli_args.pool_size, cli_args.retries)
+    configure_transport(cli_args.record_dir, cli_args.replay_dir, cli_args.replay_latency)
+    configure_lint(cli_args.lint_jobs)
+
+
+def create_executor(cli_args: CLIArgs) -> Executor:
+    """One long-lived executor for the whole batch."""
+    if cli_args.engine == "async":
+        return AsyncExecutor(concurrency=cli_args.concurrency)
+    return ProcessPoolExecutor(
+        max_workers=max(1, cli_args.parallelism),
+        initializer=configure_process,
+        initargs=(cli_args,),
+    )
 
 
 def main(argv=None):
     log_file = validate_log_file()
+    cli_args = parse_args(argv)
+    if cli_args.command == "process":
+        # Before the token check so it is recorded / replayed as well
+        configure_process(cli_args)
     validate_github_token()
 
     setup_logger(log_file)
 
-    cli_args = parse_args(argv)
-
     if cli_args.command == "process":
-        lines = parse_url_file(cli_args.url_file)
-
-        # Define metric weights (adjust as needed)
-        weights = {
-            "ramp_up_time": 0.1,
-            "bus_factor": 0.15,
-            "performance_claims": 0.1,
-            "license": 0.1,
-            "size_score": 0.1,
-            "dataset_and_code_score": 0.15,
-            "dataset_quality": 0.15,
-            "code_quality": 0.15,
-        }
-
-        results = []
-        for line in lines:
-            code_url, dataset_url, model_url = line
-
-            metrics = [
-                RampUpTimeMetric(model_url),
-                BusFactorMetric(code_url, model_url),
-                PerformanceClaimsMetric(model_url),
-                LicenseMetric(model_url),
-                SizeMetric(model_url),
-                DatasetAndCodeMetric(model_url),
-                DatasetQualityMetric(dataset_url),
-                CodeQualityMetric(code_url, model_url),
-            ]
-
-            output_str = ""
-            # If line contains a model url, process it
-            if model_url:
-                start = time.time()
-                with mp.Pool(processes=min(len(metrics), mp.cpu_count())) as pool:
-                    metrics = pool.map(run_metric, metrics)
-                net_latency = int((time.time() - start) * 1000)
-
-                output_str = build_output(
-                    model_url, metrics, weights, net_latency)
-                results.append(output_str)
-            if not model_url:
-                print(f"Skipping line (no model url): {lines}", file=sys.stderr)
-                continue
-
-        for r in results:
-            print(r)
+        lines = iter_url_file(cli_args.url_file)
+
+        state = ScoreState(cli_args.state_file) if cli_args.state_file else None
+        stats = RunStats() if cli_args.stats_file else None
+
+        # Records are written as each model finishes; nothing is accumulated
+        trace = TraceWriter(cli_args.trace_file, cli_args.trace_format) if cli_args.trace_file else None
+        with NDJSONWriter(cli_args.output, ordered=cli_args.ordered) as writer, trace or nullcontext(), \
+                create_executor(cli_args) as executor:
+            scheduler = BatchScheduler(executor, WEIGHTS, state=state, llm_batch=cli_args.llm_batch,
+                                       max_inflight=cli_args.max_inflight,
+                                       metric_timeout=cli_args.metric_timeout,
+                                       model_timeout=cli_args.model_timeout,
+                                       trace=trace, stats=stats, backlog=writer.backlog)
+            for index, record in scheduler.run(lines):
+                writer.write(index, record)
+
+        if state is not None:
+            state.save()
+        # After the executor closed, so the pool workers' CPU time is counted
+        if stats is not None:
+            stats.write(cli_args.stats_file)
 
 
 # Allows us to run with 'python3 main.py [args]'
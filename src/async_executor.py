@@ -0,0 +1,73 @@
+"""
+async_executor.py
+-------------------
+Asyncio-based execution engine for network-bound metrics.
+
+Summary
+- Runs a single event loop on a background thread and exposes it through
+  the concurrent.futures.Executor interface, so BatchScheduler can drive it
+  exactly like a process pool.
+- Owns one aiohttp.ClientSession shared by every task in the batch, built
+  by src/sessions.py with the configured per-host pool size.
+- A semaphore caps the number of tasks in flight (--concurrency).
+- Coroutine tasks (Metric.run_async) run on the loop directly; blocking
+  tasks (e.g. the metadata prefetch) run in a thread pool of the same size.
+
+Usage:
+    with AsyncExecutor(concurrency=128) as executor:
+        for index, record in BatchScheduler(executor).run(lines):
+            ...
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+import aiohttp
+
+from src.sessions import create_aiohttp_session
+
+
+class AsyncExecutor(Executor):
+    def __init__(self, concurrency: int = 64):
+        self.concurrency = max(1, concurrency)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(ThreadPoolExecutor(max_workers=self.concurrency))
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(), self._loop).result()
+
+    async def _open(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.session = create_aiohttp_session(self.concurrency)
+
+    async def _guarded(self, coro: Awaitable[Any]) -> Any:
+        async with self._semaphore:
+            return await coro
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """Run a blocking callable in the loop's thread pool."""
+        return asyncio.run_coroutine_threadsafe(
+            self._guarded(asyncio.to_thread(fn, *args, **kwargs)), self._loop
+        )
+
+    def submit_coroutine(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> Future:
+        """Run `fn(*args, session)` on the event loop."""
+        return asyncio.run_coroutine_threadsafe(
+            self._guarded(fn(*args, self.session)), self._loop
+        )
+
+    async def _close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+        await self._loop.shutdown_default_executor()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
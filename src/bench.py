@@ -0,0 +1,191 @@
+"""
+bench.py
+----------
+End-to-end benchmark over synthetic URL manifests (./run bench).
+
+Summary
+- Generates manifests of 1, 100 and 10k lines (configurable) with a seeded
+  mix of code/dataset/model columns, including lines with no model.
+- Runs the real pipeline (main.py in a subprocess, --no-cache) against the
+  local stub server (src/stub_server.py), redirected via HF_ENDPOINT,
+  GITHUB_API_URL and GENAI_URL. The stub's latency, error rate, rate limit
+  and payload flags are accepted here too.
+- Reports throughput, p50/p95/p99 latency per metric (from the *_latency
+  fields of the NDJSON records), peak RSS and CPU time of the run.
+- Saves everything as JSON (--out) and, with --baseline, prints the
+  throughput change against a previous results file.
+
+Usage:
+    ./run bench [--sizes 1,100,10000] [--out bench.json] [--baseline old.json]
+                [--latency-ms 80 --error-rate 0.01 ...]
+                [-- extra main.py args, e.g. --engine async -p 8]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from src.stats import percentile
+from src.stub_server import StubServer, add_arguments, config_from_args
+
+DEFAULT_SIZES = (1, 100, 10000)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Relative weight of each column mix in generated manifests
+LINE_MIXES = [
+    ((True, True, True), 4),    # code, dataset, model
+    ((False, False, True), 3),  # model only
+    ((True, False, True), 2),   # code + model
+    ((False, True, True), 2),   # dataset + model
+    ((True, True, False), 1),   # no model -> skipped
+]
+
+
+def generate_manifest(path: str, lines: int, seed: int = 0) -> None:
+    """Write a URL file of `lines` synthetic lines with varied column mixes."""
+    rng = random.Random(seed)
+    mixes, weights = zip(*LINE_MIXES)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(lines):
+            has_code, has_dataset, has_model = rng.choices(mixes, weights)[0]
+            owner = f"org{rng.randrange(50)}"
+            code = f"https://github.com/{owner}/repo{i}" if has_code else ""
+            dataset = f"https://huggingface.co/datasets/{owner}/data{rng.randrange(200)}" if has_dataset else ""
+            model = f"https://huggingface.co/{owner}/model{i}" if has_model else ""
+            f.write(f"{code},{dataset},{model}\n")
+
+
+def summarize_latencies(records_path: str) -> Dict[str, Dict[str, Optional[float]]]:
+    """p50/p95/p99 of every *_latency field across the NDJSON records."""
+    samples: Dict[str, List[float]] = {}
+    with open(records_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for key, value in json.loads(line).items():
+                if key.endswith("_latency") and isinstance(value, (int, float)):
+                    samples.setdefault(key[:-len("_latency")], []).append(value)
+
+    return {
+        name: {f"p{q}": percentile(values, q) for q in (50, 95, 99)}
+        for name, values in sorted(samples.items())
+    }
+
+
+def run_once(manifest: str, workdir: str, env: Dict[str, str], extra_args: List[str]) -> Dict[str, Any]:
+    """Run main.py on a manifest; returns wall/CPU time, peak RSS and latencies."""
+    records = os.path.join(workdir, "records.ndjson")
+    log_file = os.path.join(workdir, "log.txt")
+    open(log_file, "a").close()
+
+    run_env = {
+        **os.environ,
+        **env,
+        "LOG_FILE": log_file,
+        "GITHUB_TOKEN": os.environ.get("GITHUB_TOKEN", "bench"),
+        "GEN_AI_STUDIO_API_KEY": "bench",
+        # Fresh Hub download cache per run so every run starts cold
+        "HF_HOME": os.path.join(workdir, "hf"),
+        "HF_HUB_DISABLE_TELEMETRY": "1",
+    }
+    cmd = [sys.executable, os.path.join(ROOT, "main.py"), manifest, "-o", records, "--no-cache", *extra_args]
+
+    start = time.perf_counter()
+    with open(os.path.join(workdir, "stderr.txt"), "w") as stderr:
+        proc = subprocess.Popen(cmd, env=run_env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=stderr)
+        # wait4 gives the rusage of this child (and the pool workers it reaped)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+
+    with open(manifest, "r", encoding="utf-8") as f:
+        lines = sum(1 for line in f if line.strip())
+    with open(records, "r", encoding="utf-8") as f:
+        produced = sum(1 for line in f if line.strip())
+
+    return {
+        "lines": lines,
+        "records": produced,
+        "exit_code": proc.returncode,
+        "wall_s": round(wall, 3),
+        "throughput_lines_per_s": round(lines / wall, 2) if wall > 0 else None,
+        "cpu_s": round(usage.ru_utime + usage.ru_stime, 3),
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "latency_ms": summarize_latencies(records),
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """One line per manifest size with the throughput change vs baseline."""
+    previous = {run["lines"]: run for run in baseline.get("runs", [])}
+    report = []
+    for run in results["runs"]:
+        old = previous.get(run["lines"])
+        if not old or not old.get("throughput_lines_per_s") or not run["throughput_lines_per_s"]:
+            continue
+        change = run["throughput_lines_per_s"] / old["throughput_lines_per_s"] - 1
+        report.append(f"{run['lines']:>6} lines: {change:+.1%} throughput vs {baseline.get('commit') or 'baseline'}")
+    return report
+
+
+def create_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog='run bench', description='Benchmark the pipeline against a local stub server')
+    p.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)),
+                   help='comma-separated manifest sizes in lines')
+    p.add_argument('--seed', type=int, default=0, help='manifest generator seed')
+    p.add_argument('--out', default='bench.json', help='results JSON path')
+    p.add_argument('--baseline', help='previous results JSON to compare against')
+    add_arguments(p)
+    p.add_argument('extra', nargs=argparse.REMAINDER, help='arguments passed to main.py (after --)')
+    return p
+
+
+def main(argv: List[str]) -> Dict[str, Any]:
+    ns = create_parser().parse_args(argv)
+    extra = ns.extra[1:] if ns.extra[:1] == ["--"] else ns.extra
+    sizes = [int(size) for size in ns.sizes.split(",") if size.strip()]
+
+    config = config_from_args(ns)
+    results: Dict[str, Any] = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "args": extra,
+        "stub": asdict(config),
+        "runs": [],
+    }
+    with StubServer(config) as server, tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            workdir = os.path.join(tmp, str(size))
+            os.makedirs(workdir)
+            manifest = os.path.join(workdir, "urls.txt")
+            generate_manifest(manifest, size, ns.seed)
+
+            run = run_once(manifest, workdir, server.env(), extra)
+            results["runs"].append(run)
+            print(f"{size:>6} lines: {run['throughput_lines_per_s']} lines/s, "
+                  f"cpu {run['cpu_s']}s, peak rss {run['peak_rss_mb']} MB, exit {run['exit_code']}")
+
+    with open(ns.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    if ns.baseline:
+        with open(ns.baseline, "r", encoding="utf-8") as f:
+            for line in compare(results, json.load(f)):
+                print(line)
+    return results
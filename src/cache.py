@@ -0,0 +1,274 @@
+"""
+cache.py
+----------
+Persistent on-disk cache for Hub, GitHub and LLM responses.
+
+Summary
+- SQLite-backed store under --cache-dir (default ~/.cache/ece-30861).
+- Content-addressed: keys are a SHA-256 of (endpoint, repo id, revision, ...).
+- Per-source TTLs ("hub", "github", "llm", "flake8"); expired entries are
+  misses.
+- Size-bounded: least recently used entries are evicted past max_bytes.
+  The total size is kept in a metadata row by triggers, so a write only
+  scans entries when it has to evict. Hits record their access time in
+  batches (per TOUCH_BATCH entries hit, TOUCH_INTERVAL seconds or next write), not
+  with a commit each; a worker exiting may drop its last few, which only
+  blurs the LRU order.
+- Values are pickled, so metric code can cache the objects it already uses
+  (e.g. ModelInfo) without a translation layer.
+
+Usage:
+    configure_cache(cli_args.cache_dir)   # once per process, None disables
+    info = cached("hub", "model_info", repo, "main", lambda: api.model_info(repo))
+
+Only successful fetches are stored; exceptions propagate uncached.
+Every cached() lookup is traced as a "fetch" span (src/tracing.py) and
+every get() counted as a hit or miss of its source (src/stats.py).
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from src.stats import count
+from src.tracing import span
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ece-30861")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Seconds an entry stays fresh, per upstream source
+DEFAULT_TTLS: Dict[str, float] = {
+    "hub": 6 * 3600,
+    "github": 24 * 3600,
+    "llm": 7 * 24 * 3600,
+    # Content-addressed lint results only change with the flake8 version
+    "flake8": 30 * 24 * 3600,
+}
+FALLBACK_TTL = 3600
+
+# Pending access times are written once this many entries were hit ...
+TOUCH_BATCH = 64
+# ... or this many seconds passed since the last write
+TOUCH_INTERVAL = 30.0
+# Entries looked at per eviction query
+EVICT_BATCH = 64
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS entries ("
+    " key TEXT PRIMARY KEY, source TEXT NOT NULL,"
+    " created REAL NOT NULL, accessed REAL NOT NULL,"
+    " size INTEGER NOT NULL, value BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)",
+    "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    # meta "size" tracks SUM(entries.size)
+    "CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN"
+    " UPDATE meta SET value = value + NEW.size WHERE name = 'size'; END",
+    "CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN"
+    " UPDATE meta SET value = value - OLD.size WHERE name = 'size'; END",
+    "CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN"
+    " UPDATE meta SET value = value - OLD.size + NEW.size WHERE name = 'size'; END",
+)
+
+
+def make_key(*parts: Any) -> str:
+    """Content address for an (endpoint, repo id, revision, ...) tuple."""
+    raw = json.dumps([str(p) if p is not None else None for p in parts])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        ttls: Optional[Dict[str, float]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "responses.sqlite3")
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        # key -> access time of hits not yet written
+        self._touched: Dict[str, float] = {}
+        self._touch_flushed = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork; reopen per process
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(self.cache_dir, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            # Stores created before the size row existed are summed once
+            if conn.execute("SELECT 1 FROM meta WHERE name = 'size'").fetchone() is None:
+                conn.execute("INSERT OR IGNORE INTO meta (name, value)"
+                             " SELECT 'size', COALESCE(SUM(size), 0) FROM entries")
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+            self._touched, self._touch_flushed = {}, time.time()
+        return self._conn
+
+    def get(self, source: str, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value); expired entries are dropped and count as misses."""
+        now = time.time()
+        ttl = self.ttls.get(source, FALLBACK_TTL)
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT created, value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                count("cache", source, "miss")
+                return False, None
+            created, blob = row
+            if now - created > ttl:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+                count("cache", source, "miss")
+                return False, None
+            self._touched[key] = now
+            if len(self._touched) >= TOUCH_BATCH or now - self._touch_flushed >= TOUCH_INTERVAL:
+                self._flush_touched(conn)
+                conn.commit()
+        count("cache", source, "hit")
+        return True, pickle.loads(blob)
+
+    def set(self, source: str, key: str, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO entries (key, source, created, accessed, size, value)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET source = excluded.source, created = excluded.created,"
+                " accessed = excluded.accessed, size = excluded.size, value = excluded.value",
+                (key, source, now, now, len(blob), blob),
+            )
+            self._touched.pop(key, None)
+            # Eviction goes by access time, so write the pending ones first
+            self._flush_touched(conn)
+            self._evict(conn)
+            conn.commit()
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        if self._touched:
+            conn.executemany("UPDATE entries SET accessed = ? WHERE key = ?",
+                             [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+        self._touch_flushed = time.time()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries until the store fits in max_bytes."""
+        (total,) = conn.execute("SELECT value FROM meta WHERE name = 'size'").fetchone()
+        while total > self.max_bytes:
+            rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC LIMIT ?",
+                                (EVICT_BATCH,)).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+
+    def flush(self) -> None:
+        """Write the access times of hits still pending."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid() and self._touched:
+                self._flush_touched(self._conn)
+                self._conn.commit()
+
+    def size(self) -> int:
+        """Total bytes of the stored values."""
+        with self._lock:
+            (total,) = self._connect().execute("SELECT value FROM meta WHERE name = 'size'").fetchone()
+            return total
+
+    def get_or_fetch(self, source: str, key: str, fetch: Callable[[], T]) -> T:
+        hit, value = self.get(source, key)
+        if hit:
+            return value
+        value = fetch()
+        self.set(source, key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries")
+            conn.commit()
+            self._touched.clear()
+
+
+# Process-wide cache; None means caching is disabled (--no-cache, tests)
+_cache: Optional[ResponseCache] = None
+
+
+def configure_cache(cache_dir: Optional[str], **kwargs: Any) -> Optional[ResponseCache]:
+    """Enable the process-wide cache at cache_dir, or disable it with None."""
+    global _cache
+    _cache = ResponseCache(cache_dir, **kwargs) if cache_dir else None
+    return _cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    return _cache
+
+
+@atexit.register
+def _flush_cache() -> None:
+    if _cache is not None:
+        _cache.flush()
+
+
+def cached(source: str, endpoint: str, repo_id: str, revision: Optional[str],
+           fetch: Callable[[], T], *extra: Any) -> T:
+    """
+    Return fetch() through the process-wide cache, keyed by
+    (endpoint, repo_id, revision, *extra). Calls fetch() directly when
+    caching is disabled.
+    """
+    with span("fetch", source=source, endpoint=endpoint, repo=repo_id):
+        if _cache is None:
+            return fetch()
+        return _cache.get_or_fetch(source, make_key(endpoint, repo_id, revision, *extra), fetch)
+
+
+async def cached_async(source: str, endpoint: str, repo_id: str, revision: Optional[str],
+                       fetch: Callable[[], Awaitable[T]], *extra: Any) -> T:
+    """Async variant of cached() for coroutine fetches (async engine)."""
+    with span("fetch", source=source, endpoint=endpoint, repo=repo_id):
+        if _cache is None:
+            return await fetch()
+        key = make_key(endpoint, repo_id, revision, *extra)
+        hit, value = _cache.get(source, key)
+        if hit:
+            return value
+        value = await fetch()
+        _cache.set(source, key, value)
+        return value
+
+
+def lookup(source: str, endpoint: str, repo_id: str, revision: Optional[str], *extra: Any) -> Tuple[bool, Any]:
+    """(hit, value) from the process-wide cache without fetching."""
+    if _cache is None:
+        return False, None
+    return _cache.get(source, make_key(endpoint, repo_id, revision, *extra))
+
+
+def store(source: str, value: Any, endpoint: str, repo_id: str, revision: Optional[str], *extra: Any) -> None:
+    """Store a value fetched outside cached(), e.g. one item of a batch."""
+    if _cache is not None:
+        _cache.set(source, make_key(endpoint, repo_id, revision, *extra), value)
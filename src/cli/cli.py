@@ -7,6 +7,8 @@ Summary
 - Defines subcommands: install, test, process (via URL file).
 - Parses CLI arguments and forwards execution to main entrypoints.
 - Complies with the spec: only URL files are accepted for processing.
+- URL files are parsed lazily (iter_url_file) so huge manifests stream
+  into the scheduler; "-" reads the manifest from stdin.
 
 Spec alignment
 - Invocation form: ./run URL_FILE
@@ -23,10 +25,14 @@ from __future__ import annotations
 import argparse
 import os
 import re
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Optional
+from typing import IO, Iterator, Literal, Optional
 
+from src.cache import DEFAULT_CACHE_DIR
+from src.sessions import DEFAULT_POOL_SIZE, DEFAULT_RETRIES
+from src.tracing import TRACE_FORMATS
 from src.cli.url import URL, CodeURL, DatasetURL, ModelURL, classify_url
 
 
@@ -38,6 +44,24 @@ class CLIArgs:
     parallelism: int
     log_file: Optional[str]
     log_level: int
+    engine: Literal['process', 'async'] = 'process'
+    concurrency: int = 64
+    cache_dir: Optional[str] = None
+    state_file: Optional[str] = None
+    llm_batch: int = 1
+    ordered: bool = False
+    max_inflight: int = 256
+    pool_size: int = DEFAULT_POOL_SIZE
+    retries: int = DEFAULT_RETRIES
+    record_dir: Optional[str] = None
+    replay_dir: Optional[str] = None
+    replay_latency: Optional[str] = None
+    metric_timeout: Optional[float] = None
+    model_timeout: Optional[float] = None
+    trace_file: Optional[str] = None
+    trace_format: str = 'jsonl'
+    stats_file: Optional[str] = None
+    lint_jobs: int = 0
 
 
 def parse_url_file(path: str) -> list[list[Optional[URL]]]:
@@ -56,36 +80,48 @@ def parse_url_file(path: str) -> list[list[Optional[URL]]]:
         https://github.com/google-research/bert, https://huggingface.co/datasets/bookcorpus/bookcorpus, https://huggingface.co/google-bert/bert-base-uncased
         ,,https://huggingface.co/parvk11/audience_classifier_model
         ,,https://huggingface.co/openai/whisper-tiny/tree/main
+
+    Materializes every row; see iter_url_file for the streaming variant.
+    """
+    return list(iter_url_file(path))
+
+
+def iter_url_file(path: str) -> Iterator[list[Optional[URL]]]:
+    """
+    Lazily parse a URL file (or stdin for "-"), yielding one row per line as
+    it is read. Same format as parse_url_file.
+
+    A missing file raises FileNotFoundError here, not on first iteration.
     """
-    url_lines: list[list[Optional[URL]]] = []
+    if path == "-":
+        return _iter_rows(sys.stdin, close=False)
 
     path_obj = Path(path)  # use a new variable
     if not path_obj.exists():
         raise FileNotFoundError(f"URL file not found: {path}")
 
-    with path_obj.open("r", encoding="utf-8") as f:
+    return _iter_rows(path_obj.open("r", encoding="utf-8"), close=True)
+
+
+def _iter_rows(f: IO[str], close: bool) -> Iterator[list[Optional[URL]]]:
+    try:
         for line in f:
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
+            yield [parse_url(p.strip()) for p in line.split(",")]
+    finally:
+        if close:
+            f.close()
 
-            parts = [p.strip() for p in line.split(",")]
-            new_line: list[Optional[URL]] = []
-
-            for url in parts:
-                if not url:
-                    new_line.append(None)
-                    continue
-
-                parsed = classify_url(url)
-                if parsed and parsed.validate():
-                    new_line.append(parsed)
-                else:
-                    new_line.append(None)
-
-            url_lines.append(new_line)
 
-    return url_lines
+def parse_url(url: str) -> Optional[URL]:
+    """Classify one column; empty or unsupported URLs become None."""
+    if not url:
+        return None
+    # classify_url only returns a type whose pattern matched, i.e. validate()
+    # would hold; no second regex pass needed
+    return classify_url(url)
 
 
 def parse_args(argv) -> CLIArgs:
@@ -100,7 +136,7 @@ def parse_args(argv) -> CLIArgs:
     if ns.target is None:
         parser.error('Missing positional argument: install | test | URL_FILE')
 
-    if os.path.isfile(ns.target):
+    if ns.target == '-' or os.path.isfile(ns.target):
         return CLIArgs(
             'process',
             ns.target,
@@ -108,6 +144,24 @@ def parse_args(argv) -> CLIArgs:
             ns.parallelism,
             ns.log_file,
             ns.log_level,
+            engine=ns.engine,
+            concurrency=ns.concurrency,
+            cache_dir=None if ns.no_cache else ns.cache_dir,
+            state_file=ns.state,
+            llm_batch=ns.llm_batch,
+            ordered=ns.ordered,
+            max_inflight=ns.max_inflight,
+            pool_size=ns.pool_size,
+            retries=ns.retries,
+            record_dir=ns.record,
+            replay_dir=ns.replay,
+            replay_latency=ns.replay_latency,
+            metric_timeout=ns.metric_timeout,
+            model_timeout=ns.model_timeout,
+            trace_file=ns.trace,
+            trace_format=ns.trace_format,
+            stats_file=ns.stats,
+            lint_jobs=ns.lint_jobs,
         )
 
     # Any other target is invalid per spec (must be a file)
@@ -117,7 +171,7 @@ def parse_args(argv) -> CLIArgs:
 
 def create_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog='run')
-    p.add_argument('target', nargs='?', help='install | test | URL_FILE')
+    p.add_argument('target', nargs='?', help='install | test | URL_FILE ("-" = stdin)')
     p.add_argument('-o', '--output', default='-',
                    help='NDJSON output path ("-" = stdout)')
     p.add_argument('-p', '--parallelism', type=int,
@@ -125,4 +179,43 @@ def create_parser() -> argparse.ArgumentParser:
     p.add_argument('--log-file', default=os.environ.get('LOG_FILE'))
     p.add_argument('--log-level', type=int,
                    default=int(os.environ.get('LOG_LEVEL', '0')))
+    p.add_argument('--engine', choices=['process', 'async'], default='process',
+                   help='metric execution engine (process pool or asyncio)')
+    p.add_argument('--concurrency', type=int, default=64,
+                   help='max in-flight tasks for the async engine')
+    p.add_argument('--cache-dir', default=os.environ.get('CACHE_DIR', DEFAULT_CACHE_DIR),
+                   help='persistent response cache directory')
+    p.add_argument('--no-cache', action='store_true',
+                   help='disable the persistent response cache')
+    p.add_argument('--state', default=None,
+                   help='revision state file; reuse scores of unchanged models')
+    p.add_argument('--llm-batch', type=int, default=1,
+                   help='models per batched GenAI request (0 = one request per metric)')
+    p.add_argument('--ordered', action='store_true',
+                   help='write records in input order instead of as they finish')
+    p.add_argument('--max-inflight', type=int, default=256,
+                   help='max URL lines read ahead of written records')
+    p.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                   help='keep-alive connections per upstream host')
+    p.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                   help='retries with backoff for transient HTTP errors and rate-limited requests')
+    fixtures = p.add_mutually_exclusive_group()
+    fixtures.add_argument('--record', metavar='DIR',
+                          help='save every upstream response under DIR (use with --no-cache)')
+    fixtures.add_argument('--replay', metavar='DIR',
+                          help='serve upstream responses recorded with --record; no network')
+    p.add_argument('--replay-latency', metavar='PROFILE',
+                   help='latency injected on replay: "recorded", MS, or "host=MS,...,*=MS"')
+    p.add_argument('--metric-timeout', type=float, metavar='SECONDS',
+                   help='abandon a metric after SECONDS and score it 0')
+    p.add_argument('--model-timeout', type=float, metavar='SECONDS',
+                   help='emit a model after SECONDS with the metrics that finished')
+    p.add_argument('--trace', metavar='FILE',
+                   help='write per-phase timing spans of every metric to FILE')
+    p.add_argument('--trace-format', choices=TRACE_FORMATS, default='jsonl',
+                   help='trace file format: flat JSONL spans or OTLP JSON')
+    p.add_argument('--stats', nargs='?', const='-', metavar='FILE',
+                   help='write a JSON run report to FILE (stderr if no FILE)')
+    p.add_argument('--lint-jobs', type=int, default=0, metavar='N',
+                   help='flake8 worker processes per engine process (0 = lint in-process)')
     return p
@@ -6,7 +6,11 @@ Responsible for building and formatting output in NDJSON.
 Summary
 - Collects per-metric results.
 - Computes weighted NetScore and accumulates latencies.
+- Lists metrics abandoned at their deadline under "timed_out"; their 0
+  fallback counts towards the (partial) net_score.
 - Produces single-line JSON objects suitable for auto-grader validation.
+- Streams records to stdout or an --output file as each model finishes,
+  optionally reordered back into input order (--ordered).
 
 Notes
 import json
@@ -64,7 +68,8 @@ print(json.dumps(d))  # one line
 """
 
 import json
-from typing import Dict, List, Union, cast
+import sys
+from typing import IO, Dict, List, Optional, Union, cast
 
 from src.metrics.metric import Metric
 from src.cli.url import ModelURL
@@ -101,4 +106,62 @@ def build_output(model: ModelURL, metrics: List[Metric], weights: Dict[str, floa
     for m in metrics:
         output.update(m.as_dict())
 
+    # Only present when a deadline hit, so normal records keep the schema
+    timed_out = [m.name for m in metrics if getattr(m, "timed_out", False)]
+    if timed_out:
+        output["timed_out"] = timed_out
+
     return json.dumps(output, separators=(",", ":"))
+
+
+class NDJSONWriter:
+    """
+    Writes NDJSON records as soon as they are produced, flushing each line.
+
+    Records arrive tagged with their input line index. By default they are
+    written in completion order; with ordered=True a reorder buffer holds
+    early records until every earlier line has been written. A record of
+    None marks a line that produced no output (e.g. skipped) so the buffer
+    can advance past it.
+    """
+
+    def __init__(self, path: str = "-", ordered: bool = False):
+        self.ordered = ordered
+        self._owns_stream = path != "-"
+        self._stream: IO[str] = open(path, "w", encoding="utf-8") if self._owns_stream else sys.stdout
+        self._buffer: Dict[int, Optional[str]] = {}
+        self._next_index = 0
+
+    def write(self, index: int, record: Optional[str]) -> None:
+        if not self.ordered:
+            self._emit(record)
+            return
+
+        self._buffer[index] = record
+        while self._next_index in self._buffer:
+            self._emit(self._buffer.pop(self._next_index))
+            self._next_index += 1
+
+    def backlog(self) -> int:
+        """Records held in the reorder buffer, waiting on an earlier line."""
+        return len(self._buffer)
+
+    def _emit(self, record: Optional[str]) -> None:
+        if record is None:
+            return
+        self._stream.write(record + "\n")
+        self._stream.flush()
+
+    def close(self) -> None:
+        # Anything still buffered is behind a gap that will never fill
+        for index in sorted(self._buffer):
+            self._emit(self._buffer[index])
+        self._buffer.clear()
+        if self._owns_stream:
+            self._stream.close()
+
+    def __enter__(self) -> "NDJSONWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,9 +1,16 @@
-import logging
 import os
 import sys
+from typing import Callable, Dict, TypeVar
 
 from github import BadCredentialsException, Github
 
+from src.sessions import GITHUB_API_URL, get_github
+
+T = TypeVar("T")
+
+# Clients whose token already passed validation, by token
+_validated: Dict[str, Github] = {}
+
 
 def validate_github_token():
     token = os.getenv("GITHUB_TOKEN")
@@ -11,11 +18,29 @@ def validate_github_token():
         print("ERROR: Missing GITHUB_TOKEN environment variable", file=sys.stderr)
         sys.exit(1)
 
-    g = Github(token)
+    if token in _validated:
+        return _validated[token]
+
+    g = Github(token, base_url=GITHUB_API_URL)
     try:
         g.get_user().id  # cheap check
     except BadCredentialsException:
         print("ERROR: Invalid GITHUB_TOKEN provided", file=sys.stderr)
         sys.exit(1)
 
-    return g
\ No newline at end of file
+    _validated[token] = g
+    return g
+
+
+def github_call(fn: Callable[[Github], T]) -> T:
+    """
+    Run one API operation on the shared authenticated client. Quota
+    accounting, throttling and retries on an exhausted quota happen per
+    request in src/ratelimit.py.
+    """
+    return fn(get_github())
+
+
+def get_head_sha(owner: str, repo: str) -> str:
+    """HEAD commit sha of a GitHub repo (single commits API call)."""
+    return github_call(lambda gh: gh.get_repo(f"{owner}/{repo}", lazy=True).get_commit("HEAD").sha)
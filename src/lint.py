@@ -0,0 +1,201 @@
+"""
+lint.py
+---------
+Flake8 analysis service shared by every CodeQualityMetric of a process.
+
+Summary
+- One configured flake8 style guide per process, built on first use and
+  kept warm; building one (plugin loading, option parsing) costs more than
+  checking a typical file. It is rebuilt every REBUILD_AFTER files so its
+  per-file statistics do not grow without bound.
+- The guide is built from a command line (FLAKE8_ARGV) with --jobs 1:
+  flake8 never forks a multiprocessing pool of its own inside a pool
+  worker.
+- Results are cached per file, keyed by content hash, file name, flake8
+  version and a hash of the effective options (argv plus any flake8 config
+  file, and the plugin versions): in memory for the process and in the
+  response cache (source "flake8") across processes and runs. Vendored
+  files shared by many repos (modeling_*.py) are linted once.
+- With jobs > 0 (--lint-jobs) uncached files are checked in parallel on a
+  dedicated process pool of warm analyzers, e.g. for the async engine whose
+  single process serializes flake8 on the GIL. Off by default: pool workers
+  already spread models over the cores.
+
+- scan_file() streams a file once in fixed-size blocks to get both its line
+  count and the content hash the result cache is keyed by.
+
+Usage:
+    configure_lint(jobs=0)                       # once per process
+    loc, digest = scan_file(path)
+    issues = get_analyzer().count_issues(paths, digests)
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import flake8
+from flake8.api import legacy as flake8_api  # type: ignore
+from flake8.main.application import Application  # type: ignore
+
+from src.cache import lookup, store
+
+# Files checked before the style guide is rebuilt
+REBUILD_AFTER = 1000
+# Per-file results kept in memory
+MEMO_SIZE = 4096
+# Read size of scan_file; memory use is constant regardless of file size
+SCAN_BLOCK = 1 << 20
+# Command line of the style guide; config files are read on top of it
+FLAKE8_ARGV = ("--jobs", "1", "--quiet", "--quiet")
+
+
+def scan_file(path: str) -> Tuple[int, str]:
+    """
+    (lines, SHA-256) of a file in one buffered pass. A last line without a
+    trailing newline counts, like len(f.readlines()).
+    """
+    digest = hashlib.sha256()
+    lines = 0
+    last = b""
+    with open(path, "rb", buffering=0) as f:
+        for block in iter(lambda: f.read(SCAN_BLOCK), b""):
+            digest.update(block)
+            lines += block.count(b"\n")
+            last = block
+    if last and not last.endswith(b"\n"):
+        lines += 1
+    return lines, digest.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's content."""
+    return scan_file(path)[1]
+
+
+def options_digest(application: Application) -> str:
+    """SHA-256 of the effective options and plugin versions of an initialized flake8 application."""
+    options = sorted(vars(application.options).items())
+    return hashlib.sha256(repr((options, application.plugins.versions_str())).encode()).hexdigest()
+
+
+class Flake8Analyzer:
+    """Counts flake8 issues of files with a warm style guide and result caches."""
+
+    def __init__(self, jobs: int = 0):
+        self.jobs = max(0, jobs)
+        self._lock = threading.Lock()
+        self._guide = None
+        self._options: Optional[str] = None
+        self._checked = 0
+        self._memo: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _style_guide(self):
+        if self._guide is None or self._checked >= REBUILD_AFTER:
+            application = Application()
+            application.initialize(list(FLAKE8_ARGV))
+            self._guide = flake8_api.StyleGuide(application)
+            self._options = options_digest(application)
+            self._checked = 0
+        return self._guide
+
+    def options(self) -> str:
+        """Hash of the effective flake8 options, part of every result cache key."""
+        with self._lock:
+            if self._options is None:
+                self._style_guide()
+            return self._options
+
+    def check_file(self, path: str) -> int:
+        """flake8 issue count of one file (no caching)."""
+        with self._lock:
+            report = self._style_guide().check_files([path])
+            self._checked += 1
+            return report.total_errors
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[int]:
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        hit, value = lookup("flake8", "file", key[0], flake8.__version__, self.options(), key[1])
+        if hit:
+            self._remember(key, value)
+            return value
+        return None
+
+    def _remember(self, key: Tuple[str, str], issues: int) -> None:
+        with self._lock:
+            self._memo[key] = issues
+            self._memo.move_to_end(key)
+            while len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: the async engine forks from a process with running threads otherwise
+                self._pool = ProcessPoolExecutor(max_workers=self.jobs,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def count_issues(self, paths: List[str], digests: Optional[List[str]] = None) -> int:
+        """Total flake8 issues across paths; digests (content hashes) are computed if not given."""
+        if digests is None:
+            digests = [file_digest(path) for path in paths]
+
+        total = 0
+        pending: List[Tuple[Tuple[str, str], str]] = []
+        for path, digest in zip(paths, digests):
+            key = (digest, os.path.basename(path))
+            issues = self._cached(key)
+            if issues is None:
+                pending.append((key, path))
+            else:
+                total += issues
+
+        if self.jobs and len(pending) > 1:
+            results = list(self._process_pool().map(_check_file, [path for _, path in pending]))
+        else:
+            results = [self.check_file(path) for _, path in pending]
+
+        for (key, _), issues in zip(pending, results):
+            self._remember(key, issues)
+            store("flake8", issues, "file", key[0], flake8.__version__, self.options(), key[1])
+            total += issues
+        return total
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+_analyzer: Optional[Flake8Analyzer] = None
+_analyzer_pid: Optional[int] = None
+
+
+def configure_lint(jobs: int = 0) -> Flake8Analyzer:
+    """Replace the process-wide analyzer (jobs > 0 adds a process pool)."""
+    global _analyzer, _analyzer_pid
+    if _analyzer is not None and _analyzer_pid == os.getpid():
+        _analyzer.close()
+    _analyzer, _analyzer_pid = Flake8Analyzer(jobs), os.getpid()
+    return _analyzer
+
+
+def get_analyzer() -> Flake8Analyzer:
+    """The process-wide analyzer; a fresh in-process one after a fork."""
+    if _analyzer is None or _analyzer_pid != os.getpid():
+        return configure_lint()
+    return _analyzer
+
+
+def _check_file(path: str) -> int:
+    """Lint pool task: check one file with the worker's own warm analyzer."""
+    return get_analyzer().check_file(path)
@@ -0,0 +1,219 @@
+"""
+metadata.py
+-------------
+Shared Hugging Face model metadata provider.
+
+Summary
+- Fetches `HfApi.model_info` once per repo id and hands the same object to
+  every metric that needs it (size, license, bus factor, code quality).
+  Files metadata is included so siblings carry their sizes.
+- main.py populates one provider per ModelURL before metrics run, then
+  injects it with Metric.set_metadata().
+- The provider is a plain picklable object so it can be shipped to worker
+  processes together with the metrics.
+- Fetches go through the persistent response cache (src/cache.py) and the
+  process-wide HfApi client (src/sessions.py).
+- For incremental re-scoring it can also resolve the current revision of the
+  model, dataset and code repo with one lightweight lookup each, plus that
+  of the base model named by the model card (CodeQualityMetric's fallback).
+- The model README is fetched once (pinned to the revision when known) and
+  parsed once into a ModelReadme (src/readme.py) shared by every metric.
+  Only a repo without a README reads as an empty one; a failed fetch
+  raises ReadmeUnavailable to every consumer so their metrics fail.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from huggingface_hub.errors import EntryNotFoundError
+from huggingface_hub.hf_api import ModelInfo
+
+from src.cache import cached
+from src.cli.url import GITHUB_PATTERN, HF_DATASET_PATTERN, CodeURL, DatasetURL, ModelURL
+from src.git import get_head_sha
+from src.readme import ModelReadme
+from src.sessions import get_hf_api
+
+README_FILE = "README.md"
+
+
+class ReadmeUnavailable(Exception):
+    """The model README could not be fetched (the repo may still have one)."""
+
+
+def repo_id(model_url: ModelURL) -> str:
+    """Hugging Face repo id ("author/name") for a model URL."""
+    return f"{model_url.author}/{model_url.name}"
+
+
+def base_model(card_data: Any) -> Optional[str]:
+    """Repo id of the single base_model a model card names, if any."""
+    value = card_data.get("base_model") if card_data else None
+    return value if isinstance(value, str) and value else None
+
+
+def model_revision(repo: str) -> Tuple[Optional[str], Optional[str]]:
+    """Current commit sha of a Hub model and its card's base_model (light model_info call)."""
+    info = get_hf_api().model_info(repo, expand=["sha", "cardData"])
+    return info.sha, base_model(info.cardData)
+
+
+def dataset_revision(dataset_url: DatasetURL) -> Optional[str]:
+    """Current commit sha of a Hub dataset; None for non-Hub datasets."""
+    if not HF_DATASET_PATTERN.match(dataset_url.raw):
+        return None
+    return get_hf_api().dataset_info(dataset_url.display_name(), expand=["sha"]).sha
+
+
+def code_revision(code_url: CodeURL) -> Optional[str]:
+    """HEAD commit sha of a GitHub repo; None for other code hosts."""
+    if not GITHUB_PATTERN.match(code_url.raw) or not code_url.author or not code_url.name:
+        return None
+    return get_head_sha(code_url.author, code_url.name)
+
+
+def load_readme(repo: str, revision: Optional[str] = None) -> str:
+    """Raw README.md of a Hub model (process-wide HfApi client); "" if the repo has none."""
+    try:
+        path = get_hf_api().hf_hub_download(repo, README_FILE, revision=revision)
+    except EntryNotFoundError:
+        return ""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _revision_id(url, lookup) -> Optional[str]:
+    """
+    "name@sha" for a URL column, "" when the column is empty (stable), and
+    None when the revision cannot be determined (never reusable).
+    """
+    if url is None:
+        return ""
+    try:
+        sha = lookup(url)
+    except Exception:
+        return None
+    return f"{url.display_name()}@{sha}" if sha else None
+
+
+class ModelMetadata:
+    """
+    Per-model cache of Hugging Face model_info responses.
+
+    Keyed by repo id so the base_model fallback used by CodeQualityMetric is
+    also fetched at most once.
+    """
+
+    def __init__(self, model_url: Optional[ModelURL] = None):
+        self.model_url = model_url
+        self._infos: Dict[str, ModelInfo] = {}
+        # Model commit sha, once known; pins the model_info fetch and cache key
+        self.revision: Optional[str] = None
+        # "model" / "code" / "dataset" -> revision id, see resolve_revisions()
+        self.revisions: Dict[str, Optional[str]] = {}
+        self._readme: Optional[ModelReadme] = None
+        # Why the README fetch failed, kept as text so the provider stays picklable
+        self._readme_error: Optional[str] = None
+
+    def model_info(self, repo: Optional[str] = None) -> ModelInfo:
+        """
+        Return model_info for `repo` (defaults to this provider's model),
+        fetching it from the Hub on first use.
+        """
+        revision = None
+        if repo is None:
+            if self.model_url is None:
+                raise ValueError("ModelMetadata has no model URL")
+            repo = repo_id(self.model_url)
+            revision = self.revision
+
+        def fetch() -> ModelInfo:
+            if revision:
+                return get_hf_api().model_info(repo, revision=revision, files_metadata=True)
+            return get_hf_api().model_info(repo, files_metadata=True)
+
+        if repo not in self._infos:
+            self._infos[repo] = cached("hub", "model_info", repo, revision or "main", fetch, "files")
+        return self._infos[repo]
+
+    def cached_model_info(self, repo: Optional[str] = None) -> Optional[ModelInfo]:
+        """model_info for repo if it was already fetched; never fetches."""
+        if repo is None:
+            if self.model_url is None:
+                return None
+            repo = repo_id(self.model_url)
+        return self._infos.get(repo)
+
+    def readme(self) -> ModelReadme:
+        """
+        Parsed README of this provider's model, fetched on first use.
+
+        A repo without a README (or no model URL) gives an empty one. Any
+        other failure raises ReadmeUnavailable, now and on every later call,
+        so each consumer fails without retrying the fetch (and the failure
+        is never cached or stored as a score).
+        """
+        if self._readme_error is not None:
+            raise ReadmeUnavailable(self._readme_error)
+        if self._readme is None:
+            text = ""
+            if self.model_url is not None:
+                repo, revision = repo_id(self.model_url), self.revision
+                try:
+                    text = cached("hub", "readme", repo, revision or "main",
+                                  lambda: load_readme(repo, revision))
+                except Exception as exc:
+                    self._readme_error = f"README of {repo}: {exc!r}"
+                    raise ReadmeUnavailable(self._readme_error) from exc
+            self._readme = ModelReadme.parse(text)
+        return self._readme
+
+    def resolve_revisions(
+        self, code_url: Optional[CodeURL] = None, dataset_url: Optional[DatasetURL] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Look up the current model sha, code HEAD, dataset sha and base model
+        sha (never cached) so unchanged metrics can be reused from a
+        previous run. A model without a base_model has "" for it.
+        """
+        base: Dict[str, Optional[str]] = {}
+
+        def lookup_model(url: ModelURL) -> Optional[str]:
+            self.revision, base["repo"] = model_revision(repo_id(url))
+            return self.revision
+
+        self.revisions = {
+            "model": _revision_id(self.model_url, lookup_model),
+            "code": _revision_id(code_url, code_revision),
+            "dataset": _revision_id(dataset_url, dataset_revision),
+        }
+        if "repo" not in base:
+            # Unknown whether the model has a base model
+            self.revisions["base_model"] = None
+        elif base["repo"] is None:
+            self.revisions["base_model"] = ""
+        else:
+            try:
+                sha = model_revision(base["repo"])[0]
+            except Exception:
+                sha = None
+            self.revisions["base_model"] = f"{base['repo']}@{sha}" if sha else None
+        return self.revisions
+
+    def prefetch(self) -> "ModelMetadata":
+        """
+        Fetch the primary model_info and the README eagerly; the README is
+        needed where GenAI prompts are built, outside the pool workers.
+
+        Failures are swallowed so each metric still gets its own chance to
+        fail (and fall back to 0) inside Metric.run.
+        """
+        if self.model_url is not None:
+            try:
+                self.model_info()
+            except Exception:
+                pass
+            try:
+                self.readme()
+            except ReadmeUnavailable:
+                pass
+        return self
@@ -7,49 +7,85 @@ Summary
 - Calculates contributor redundancy relative to project size.
 - Uses number of contributors per parameter scale as described in the rubric.
 - Gets number of parameters from model_info.safetensors
-- Gets contributors from GitHub API using validated token
+- Gets contributors from GitHub API using the shared authenticated client
+- Counts contributors with one request (per_page=1, last page of the Link
+  header); walking the full contributor list is opt-in (list_contributors)
+- The contributor count depends on the code repo alone and is shared by
+  every line referencing it (shared_key())
 """
-from typing import Dict, Optional
-from huggingface_hub import HfApi
-from github import Github
+from typing import Any, Dict, Hashable, Optional
 
+from src.cache import cached
 from src.cli.url import CodeURL, ModelURL
 from src.metrics.metric import Metric
-from src.git import validate_github_token
+from src.git import github_call
 
 
 def get_contributors(owner: str, repo: str) -> list[str]:
     """
-    Fetch contributors for a repo using the authenticated GitHub client.
+    Fetch contributors for a repo using the shared authenticated GitHub
+    client (one paginated contributors walk, no separate repo lookup).
+    Results are kept in the persistent response cache.
     """
-    gh: Github = validate_github_token()
-    repo_obj = gh.get_repo(f"{owner}/{repo}")
-    contributors = repo_obj.get_contributors()
-    return [c.login for c in contributors]
+    def fetch() -> list[str]:
+        return github_call(
+            lambda gh: [c.login for c in gh.get_repo(f"{owner}/{repo}", lazy=True).get_contributors()]
+        )
+
+    return cached("github", "contributors", f"{owner}/{repo}", None, fetch)
+
+
+def count_contributors(owner: str, repo: str) -> int:
+    """
+    Number of contributors of a repo in a single API request: PyGithub's
+    totalCount asks for one item per page and reads the last page number
+    from the Link header. Cached like get_contributors.
+    """
+    def fetch() -> int:
+        return github_call(
+            lambda gh: gh.get_repo(f"{owner}/{repo}", lazy=True).get_contributors().totalCount
+        )
+
+    return cached("github", "contributor_count", f"{owner}/{repo}", None, fetch)
 
 
 class BusFactorMetric(Metric):
-    def __init__(self, code_url: CodeURL, model_url: ModelURL):
+    depends_on = ("model", "code")
+
+    def __init__(self, code_url: CodeURL, model_url: ModelURL, list_contributors: bool = False):
         super().__init__("bus_factor")
         self.model_url = model_url
         self.code_url = code_url
+        # Walk every contributor page instead of the single counting request
+        self.list_contributors = list_contributors
+
+    def shared_key(self) -> Optional[Hashable]:
+        if not self.code_url or not self.code_url.author or not self.code_url.name:
+            return None
+        return (self.name, self.code_url.display_name(), self.list_contributors)
+
+    def shared_data(self) -> Dict[str, Any]:
+        return {"num_contributors": (self.data or {}).get("num_contributors")}
 
     def get_data(self) -> Dict[str, Optional[int]]:
         """
-        Gets number of parameters from Hugging Face model_info.
+        Gets number of parameters from the shared Hugging Face model_info.
         Gets contributors from GitHub API.
         """
-        api = HfApi()
-        info = api.model_info(f"{self.model_url.author}/{self.model_url.name}")
+        info = self.get_metadata().model_info()
 
         params: Optional[int] = None
         if info.safetensors and "total" in info.safetensors:
             params = info.safetensors.get("total")
 
         num_contributors = 0
-        if self.code_url and self.code_url.author and self.code_url.name:
-            contributors = get_contributors(self.code_url.author, self.code_url.name)
-            num_contributors = len(contributors)
+        if self.shared is not None:
+            num_contributors = self.shared["num_contributors"]
+        elif self.code_url and self.code_url.author and self.code_url.name:
+            if self.list_contributors:
+                num_contributors = len(get_contributors(self.code_url.author, self.code_url.name))
+            else:
+                num_contributors = count_contributors(self.code_url.author, self.code_url.name)
 
         return {
             "params": params,
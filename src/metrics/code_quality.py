@@ -10,12 +10,22 @@ Summary:
 
 - Input: path to a local clone/snapshot of the model repo
 - Process:
-  1. Collect all .py files
-  2. Count total lines of code
-  3. Run Flake8, count style issues
+  1. Collect the .py files (each at most MAX_PY_FILE_BYTES; beyond
+     MAX_PY_FILES, top-level files first, then the smallest, and the data
+     records "Truncated") and download them in parallel into the shared
+     Hugging Face cache, pinned to the repo sha so cached files are reused
+     without a round-trip
+  2. Count total lines of code (streamed with the content hash that keys
+     the lint result cache, one pass per file)
+  3. Run Flake8 (src/lint.py: warm style guide, per-file result cache),
+     count style issues
   4. Compute issues per 1000 LOC
   5. Map to 0 - 1 score per rubric
 
+The code repo URL of a line is not analyzed. Models without any Python
+files of their own (not merely oversized ones) fall back to their base
+model, so many fine-tunes share one analysis (shared_key()).
+
 Rubric:
 - 0.2 = >60 issues per 1000 LOC
 - 0.4 = 31–60 issues per 1000 LOC
@@ -24,84 +34,129 @@ Rubric:
 - 1 = 0–5 issues per 1000 LOC
 """
 
-import tempfile
-from typing import Dict, Optional
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
-from flake8.api import legacy as flake8  # type: ignore
-from huggingface_hub import HfApi, hf_hub_download
+from huggingface_hub import hf_hub_download
 
 from src.cli.url import CodeURL, ModelURL
+from src.lint import get_analyzer, scan_file
 from src.metrics.metric import Metric
+from src.tracing import span
+
+# Larger files are generated or vendored code, not the repo's own style
+MAX_PY_FILE_BYTES = 512 * 1024
+MAX_PY_FILES = 64
+# Concurrent file downloads per process, shared by all metrics
+DOWNLOAD_WORKERS = 8
+
+_download_pool: Optional[ThreadPoolExecutor] = None
+_download_pid: Optional[int] = None
+_download_lock = threading.Lock()
+
+
+def download_pool() -> ThreadPoolExecutor:
+    """Per-process download pool (rebuilt after a fork)."""
+    global _download_pool, _download_pid
+    with _download_lock:
+        if _download_pool is None or _download_pid != os.getpid():
+            _download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="hf-download")
+            _download_pid = os.getpid()
+        return _download_pool
+
+
+def has_python(info: Any) -> bool:
+    """Whether the repo has any .py files at all, whatever their size."""
+    return any(sib.rfilename.endswith(".py") for sib in info.siblings or [])
+
+
+def python_files(info: Any) -> Tuple[List[str], bool]:
+    """
+    The .py siblings worth analysing and whether more than MAX_PY_FILES
+    qualified. The selection is deterministic: top-level files first, then
+    the smallest (sizes are known when model_info has files metadata).
+    """
+    files = []
+    for sib in info.siblings or []:
+        size = getattr(sib, "size", None)
+        if sib.rfilename.endswith(".py") and (size is None or size <= MAX_PY_FILE_BYTES):
+            files.append((sib.rfilename.count("/"), size or 0, sib.rfilename))
+    files.sort()
+    return [name for _, _, name in files[:MAX_PY_FILES]], len(files) > MAX_PY_FILES
 
 
 class CodeQualityMetric(Metric):
+    # The base model is analyzed instead when the model has no Python files
+    depends_on = ("model", "base_model")
+    # 2: deterministic file selection beyond MAX_PY_FILES
+    SCORE_VERSION = 2
+
     def __init__(self, code_url: CodeURL, model_url: ModelURL):
         super().__init__("code_quality")
         self.code_url = code_url
         self.model_url = model_url
 
-    def get_data(self) -> Dict[str, Optional[int]]:
+    def shared_key(self) -> Optional[Hashable]:
+        """The base model analyzed in place of this model, if its model_info is already known."""
+        info = self.get_metadata().cached_model_info()
+        if info is None or has_python(info) or not info.cardData:
+            return None
+        base_model = info.cardData.get("base_model")
+        return (self.name, base_model) if isinstance(base_model, str) and base_model else None
+
+    def get_data(self) -> Dict[str, Any]:
         """
         Collects Python files from Hugging Face repo (or base model fallback),
         counts lines of code, and runs Flake8 to measure issues.
         """
-        temp_dir = tempfile.TemporaryDirectory()
-
+        if self.shared is not None:
+            return dict(self.shared)
+        metadata = self.get_metadata()
         full_name = f"{self.model_url.author}/{self.model_url.name}"
-        api = HfApi()
-        info = api.model_info(full_name)
-
-        file_list: list[str] = []
-        errors: Optional[int] = None
-        loc: Optional[int] = 0  # start counting lines, may be reset to None
-
-        # Collect Python files if available
-        if info.siblings:
-            for sib in info.siblings:
-                if sib.rfilename.endswith(".py"):
-                    path = self.SingleFileDownload(full_name, sib.rfilename, temp_dir.name)
-                    file_list.append(path)
-                    with open(path, "r", encoding="utf-8") as f:
-                        file_loc = len(f.readlines())
-                        if loc is not None:
-                            loc += file_loc
+        info = metadata.model_info(full_name)
 
         # If no .py files, try the base model if available
-        if not file_list and info.cardData:
+        if not has_python(info) and info.cardData:
             base_model = info.cardData.get("base_model")
             if base_model:
                 full_name = base_model
-                info = api.model_info(full_name)
-                if info.siblings:
-                    for sib in info.siblings:
-                        if sib.rfilename.endswith(".py"):
-                            path = self.SingleFileDownload(full_name, sib.rfilename, temp_dir.name)
-                            file_list.append(path)
-                            with open(path, "r", encoding="utf-8") as f:
-                                file_loc = len(f.readlines())
-                                if loc is not None:
-                                    loc += file_loc
+                info = metadata.model_info(full_name)
+        filenames, truncated = python_files(info)
+
+        file_list = self.download_files(full_name, filenames, getattr(info, "sha", None))
+        errors: Optional[int] = None
+        loc: Optional[int] = None
+        scans = [scan_file(path) for path in file_list]
 
         # Run flake8 silently if we found files
         if file_list:
-            style_guide = flake8.get_style_guide(
-                quiet=2, show_source=False, statistics=False
-            )
-            report = style_guide.check_files(file_list)
-            errors = report.total_errors
-        else:
-            errors, loc = None, None
+            with span("parse", tool="flake8", files=len(file_list)):
+                errors = get_analyzer().count_issues(file_list, [digest for _, digest in scans])
+            loc = sum(lines for lines, _ in scans)
 
-        temp_dir.cleanup()
-        return {"Issues": errors, "Lines of Code": loc}
+        return {"Issues": errors, "Lines of Code": loc, "Truncated": truncated}
 
-    def SingleFileDownload(self, full_name: str, filename: str, landing_path: str) -> str:
+    def download_files(self, full_name: str, filenames: List[str], revision: Optional[str]) -> List[str]:
+        """Download filenames concurrently; returns local paths in the same order."""
+        pool = download_pool()
+        # Copy the context per task so download spans land in this run's trace
+        futures = [pool.submit(contextvars.copy_context().run, self.SingleFileDownload, full_name, name, revision)
+                   for name in filenames]
+        return [future.result() for future in futures]
+
+    def SingleFileDownload(self, full_name: str, filename: str, revision: Optional[str] = None) -> str:
         """
-        Download a single file from Hugging Face Hub into a temp directory.
+        Download a single file from Hugging Face Hub into the shared HF cache.
+        With a commit sha as revision a cached copy is returned without any
+        request.
         """
-        model_path = hf_hub_download(
-            repo_id=full_name, filename=filename, local_dir=landing_path
-        )
+        with span("download", repo=full_name, file=filename):
+            model_path = hf_hub_download(
+                repo_id=full_name, filename=filename, revision=revision
+            )
         return model_path
 
     def calculate_score(self) -> float:
@@ -49,7 +49,6 @@ Rubric:
 
 """
 from typing import Dict, Optional
-from huggingface_hub import HfApi
 
 from src.cli.url import ModelURL
 from src.metrics.metric import Metric
@@ -91,8 +90,7 @@ class LicenseMetric(Metric):
         Gets license stored under either license or license_name,
         changes from model to model so we need to check both.
         """
-        api = HfApi()
-        info = api.model_info(f"{self.model_url.author}/{self.model_url.name}")
+        info = self.get_metadata().model_info()
 
         license_str: Optional[str] = None
         if info.cardData:
@@ -0,0 +1,304 @@
+"""
+llm.py
+--------
+Shared client for the Purdue GenAI Studio chat completions API.
+
+Summary
+- LLMMetric is the base of RampUpTimeMetric, DatasetQualityMetric and
+  DatasetAndCodeMetric; subclasses supply the rated content
+  (prompt_input()) and a versioned template (render_prompt(),
+  TEMPLATE_VERSION). Model prompts rate the README text (readme_excerpt()).
+- Builds the request for a single scoring prompt and parses the float reply.
+- Batches several scoring prompts (the three LLM metrics of a model, and
+  optionally several models) into one structured-JSON request.
+- Provides a blocking path (the pooled requests session from
+  src/sessions.py) and an async path (aiohttp session shared across the
+  batch by the async engine, via src/transport.py so it can be recorded
+  and replayed).
+- Successful ratings are stored in the persistent response cache, keyed by
+  endpoint, LLM model, template name@version and the SHA-256 of the rated
+  content (ScoringPrompt.cache_key). Forks and quantized variants sharing a
+  README hit the same entry, batched and single requests share hits, and
+  bumping one template's version invalidates only that metric's entries.
+  Plain string prompts are keyed by their full text.
+- GENAI_URL overrides the endpoint (e.g. the local stub server).
+- A missing API key or prompt scores 0.0; request failures (HTTP error,
+  unparsable reply) raise so Metric.run marks the metric as failed and
+  applies its 0.0 fallback. In a batch a failed item maps to None.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import aiohttp
+
+from src.cache import cached, cached_async, lookup, store
+from src.metrics.metric import Metric
+from src.ratelimit import send_async
+from src.sessions import get_http_session
+from src.stats import count_http
+from src.tracing import span
+from src.transport import request_async
+
+GENAI_URL = os.environ.get("GENAI_URL", "https://genai.rcac.purdue.edu/api/chat/completions")
+LLM_MODEL = "llama3.1:latest"
+LLM_TIMEOUT = 60
+# README characters embedded in a prompt; keeps batched requests small
+README_PROMPT_CHARS = 6000
+
+BATCH_INSTRUCTIONS = """You will evaluate several independent items. Each item has an id and its own task.
+Rate every item exactly as its task describes, but ignore any per-item output format instructions.
+IMPORTANT: Reply with only one JSON object mapping every item id to its float rating in [0,1],
+for example {"a": 0.5, "b": 0.8}. Do not provide any context or explanation."""
+
+
+@dataclass(frozen=True)
+class ScoringPrompt:
+    """Prompt text plus the cache key of the rating it asks for."""
+
+    text: str
+    cache_key: Tuple[str, ...]
+
+    @classmethod
+    def for_content(cls, text: str, template: str, version: int, content: str) -> "ScoringPrompt":
+        """text, keyed by template name@version and the SHA-256 of the content it rates."""
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return cls(text, (f"{template}@v{version}", digest))
+
+
+Prompt = Union[str, ScoringPrompt]
+
+
+def _text(prompt: Prompt) -> str:
+    return prompt.text if isinstance(prompt, ScoringPrompt) else prompt
+
+
+def _cache_key(prompt: Prompt) -> Tuple[str, ...]:
+    return prompt.cache_key if isinstance(prompt, ScoringPrompt) else (prompt,)
+
+
+def build_request(prompt: str, api_key: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """Return (headers, body) for a single-message chat completion."""
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+    }
+    body = {
+        "model": LLM_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    return headers, body
+
+
+def response_content(response_data: Dict[str, Any]) -> str:
+    """Text of the first choice of a chat completion response."""
+    return response_data["choices"][0]["message"]["content"]
+
+
+def parse_score(response_data: Dict[str, Any]) -> float:
+    """Extract the float rating from a chat completion response."""
+    return float(response_content(response_data).strip())
+
+
+def build_batch_prompt(prompts: Mapping[str, Prompt]) -> str:
+    """Combine several scoring prompts into one JSON-reply prompt."""
+    items = "\n\n".join(f"### Item id: {key}\n{_text(prompt).strip()}" for key, prompt in prompts.items())
+    return f"{BATCH_INSTRUCTIONS}\n\n{items}"
+
+
+def parse_batch_scores(content: str, keys) -> Dict[str, Optional[float]]:
+    """
+    Parse the JSON object of a batched reply. Items that are missing or not
+    numeric map to None.
+    """
+    scores: Dict[str, Optional[float]] = {key: None for key in keys}
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        return scores
+    try:
+        parsed = json.loads(content[start:end + 1])
+    except ValueError:
+        return scores
+    if not isinstance(parsed, dict):
+        return scores
+
+    for key in scores:
+        try:
+            scores[key] = float(parsed[key])
+        except (KeyError, TypeError, ValueError):
+            pass
+    return scores
+
+
+def _post(prompt: str, api_key: str) -> Dict[str, Any]:
+    headers, body = build_request(prompt, api_key)
+    response = get_http_session().post(GENAI_URL, headers=headers, json=body, timeout=LLM_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _post_async(session: aiohttp.ClientSession, prompt: str, api_key: str) -> Dict[str, Any]:
+    headers, body = build_request(prompt, api_key)
+    timeout = aiohttp.ClientTimeout(total=LLM_TIMEOUT)
+    # aiohttp bypasses the requests hooks, so trace and throttle the call here
+    with span("http", method="POST", url=GENAI_URL) as attrs:
+        response = await send_async(GENAI_URL, lambda: request_async(
+            session, "POST", GENAI_URL, headers=headers, json_body=body, timeout=timeout))
+        attrs["status"] = response.status
+    count_http(GENAI_URL, response.status)
+    response.raise_for_status()
+    return response.json()
+
+
+def score_prompt(prompt: Optional[Prompt]) -> float:
+    """Send a scoring prompt and return the rating (0.0 without key/prompt)."""
+    api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
+    if not api_key or not prompt:
+        return 0.0
+
+    return cached("llm", GENAI_URL, LLM_MODEL, None,
+                  lambda: parse_score(_post(_text(prompt), api_key)), *_cache_key(prompt))
+
+
+async def score_prompt_async(session: aiohttp.ClientSession, prompt: Optional[Prompt]) -> float:
+    """Async variant of score_prompt using a shared aiohttp session."""
+    api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
+    if not api_key or not prompt:
+        return 0.0
+
+    async def fetch() -> float:
+        return parse_score(await _post_async(session, _text(prompt), api_key))
+
+    return await cached_async("llm", GENAI_URL, LLM_MODEL, None, fetch, *_cache_key(prompt))
+
+
+def _split_cached(prompts: Mapping[str, Prompt]) -> Tuple[Dict[str, Optional[float]], Dict[str, Prompt]]:
+    """Serve what we can from the response cache; return (scores, still to ask)."""
+    scores: Dict[str, Optional[float]] = {}
+    missing: Dict[str, Prompt] = {}
+    for key, prompt in prompts.items():
+        hit, value = lookup("llm", GENAI_URL, LLM_MODEL, None, *_cache_key(prompt))
+        if hit:
+            scores[key] = value
+        else:
+            missing[key] = prompt
+    return scores, missing
+
+
+def _store_batch(prompts: Mapping[str, Prompt], scores: Dict[str, Optional[float]]) -> None:
+    for key, value in scores.items():
+        if value is not None:
+            store("llm", value, GENAI_URL, LLM_MODEL, None, *_cache_key(prompts[key]))
+
+
+def score_prompts(prompts: Mapping[str, Prompt]) -> Dict[str, Optional[float]]:
+    """
+    Score several prompts with as few requests as possible: cached items are
+    answered locally, a single remaining item uses the plain prompt, and
+    anything more is combined into one JSON request.
+    Returns {key: rating}, with None for items that failed.
+    """
+    api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
+    if not api_key:
+        return {key: 0.0 for key in prompts}
+
+    scores, missing = _split_cached(prompts)
+    if len(missing) == 1:
+        (key, prompt), = missing.items()
+        try:
+            scores[key] = score_prompt(prompt)
+        except Exception:
+            scores[key] = None
+    elif missing:
+        try:
+            content = response_content(_post(build_batch_prompt(missing), api_key))
+            batch = parse_batch_scores(content, missing)
+        except Exception:
+            batch = {key: None for key in missing}
+        _store_batch(missing, batch)
+        scores.update(batch)
+    return scores
+
+
+async def score_prompts_async(prompts: Mapping[str, Prompt], session: aiohttp.ClientSession) -> Dict[str, Optional[float]]:
+    """Async variant of score_prompts using a shared aiohttp session."""
+    api_key = os.environ.get("GEN_AI_STUDIO_API_KEY")
+    if not api_key:
+        return {key: 0.0 for key in prompts}
+
+    scores, missing = _split_cached(prompts)
+    if len(missing) == 1:
+        (key, prompt), = missing.items()
+        try:
+            scores[key] = await score_prompt_async(session, prompt)
+        except Exception:
+            scores[key] = None
+    elif missing:
+        try:
+            content = response_content(await _post_async(session, build_batch_prompt(missing), api_key))
+            batch = parse_batch_scores(content, missing)
+        except Exception:
+            batch = {key: None for key in missing}
+        _store_batch(missing, batch)
+        scores.update(batch)
+    return scores
+
+
+class LLMMetric(Metric):
+    """
+    Metric scored by a single GenAI rating in [0,1].
+
+    Subclasses implement prompt_input() and render_prompt(); the scheduler
+    may also batch prompts and inject the rating with set_data({"score": ...}).
+    """
+
+    # Bump whenever render_prompt() changes; only this metric's cached ratings are invalidated
+    TEMPLATE_VERSION = 1
+
+    def prompt_input(self) -> Optional[str]:
+        """Content the rating depends on, or None if there is nothing to score."""
+        return None
+
+    def render_prompt(self, content: str) -> str:
+        """Prompt text asking to rate content."""
+        raise NotImplementedError
+
+    def prompt(self) -> Optional[ScoringPrompt]:
+        """Scoring prompt, or None if there is nothing to score."""
+        content = self.prompt_input()
+        if content is None:
+            return None
+        return ScoringPrompt.for_content(self.render_prompt(content), self.name, self.TEMPLATE_VERSION, content)
+
+    def state_inputs(self) -> Dict[str, Any]:
+        # A new template or LLM rates differently
+        return dict(super().state_inputs(), template=f"{self.name}@v{self.TEMPLATE_VERSION}", llm=LLM_MODEL)
+
+    def readme_excerpt(self) -> str:
+        """README body of the model, truncated for a prompt."""
+        text = self.get_metadata().readme().excerpt(README_PROMPT_CHARS)
+        return text or "(no README found)"
+
+    def calculate_score(self) -> float:
+        # Safely handle None or missing "score"
+        if not self.data or "score" not in self.data:
+            return 0.0
+        return float(self.data["score"])
+
+    def get_data(self) -> Dict[str, Any]:
+        if self.shared is not None:
+            return dict(self.shared)
+        # Missing API key or URL scores 0.0; request failures raise into run()
+        if not os.environ.get("GEN_AI_STUDIO_API_KEY"):
+            return {"score": 0.0}
+        return {"score": score_prompt(self.prompt())}
+
+    async def get_data_async(self, session: aiohttp.ClientSession) -> Dict[str, Any]:
+        if self.shared is not None:
+            return dict(self.shared)
+        if not os.environ.get("GEN_AI_STUDIO_API_KEY"):
+            return {"score": 0.0}
+        return {"score": await score_prompt_async(session, self.prompt())}
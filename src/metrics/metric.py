@@ -15,10 +15,39 @@ To add a new metric:
 1. Subclass Metric.
 2. Implement calculate_score(self) using self.data.
 3. Optionally override __init__ to set a default name.
+
+Metrics that need Hugging Face model_info should read it through
+self.get_metadata() so a single fetch is shared across all metrics of a model.
+
+Metrics whose data (or part of it) depends on an artifact other lines may
+reference too (a dataset, a code repo) return a shared_key(); the
+scheduler computes each key once per batch and hands shared_data() of
+that run to the other metrics with the key as self.shared.
+
+A metric with a timeout (seconds) abandons get_data at its deadline, scores
+the 0 fallback and is flagged timed_out.
+
+With tracing on (src/tracing.py) each run records "get_data" and "score"
+spans, plus any finer phases opened underneath, into self.spans; with
+stats on (src/stats.py) its cache and HTTP counters go to self.counts.
 """
 
+import asyncio
+import contextvars
+import threading
 import time
-from typing import Any, Dict, Optional, Union
+from collections import Counter
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+
+import aiohttp
+
+from src.metadata import ModelMetadata
+from src.stats import counting
+from src.tracing import Span, collect, span
+
+
+class MetricTimeout(Exception):
+    """get_data did not finish within the metric's timeout."""
 
 
 class Metric():
@@ -30,25 +59,76 @@ class Metric():
         data (dict): Parsed metadata required for scoring.
         score (float): Computed score in [0,1].
         latency (int): Computation time in milliseconds.
+        metadata (ModelMetadata): Shared model_info provider (optional).
+        failed (bool): True if fetching/scoring raised and the fallback was used.
+        timeout (float): Seconds get_data may take before it is abandoned.
+        timed_out (bool): True if the timeout hit and the fallback was used.
+        spans (list): Trace spans of the last run (empty unless tracing).
+        counts (Counter): Stats counters of the last run (empty unless --stats).
+        depends_on (tuple): Revisions ("model", "code", "dataset",
+            "base_model") the score depends on; used to reuse unchanged
+            scores across runs.
+        SCORE_VERSION (int): Bump when get_data/calculate_score change, so
+            scores stored by an older version are not reused.
+        shared (dict): shared_data() of another metric with the same
+            shared_key(), injected by the scheduler (None = fetch it).
 
     Subclasses must implement:
         calculate_score(self) -> float
     """
 
+    depends_on: Tuple[str, ...] = ("model",)
+    SCORE_VERSION = 1
+
     def __init__(self, name: str):
         self.name = name
         self.data: Optional[Dict[str, Any]] = None
         self.score: Optional[Union[float, Dict[str, float]]] = None
         self.latency: Optional[int] = None
+        self.metadata: Optional[ModelMetadata] = None
+        self.failed = False
+        self.timeout: Optional[float] = None
+        self.timed_out = False
+        self.spans: List[Span] = []
+        self.counts: Counter = Counter()
+        self.shared: Optional[Dict[str, Any]] = None
 
     def get_data(self) -> Dict[str, Any]:
         """Optionally fetch data. Default is empty dict."""
         return {}
 
+    def shared_key(self) -> Optional[Hashable]:
+        """
+        Key of the artifact that shared_data() depends on alone, or None if
+        nothing this metric fetches is shared with other lines.
+        """
+        return None
+
+    def shared_data(self) -> Dict[str, Any]:
+        """Part of self.data determined by shared_key() alone (default: all of it)."""
+        return dict(self.data or {})
+
+    def state_inputs(self) -> Dict[str, Any]:
+        """Inputs besides revisions a stored score is only valid for (see src/state.py)."""
+        return {"version": self.SCORE_VERSION}
+
     def set_data(self, data: Dict[str, Any]) -> None:
         """Attach metadata needed to calculate metric."""
         self.data = data
 
+    def set_metadata(self, metadata: ModelMetadata) -> None:
+        """Attach a shared model metadata provider."""
+        self.metadata = metadata
+
+    def get_metadata(self) -> ModelMetadata:
+        """
+        Return the shared metadata provider, creating a private one if none
+        was injected (e.g. when a metric is run on its own).
+        """
+        if self.metadata is None:
+            self.metadata = ModelMetadata(getattr(self, "model_url", None))
+        return self.metadata
+
     def calculate_score(self) -> Union[float, Dict[str, float]]:
         """
         Compute the metric score.
@@ -64,25 +144,106 @@ class Metric():
         If anything fails, fallback score is 0 (float or dict depending on metric type).
         """
         start = time.time()
-        try:
-            if self.data is None:
-                self.data = self.get_data()
-            self.score = self.calculate_score()
-        except Exception:
-            # Detect if metric is supposed to return a dict (like size_score)
-            if self.name == "size_score":
-                self.score = {
-                    "raspberry_pi": 0.0,
-                    "jetson_nano": 0.0,
-                    "desktop_pc": 0.0,
-                    "aws_server": 0.0,
-                }
-            else:
-                self.score = 0.0
-            self.data = {}
-        finally:
-            self.latency = int((time.time() - start) * 1000)
+        self.spans, self.counts = [], Counter()
+        with collect(self.spans, "metric", metric=self.name) as root, counting(self.counts):
+            try:
+                if self.data is None:
+                    with span("get_data"):
+                        self.data = self._get_data_within(self.timeout)
+                with span("score"):
+                    self.score = self.calculate_score()
+            except MetricTimeout:
+                self.set_timeout_score()
+            except Exception:
+                self.set_fallback_score()
+            finally:
+                self.latency = int((time.time() - start) * 1000)
+                root.update(failed=self.failed, timed_out=self.timed_out)
+
+    def _get_data_within(self, timeout: Optional[float]) -> Dict[str, Any]:
+        if timeout is None:
+            return self.get_data()
+
+        # The worker thread only fills `box`, so an abandoned run can never
+        # touch this metric after it has been scored and shipped back
+        box: Dict[str, Any] = {}
+
+        def target() -> None:
+            try:
+                box["data"] = self.get_data()
+            except BaseException as exc:
+                box["error"] = exc
+
+        # Carry the open trace span over to the worker thread
+        context = contextvars.copy_context()
+        worker = threading.Thread(target=context.run, args=(target,), name=f"metric-{self.name}", daemon=True)
+        worker.start()
+        worker.join(timeout)
+        if worker.is_alive():
+            # Detach from what the abandoned thread may still write to
+            self.spans, self.counts = list(self.spans), Counter(self.counts)
+            raise MetricTimeout(f"{self.name} exceeded {timeout}s")
+        if "error" in box:
+            raise box["error"]
+        return box["data"]
+
+    async def get_data_async(self, session: aiohttp.ClientSession) -> Dict[str, Any]:
+        """
+        Async variant of get_data used by the async engine.
+        Default runs the blocking get_data in a worker thread; network-bound
+        metrics override it to use the shared aiohttp session.
+        """
+        return await asyncio.to_thread(self.get_data)
+
+    async def run_async(self, session: aiohttp.ClientSession) -> None:
+        """Async variant of run() with the same fallback and latency handling."""
+        start = time.time()
+        self.spans, self.counts = [], Counter()
+        with collect(self.spans, "metric", metric=self.name) as root, counting(self.counts):
+            try:
+                if self.data is None:
+                    with span("get_data"):
+                        self.data = await self._get_data_async_within(session, self.timeout)
+                with span("score"):
+                    self.score = self.calculate_score()
+            except MetricTimeout:
+                self.set_timeout_score()
+            except Exception:
+                self.set_fallback_score()
+            finally:
+                self.latency = int((time.time() - start) * 1000)
+                root.update(failed=self.failed, timed_out=self.timed_out)
+
+    async def _get_data_async_within(self, session: aiohttp.ClientSession, timeout: Optional[float]) -> Dict[str, Any]:
+        if timeout is None:
+            return await self.get_data_async(session)
+
+        task = asyncio.ensure_future(self.get_data_async(session))
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        if not done:
+            task.cancel()
+            raise MetricTimeout(f"{self.name} exceeded {timeout}s")
+        return task.result()
+
+    def set_fallback_score(self) -> None:
+        """Force the 0 score used when fetching or scoring fails."""
+        self.failed = True
+        # Detect if metric is supposed to return a dict (like size_score)
+        if self.name == "size_score":
+            self.score = {
+                "raspberry_pi": 0.0,
+                "jetson_nano": 0.0,
+                "desktop_pc": 0.0,
+                "aws_server": 0.0,
+            }
+        else:
+            self.score = 0.0
+        self.data = {}
 
+    def set_timeout_score(self) -> None:
+        """Fallback score for a metric abandoned at its deadline."""
+        self.set_fallback_score()
+        self.timed_out = True
 
     def as_dict(self) -> Dict[str, Any]:
         """
@@ -4,9 +4,12 @@ performance_claims.py
 Performance Claims Metric
 
 Summary:
-- Parses a model's README to detect performance claims.
+- Scans the body of a model's README (shared via ModelMetadata.readme())
+  to detect performance claims.
 - Searches for benchmark names, evaluation metrics, and "SOTA"-style language.
 - Scores models based on density of detected claims.
+- All key terms are counted in a single pass of one combined regex built
+  at import time.
 
 Rubric:
 - 1.0 = >20 claims
@@ -19,12 +22,10 @@ Rubric:
 
 import re
 from typing import Dict, Any
-import contextlib
-import io
 
-from huggingface_hub import ModelCard
 from src.cli.url import ModelURL
 from src.metrics.metric import Metric
+from src.tracing import span
 
 
 # Key terms that signal performance-related claims
@@ -44,6 +45,22 @@ KEY_TERMS: Dict[str, list[str]] = {
     "numbers": ["%", "percent", "score", "results"],
 }
 
+# One alternation over every term, with a named group per category so a
+# match is attributed by match.lastgroup (case-folded variants such as
+# "ſota" included). Longest terms come first so e.g. "SuperGLUE" is tried
+# before "GLUE".
+KEY_TERMS_PATTERN = re.compile(
+    r"\b(?:"
+    + "|".join(
+        f"(?P<{cat}>"
+        + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+        + ")"
+        for cat, terms in KEY_TERMS.items()
+    )
+    + r")\b",
+    flags=re.IGNORECASE,
+)
+
 
 def count_matches(text: str, terms: list[str]) -> int:
     """Count case-insensitive matches of each term in text."""
@@ -53,6 +70,17 @@ def count_matches(text: str, terms: list[str]) -> int:
     return total
 
 
+def count_categories(text: str) -> Dict[str, int]:
+    """
+    Count case-insensitive matches of every KEY_TERMS category in one scan.
+    Same result as count_matches(text, terms) for each category.
+    """
+    matches = {cat: 0 for cat in KEY_TERMS}
+    for match in KEY_TERMS_PATTERN.finditer(text):
+        matches[match.lastgroup] += 1
+    return matches
+
+
 class PerformanceClaimsMetric(Metric):
     def __init__(self, model_url: ModelURL):
         super().__init__("performance_claims")
@@ -60,23 +88,14 @@ class PerformanceClaimsMetric(Metric):
 
     def get_data(self) -> Dict[str, Any]:
         """
-        Fetch README and count performance-related terms.
+        Count performance-related terms in the README body.
         Returns a dict with:
           - "matches": dict of category → count
           - "total": int total matches
         """
-        repo_id = f"{self.model_url.author}/{self.model_url.name}"
-        readme = ""
-        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-            try:
-                card = ModelCard.load(repo_id)
-                readme = card.text or ""
-            except Exception:
-                readme = ""
-
-        matches: Dict[str, int] = {
-            cat: count_matches(readme, terms) for cat, terms in KEY_TERMS.items()
-        }
+        readme = self.get_metadata().readme().body
+        with span("parse", chars=len(readme)):
+            matches = count_categories(readme)
         total_matches = sum(matches.values())
         return {"matches": matches, "total": total_matches}
 
@@ -5,7 +5,7 @@ Model Size Metric.
 
 Summary
 - Scores model size based on parameter count and deployability.
-- Uses Hugging Face API metadata to fetch number of parameters
+- Uses Hugging Face API metadata (shared model_info) to get number of parameters
 
 Score:
 {
@@ -20,8 +20,6 @@ NOTES: potentially upgrade in future to infer number of parameters from model na
 
 from typing import Dict, Optional, Any
 
-from huggingface_hub import HfApi
-
 from src.cli.url import ModelURL
 from src.metrics.metric import Metric
 
@@ -35,8 +33,7 @@ class SizeMetric(Metric):
         """
         Gets number of parameters from model_info.safetensors or cardData "params".
         """
-        api = HfApi()
-        info = api.model_info(f"{self.model_url.author}/{self.model_url.name}")
+        info = self.get_metadata().model_info()
 
         if info.safetensors and "total" in info.safetensors:
             return {"size": info.safetensors.get("total")}
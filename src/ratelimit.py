@@ -0,0 +1,231 @@
+"""
+ratelimit.py
+--------------
+Per-upstream throttling and retry of rate-limited requests.
+
+Summary
+- One HostLimiter per upstream ("hub", "github", "genai" by URL prefix,
+  anything else by host name), so a throttled GitHub never slows the Hub.
+- Token bucket: the upstream's quota is the bucket. X-RateLimit-Remaining
+  sets its level and X-RateLimit-Reset when it refills; an empty bucket
+  holds requests until the reset instead of spending them on 403/429
+  answers.
+- AIMD concurrency window: every answered request widens it by 1/window,
+  every rate-limited one (429, or 403 with no quota left) halves it.
+- Rate-limited requests are retried (up to `retries` times) after
+  Retry-After, the quota reset, or an exponential backoff, each plus
+  random jitter so waiting clients do not retry in lockstep. They no
+  longer surface as a failed metric scored 0. A wait longer than
+  MAX_RETRY_WAIT is not worth it: the response is returned as is.
+- Blocking clients go through a transport hook (src/transport.py); the
+  async GenAI path wraps its request in send_async().
+
+Throttled retries are counted per upstream as "http_retries" (--stats).
+
+Usage:
+    configure_ratelimit(True, upstreams, max_concurrency=32, retries=3)
+    response = await send_async(url, lambda: request_async(...))
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, TypeVar
+
+import requests  # type: ignore[import-untyped]
+from requests.structures import CaseInsensitiveDict  # type: ignore[import-untyped]
+
+from src.stats import count
+from src.transport import Send, add_hook, match_upstream, remove_hook
+
+R = TypeVar("R")
+
+# Longest wait (seconds) for a rate limit before giving up on the request
+MAX_RETRY_WAIT = 60.0
+# Cap of the exponential backoff when the upstream gives no hint
+MAX_BACKOFF = 30.0
+# Poll interval while the concurrency window is full
+POLL_INTERVAL = 0.05
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _reset_in(value: Optional[str]) -> Optional[float]:
+    """Seconds until X-RateLimit-Reset: epoch seconds (GitHub) or a delta."""
+    reset = _number(value)
+    if reset is None:
+        return None
+    # Anything past 2001 is a timestamp, not a delta
+    return max(0.0, reset - time.time()) if reset > 1e9 else max(0.0, reset)
+
+
+class HostLimiter:
+    """Token bucket plus AIMD concurrency window for one upstream."""
+
+    def __init__(self, name: str, max_concurrency: int, backoff: float = 0.5):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.backoff = backoff
+        self.window = float(self.max_concurrency)
+        self.in_flight = 0
+        # Requests left in the upstream's quota; None until it reports one
+        self.quota: Optional[float] = None
+        self._quota_reset = 0.0
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    def _try_acquire(self) -> float:
+        now = time.monotonic()
+        if self.quota is not None and now >= self._quota_reset:
+            self.quota = None
+        # Waits beyond MAX_RETRY_WAIT are not sat out; the upstream answers instead
+        blocked = self._blocked_until - now
+        if 0 < blocked <= MAX_RETRY_WAIT:
+            return blocked
+        if self.quota is not None and self.quota < 1 and self._quota_reset - now <= MAX_RETRY_WAIT:
+            return self._quota_reset - now
+        if self.in_flight >= int(self.window):
+            return POLL_INTERVAL
+        if self.quota is not None:
+            self.quota -= 1
+        self.in_flight += 1
+        return 0.0
+
+    def try_acquire(self) -> float:
+        """Take a request slot: 0.0 if taken, else seconds to wait before trying again."""
+        with self._cond:
+            return self._try_acquire()
+
+    def acquire(self) -> None:
+        """Block until a request slot is free."""
+        with self._cond:
+            while True:
+                wait = self._try_acquire()
+                if not wait:
+                    return
+                self._cond.wait(wait)
+
+    def release(self, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None,
+                attempt: int = 0) -> Optional[float]:
+        """
+        Return the slot and learn from the response (status None = no
+        response). For a rate-limited response returns the delay before it
+        may be retried, for which the upstream stays blocked; else None.
+        """
+        now = time.monotonic()
+        fields: Mapping[str, str] = CaseInsensitiveDict(headers or {})
+        remaining = _number(fields.get("X-RateLimit-Remaining"))
+        reset_in = _reset_in(fields.get("X-RateLimit-Reset"))
+        throttled = status == 429 or (status == 403 and remaining == 0)
+
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+            if status is None:
+                return None
+
+            if remaining is not None and reset_in is not None:
+                self.quota, self._quota_reset = remaining, now + reset_in
+
+            if not throttled:
+                self.window = min(float(self.max_concurrency), self.window + 1 / self.window)
+                return None
+
+            self.window = max(1.0, self.window / 2)
+            delay = _number(fields.get("Retry-After"))
+            if delay is None and remaining == 0 and reset_in is not None:
+                delay = reset_in
+            if delay is None:
+                delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * 2 ** attempt))
+            delay += random.uniform(0, self.backoff)
+            self._blocked_until = max(self._blocked_until, now + delay)
+            return delay
+
+
+class RateController:
+    """Limiters by upstream, and the retry loop around one request."""
+
+    def __init__(self, upstreams: Optional[Mapping[str, str]] = None, max_concurrency: int = 32,
+                 retries: int = 3, backoff: float = 0.5):
+        self.upstreams = {name: prefix.rstrip("/") for name, prefix in (upstreams or {}).items()}
+        self.max_concurrency = max_concurrency
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, HostLimiter] = {}
+
+    def limiter(self, url: str) -> HostLimiter:
+        name = match_upstream(url, self.upstreams)
+        with self._lock:
+            if name not in self._limiters:
+                self._limiters[name] = HostLimiter(name, self.max_concurrency, self.backoff)
+            return self._limiters[name]
+
+    def _retry(self, limiter: HostLimiter, delay: Optional[float], attempt: int) -> bool:
+        if delay is None or attempt >= self.retries or delay > MAX_RETRY_WAIT:
+            return False
+        count("http_retries", limiter.name)
+        logging.info("%s rate limited, retrying in %.1fs (window %.1f)", limiter.name, delay, limiter.window)
+        return True
+
+    def __call__(self, request: requests.PreparedRequest, send: Send) -> requests.Response:
+        limiter = self.limiter(request.url or "")
+        attempt = 0
+        while True:
+            limiter.acquire()
+            try:
+                response = send(request)
+            except BaseException:
+                limiter.release()
+                raise
+            delay = limiter.release(response.status_code, response.headers, attempt)
+            if not self._retry(limiter, delay, attempt):
+                return response
+            response.close()
+            attempt += 1
+
+    async def send_async(self, url: str, send: Callable[[], Awaitable[Any]]) -> Any:
+        limiter = self.limiter(url)
+        attempt = 0
+        while True:
+            wait = limiter.try_acquire()
+            while wait:
+                await asyncio.sleep(wait)
+                wait = limiter.try_acquire()
+            try:
+                response = await send()
+            except BaseException:
+                limiter.release()
+                raise
+            delay = limiter.release(response.status, response.headers, attempt)
+            if not self._retry(limiter, delay, attempt):
+                return response
+            attempt += 1
+
+
+_controller: Optional[RateController] = None
+
+
+def configure_ratelimit(enable: bool, upstreams: Optional[Mapping[str, str]] = None,
+                        max_concurrency: int = 32, retries: int = 3, backoff: float = 0.5) -> None:
+    """Install (or remove) the per-upstream throttle for this process."""
+    global _controller
+    if _controller is not None:
+        remove_hook(_controller)
+    _controller = RateController(upstreams, max_concurrency, retries, backoff) if enable else None
+    if _controller is not None:
+        add_hook(_controller)
+
+
+async def send_async(url: str, send: Callable[[], Awaitable[R]]) -> R:
+    """Run an async request through the throttle of url's upstream (if configured)."""
+    if _controller is None:
+        return await send()
+    return await _controller.send_async(url, send)
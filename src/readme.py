@@ -0,0 +1,99 @@
+"""
+readme.py
+-----------
+Model README (model card) fetched once and parsed once.
+
+Summary
+- ModelReadme splits the raw text into the YAML front matter (as a dict),
+  the markdown body and its heading sections. Headings inside fenced code
+  blocks (e.g. "# install" comments) do not start sections.
+- ModelMetadata.readme() owns the fetch (metadata.load_readme), so
+  PerformanceClaimsMetric and the GenAI prompts share one download per
+  model; the raw text goes through the response cache and its SHA-256
+  identifies the README across forks.
+
+Usage:
+    readme = ModelReadme.parse(text)
+    readme.front_matter.get("license"), readme.section("Usage")
+    readme.excerpt(6000)
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from huggingface_hub.repocard import REGEX_YAML_BLOCK
+
+HEADING_PATTERN = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+FENCE_PATTERN = re.compile(r"^ {0,3}(```|~~~)")
+
+
+def split_sections(body: str) -> List[Tuple[str, str]]:
+    """
+    (heading, text) pairs of a markdown body in document order; text before
+    the first heading is the "" section.
+    """
+    sections: List[Tuple[str, str]] = []
+    heading, lines = "", []
+    in_fence = False
+    for line in body.splitlines():
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match:
+            if heading or any(line.strip() for line in lines):
+                sections.append((heading, "\n".join(lines).strip()))
+            heading, lines = match.group(2), []
+        else:
+            lines.append(line)
+    if heading or any(line.strip() for line in lines):
+        sections.append((heading, "\n".join(lines).strip()))
+    return sections
+
+
+@dataclass
+class ModelReadme:
+    """A model card split into front matter, body and sections."""
+
+    text: str = ""
+    front_matter: Dict[str, Any] = field(default_factory=dict)
+    body: str = ""
+    sections: List[Tuple[str, str]] = field(default_factory=list)
+    sha256: str = hashlib.sha256(b"").hexdigest()
+
+    @classmethod
+    def parse(cls, text: str) -> "ModelReadme":
+        front_matter: Dict[str, Any] = {}
+        body = text
+        match = REGEX_YAML_BLOCK.search(text)
+        if match:
+            body = text[match.end():]
+            try:
+                loaded = yaml.safe_load(match.group(2))
+            except yaml.YAMLError:
+                loaded = None
+            if isinstance(loaded, dict):
+                front_matter = loaded
+        return cls(
+            text=text,
+            front_matter=front_matter,
+            body=body.strip(),
+            sections=split_sections(body),
+            sha256=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        )
+
+    def section(self, heading: str) -> Optional[str]:
+        """Text of the first section whose heading matches (case-insensitive)."""
+        wanted = heading.strip().lower()
+        for name, text in self.sections:
+            if name.lower() == wanted:
+                return text
+        return None
+
+    def excerpt(self, limit: int) -> str:
+        """The body, cut to at most limit characters."""
+        if len(self.body) <= limit:
+            return self.body
+        return self.body[:limit].rstrip() + "\n[...]"
@@ -0,0 +1,562 @@
+"""
+scheduler.py
+--------------
+Batch-level metric scheduler.
+
+Summary
+- Fans every (line, metric) task of a URL batch out onto one long-lived
+  executor instead of creating a process pool per line.
+- Each model first gets a metadata prefetch task; once that finishes its
+  eight metric tasks are submitted with the shared ModelMetadata attached.
+- Results stream back as they complete and a line's NDJSON record is built
+  as soon as all of its metrics are done.
+- Lines are pulled lazily from the input iterable and at most max_inflight
+  of them are in progress or held unwritten by the output (backlog, e.g.
+  the --ordered reorder buffer) at once, so memory stays bounded for huge
+  inputs.
+- With a ScoreState (--state), the prefetch task also resolves current
+  revisions and metrics whose inputs are unchanged are reused, not re-run.
+  A line whose metrics are all reusable skips the prefetch itself: the
+  revision lookups are its only requests.
+- GenAI-scored metrics (LLMMetric) are not run one request each: their
+  prompts are collected and scored by one batched request per model, or
+  per llm_batch models (--llm-batch).
+- Deadlines: metric_timeout (--metric-timeout) is handed to every metric,
+  which abandons its fetch when it overruns; model_timeout (--model-timeout)
+  bounds a whole line. An overdue line is emitted with the metrics that did
+  finish, the rest scored 0 and listed under "timed_out"; their late results
+  are ignored and never touch the emitted record. A batched GenAI request gets the metric_timeout as well: the
+  metrics still waiting on it when it runs out are timed out the same way.
+- A task that dies with its worker (e.g. BrokenProcessPool), or cannot be
+  submitted at all, fails only its own metrics: the line is still emitted
+  with them scored 0 and the batch goes on.
+- With a TraceWriter (--trace), every finished line's metric spans are
+  exported under one trace, next to a "prefetch" span for its metadata.
+- With RunStats (--stats), finished metrics and the counters of every
+  task (cache lookups, HTTP calls) are aggregated for the run report.
+- Metrics with a shared_key() (a dataset's quality rating, a code repo's
+  contributor count, a base model's code analysis) are computed once per
+  key and batch: the first metric with a key runs, later ones wait for it
+  and get its shared_data() injected. If the first one fails, the waiting
+  ones fetch on their own.
+
+The executor is any concurrent.futures.Executor; main.py uses a
+ProcessPoolExecutor sized by the -p/--parallelism flag, or an AsyncExecutor
+(--engine async) whose coroutine path runs Metric.run_async.
+"""
+
+import copy
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import aiohttp
+
+from src.cli.output import build_output
+from src.cli.url import URL, CodeURL, DatasetURL, ModelURL
+from src.metadata import ModelMetadata
+from src.metrics.bus_factor import BusFactorMetric
+from src.metrics.code_quality import CodeQualityMetric
+from src.metrics.dataset_and_code import DatasetAndCodeMetric
+from src.metrics.dataset_quality import DatasetQualityMetric
+from src.metrics.license import LicenseMetric
+from src.metrics.llm import LLMMetric, ScoringPrompt, score_prompts, score_prompts_async
+from src.metrics.metric import Metric
+from src.metrics.performance_claims import PerformanceClaimsMetric
+from src.metrics.ramp_up_time import RampUpTimeMetric
+from src.metrics.size import SizeMetric
+from src.state import ScoreState, reusable
+from src.stats import RunStats, counting
+from src.tracing import TraceWriter, new_span
+
+# Metric weights used for net_score
+WEIGHTS: Dict[str, float] = {
+    "ramp_up_time": 0.1,
+    "bus_factor": 0.15,
+    "performance_claims": 0.1,
+    "license": 0.1,
+    "size_score": 0.1,
+    "dataset_and_code_score": 0.15,
+    "dataset_quality": 0.15,
+    "code_quality": 0.15,
+}
+
+
+def build_metrics(code_url, dataset_url, model_url) -> List[Metric]:
+    """Instantiate the metrics computed for one URL line."""
+    return [
+        RampUpTimeMetric(model_url),
+        BusFactorMetric(code_url, model_url),
+        PerformanceClaimsMetric(model_url),
+        LicenseMetric(model_url),
+        SizeMetric(model_url),
+        DatasetAndCodeMetric(model_url),
+        DatasetQualityMetric(dataset_url),
+        CodeQualityMetric(code_url, model_url),
+    ]
+
+
+def fetch_metadata(
+    model_url: ModelURL,
+    code_url: Optional[CodeURL] = None,
+    dataset_url: Optional[DatasetURL] = None,
+    resolve_revisions: bool = False,
+    prior: Optional[Dict[str, Any]] = None,
+    metrics: Sequence[Metric] = (),
+) -> Tuple[ModelMetadata, float, float, Counter]:
+    """
+    Worker task: prefetch shared model metadata, with wall-clock span.
+    Optionally resolves current revisions first so model_info is pinned to
+    the resolved sha; the prefetch is skipped when the stored entry prior
+    already holds a reusable score of every metric. Also returns the stats
+    counters of the fetch.
+    """
+    start = time.time()
+    metadata = ModelMetadata(model_url)
+    with counting(Counter()) as counts:
+        if resolve_revisions:
+            metadata.resolve_revisions(code_url, dataset_url)
+        if not (metrics and all(reusable(prior, metric, metadata.revisions) for metric in metrics)):
+            metadata.prefetch()
+    return metadata, start, time.time(), counts
+
+
+def run_metric(metric: Metric) -> Tuple[Metric, float, float]:
+    """Worker task: run one metric, with wall-clock span."""
+    start = time.time()
+    metric.run()
+    return metric, start, time.time()
+
+
+async def run_metric_async(metric: Metric, session: aiohttp.ClientSession) -> Tuple[Metric, float, float]:
+    """Async engine task: run one metric on the shared session, with wall-clock span."""
+    start = time.time()
+    await metric.run_async(session)
+    return metric, start, time.time()
+
+
+def score_llm_batch(prompts: Dict[str, ScoringPrompt]) -> Tuple[Dict[str, Optional[float]], float, float, Counter]:
+    """Worker task: score a batch of GenAI prompts, with wall-clock span and counters."""
+    start = time.time()
+    with counting(Counter()) as counts:
+        scores = score_prompts(prompts)
+    return scores, start, time.time(), counts
+
+
+async def score_llm_batch_async(
+    prompts: Dict[str, ScoringPrompt], session: aiohttp.ClientSession
+) -> Tuple[Dict[str, Optional[float]], float, float, Counter]:
+    """Async engine task: score a batch of GenAI prompts on the shared session."""
+    start = time.time()
+    with counting(Counter()) as counts:
+        scores = await score_prompts_async(prompts, session)
+    return scores, start, time.time(), counts
+
+
+@dataclass
+class _Job:
+    """Book-keeping for one URL line while its tasks are in flight."""
+    index: int
+    model_url: ModelURL
+    metrics: List[Metric]
+    remaining: int = 0
+    metadata: Optional[ModelMetadata] = None
+    start: Optional[float] = None
+    end: Optional[float] = None
+    submitted: float = 0.0
+    deadline: Optional[float] = None
+    # Metric slots whose result (or reused score) is in
+    done: Set[int] = field(default_factory=set)
+    awaiting_metadata: bool = True
+    prefetch: Optional[Tuple[float, float]] = None
+    expired: bool = False
+
+    def record_span(self, start: float, end: float) -> None:
+        self.start = start if self.start is None else min(self.start, start)
+        self.end = end if self.end is None else max(self.end, end)
+
+    def net_latency(self) -> int:
+        if self.start is None or self.end is None:
+            return 0
+        return int((self.end - self.start) * 1000)
+
+
+@dataclass
+class _LLMBatch:
+    """GenAI prompts scored by one request, with the deadline of its metrics."""
+    items: Dict[str, Tuple[_Job, int, ScoringPrompt]]
+    submitted: float
+    deadline: Optional[float] = None
+    future: Optional[Future] = None
+    expired: bool = False
+
+
+class BatchScheduler:
+    """
+    Runs all metrics of a batch of URL lines on a shared executor.
+
+    Usage:
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            for index, record in BatchScheduler(pool).run(lines):
+                ...
+
+    llm_batch: number of models whose GenAI prompts share one request
+    (0 = one request per metric, 1 = one request per model).
+    max_inflight: number of lines read ahead of their written records.
+    backlog: number of yielded records the consumer has not written yet
+    (e.g. NDJSONWriter.backlog); they count against max_inflight.
+    metric_timeout / model_timeout: deadline in seconds per metric / per
+    line (None = no deadline).
+    trace: writer the spans of every finished line are exported to.
+    stats: aggregate of every finished line and task counter.
+    """
+
+    def __init__(
+        self,
+        executor: Executor,
+        weights: Optional[Dict[str, float]] = None,
+        metric_factory: Callable[..., List[Metric]] = build_metrics,
+        state: Optional[ScoreState] = None,
+        llm_batch: int = 1,
+        max_inflight: int = 256,
+        metric_timeout: Optional[float] = None,
+        model_timeout: Optional[float] = None,
+        trace: Optional[TraceWriter] = None,
+        stats: Optional[RunStats] = None,
+        backlog: Optional[Callable[[], int]] = None,
+    ):
+        self.executor = executor
+        self.weights = weights if weights is not None else WEIGHTS
+        self.metric_factory = metric_factory
+        self.state = state
+        self.llm_batch = llm_batch
+        self.max_inflight = max(1, max_inflight)
+        self.metric_timeout = metric_timeout
+        self.model_timeout = model_timeout
+        self.trace = trace
+        self.stats = stats
+        self.backlog = backlog
+        self._inflight = 0
+        # Lines in flight that are still waiting on results, by index
+        self._jobs: Dict[int, _Job] = {}
+        # Each in-flight future maps to the handler that consumes its result
+        self._pending: Dict[Future, Callable[[Future], None]] = {}
+        self._finished: List[_Job] = []
+        self._awaiting_metadata = 0
+        # Queued GenAI prompts: item id -> (job, metric slot, prompt)
+        self._llm_items: Dict[str, Tuple[_Job, int, ScoringPrompt]] = {}
+        self._llm_jobs = 0
+        # Batched GenAI requests in flight
+        self._llm_batches: List[_LLMBatch] = []
+        # Shared data by shared_key(); keys in flight -> (job, slot) waiting
+        # on them; (line index, slot) of the metric computing each key
+        self._shared: Dict[Hashable, Dict[str, Any]] = {}
+        self._sharing: Dict[Hashable, List[Tuple[_Job, int]]] = {}
+        self._leading: Dict[Tuple[int, int], Hashable] = {}
+
+    def run(self, lines: Iterable[List[Optional[URL]]]) -> Iterator[Tuple[int, Optional[str]]]:
+        """
+        Schedule every line and yield (line index, NDJSON record) pairs in
+        completion order. Lines without a model URL yield a None record.
+        """
+        rows = enumerate(lines)
+        exhausted = False
+        while True:
+            # Top up the window; the input is only read as records are written
+            while not exhausted and self._inflight + self._backlog() < self.max_inflight:
+                row = next(rows, None)
+                if row is None:
+                    exhausted = True
+                elif not self._submit_line(*row):
+                    if self.stats is not None:
+                        self.stats.skipped += 1
+                    yield row[0], None
+
+            # No more models can join a partial batch once all metadata is in
+            # (input exhausted or window full)
+            if self._llm_items and not self._awaiting_metadata:
+                self._flush_llm()
+            # Anything still pending once every line is out belongs to
+            # lines that hit their deadline
+            if not self._pending or (exhausted and not self._inflight):
+                break
+
+            done, _ = wait(self._pending, timeout=self._next_deadline(), return_when=FIRST_COMPLETED)
+            for fut in done:
+                self._pending.pop(fut)(fut)
+            self._expire_overdue()
+
+            while self._finished:
+                job = self._finished.pop()
+                self._inflight -= 1
+                yield job.index, self._finish(job)
+
+        # Abandon work of expired lines that has not started yet
+        for fut in self._pending:
+            fut.cancel()
+        self._pending.clear()
+
+    def _backlog(self) -> int:
+        return self.backlog() if self.backlog is not None else 0
+
+    def _submit(self, handler: Callable[[Future], None], fn: Callable, *args) -> Future:
+        return self._track(handler, self.executor.submit, fn, *args)
+
+    def _submit_coroutine(self, handler: Callable[[Future], None], fn: Callable, sync_fn: Callable, *args) -> Future:
+        # Executors with a coroutine path (AsyncExecutor) use the async variant
+        submit_coroutine = getattr(self.executor, "submit_coroutine", None)
+        if submit_coroutine is None:
+            return self._submit(handler, sync_fn, *args)
+        return self._track(handler, submit_coroutine, fn, *args)
+
+    def _track(self, handler: Callable[[Future], None], submit: Callable[..., Future], *args) -> Future:
+        try:
+            fut = submit(*args)
+        except Exception as exc:
+            # e.g. BrokenProcessPool: the handler sees it as a failed task
+            fut = Future()
+            fut.set_exception(exc)
+        self._pending[fut] = handler
+        return fut
+
+    def _submit_line(self, index: int, line: List[Optional[URL]]) -> bool:
+        code_url, dataset_url, model_url = line
+        if not model_url:
+            print(f"Skipping line (no model url): {line}", file=sys.stderr)
+            return False
+
+        job = _Job(index, model_url, self.metric_factory(code_url, dataset_url, model_url))
+        for metric in job.metrics:
+            metric.timeout = self.metric_timeout
+        job.submitted = time.time()
+        if self.model_timeout is not None:
+            job.deadline = job.submitted + self.model_timeout
+        self._jobs[index] = job
+        self._inflight += 1
+        self._awaiting_metadata += 1
+        if self.state is None:
+            self._submit(lambda fut: self._on_metadata(job, fut), fetch_metadata, model_url, code_url, dataset_url)
+        else:
+            self._submit(lambda fut: self._on_metadata(job, fut), fetch_metadata, model_url, code_url, dataset_url,
+                         True, self.state.entries.get(model_url.raw), job.metrics)
+        return True
+
+    def _on_metadata(self, job: _Job, fut: Future) -> None:
+        if job.expired:
+            return
+        job.awaiting_metadata = False
+        self._awaiting_metadata -= 1
+        try:
+            metadata, start, end, counts = fut.result()
+            job.record_span(start, end)
+            job.prefetch = (start, end)
+            if self.stats is not None:
+                self.stats.add_counts(counts)
+        except Exception:
+            # Let each metric fetch (and fail) on its own
+            metadata = ModelMetadata(job.model_url)
+
+        job.metadata = metadata
+        queued_prompts = False
+        for slot, metric in enumerate(job.metrics):
+            metric.set_metadata(metadata)
+            if self.state and self.state.restore(job.model_url.raw, metric, metadata.revisions):
+                job.done.add(slot)
+                continue
+            job.remaining += 1
+            if not self._await_shared(job, slot):
+                queued_prompts |= self._start_metric(job, slot)
+
+        self._queued_llm(queued_prompts)
+        if not job.remaining:
+            # Everything reused from the previous run
+            self._finish_job(job)
+
+    def _await_shared(self, job: _Job, slot: int) -> bool:
+        """
+        Inject known shared data, or park the metric behind the one already
+        computing its key (True). The first metric with a key leads.
+        """
+        metric = job.metrics[slot]
+        key = metric.shared_key()
+        if key is None:
+            return False
+        if key in self._shared:
+            metric.shared = self._shared[key]
+            return False
+        if key in self._sharing:
+            self._sharing[key].append((job, slot))
+            return True
+        self._sharing[key] = []
+        self._leading[(job.index, slot)] = key
+        return False
+
+    def _share(self, job: _Job, slot: int, metric: Optional[Metric]) -> None:
+        """A leading metric finished (None = abandoned): start the ones waiting on its key."""
+        key = self._leading.pop((job.index, slot), None)
+        if key is None:
+            return
+        if metric is not None and not (metric.failed or metric.timed_out):
+            self._shared[key] = metric.shared_data()
+
+        queued_prompts = False
+        for waiting, waiting_slot in self._sharing.pop(key):
+            if waiting.expired:
+                continue
+            waiting.metrics[waiting_slot].shared = self._shared.get(key)
+            queued_prompts |= self._start_metric(waiting, waiting_slot)
+        self._queued_llm(queued_prompts)
+
+    def _start_metric(self, job: _Job, slot: int) -> bool:
+        """Submit a metric, or queue its GenAI prompt for a batch (True)."""
+        metric = job.metrics[slot]
+        prompt = None
+        if self.llm_batch and isinstance(metric, LLMMetric) and metric.shared is None:
+            try:
+                prompt = metric.prompt()
+            except Exception:
+                # e.g. README unavailable: the metric runs (and fails) on its own
+                prompt = None
+        if prompt:
+            self._llm_items[f"{job.index}.{metric.name}"] = (job, slot, prompt)
+            return True
+
+        self._submit_coroutine(lambda fut: self._on_metric(job, slot, fut),
+                               run_metric_async, run_metric, metric)
+        return False
+
+    def _queued_llm(self, queued_prompts: bool) -> None:
+        # One more model has prompts queued; flush once llm_batch models do
+        self._llm_jobs += queued_prompts
+        if self._llm_items and self._llm_jobs >= self.llm_batch:
+            self._flush_llm()
+
+    def _flush_llm(self) -> None:
+        items, self._llm_items, self._llm_jobs = self._llm_items, {}, 0
+        batch = _LLMBatch(items, time.time())
+        if self.metric_timeout is not None:
+            batch.deadline = batch.submitted + self.metric_timeout
+        self._llm_batches.append(batch)
+        prompts = {key: prompt for key, (_, _, prompt) in items.items()}
+        batch.future = self._submit_coroutine(lambda fut: self._on_llm_batch(batch, fut),
+                                              score_llm_batch_async, score_llm_batch, prompts)
+
+    def _on_llm_batch(self, batch: _LLMBatch, fut: Future) -> None:
+        if batch.expired:
+            # Its metrics were timed out already; the late scores are ignored
+            return
+        self._llm_batches.remove(batch)
+        try:
+            scores, start, end, counts = fut.result()
+        except Exception:
+            scores, start, end, counts = {}, time.time(), time.time(), Counter()
+        if self.stats is not None:
+            self.stats.add_counts(counts)
+
+        for key, (job, slot, _) in batch.items.items():
+            if job.expired:
+                self._share(job, slot, None)
+                continue
+            metric = job.metrics[slot]
+            score = scores.get(key)
+            if score is None:
+                metric.set_fallback_score()
+            else:
+                metric.set_data({"score": score})
+            metric.run()
+            metric.latency = int((end - start) * 1000)
+            self._share(job, slot, metric)
+            self._complete(job, slot, start, end)
+
+    def _on_metric(self, job: _Job, slot: int, fut: Future) -> None:
+        try:
+            metric, start, end = fut.result()
+        except Exception:
+            # The task died with its worker: fail this metric only
+            metric = job.metrics[slot]
+            metric.set_fallback_score()
+            start = end = time.time()
+            metric.latency = 0
+        # Shared data is valid even if this metric's own line ran out of time
+        self._share(job, slot, metric)
+        if job.expired:
+            return
+        job.metrics[slot] = metric
+        self._complete(job, slot, start, end)
+
+    def _complete(self, job: _Job, slot: int, start: float, end: float) -> None:
+        job.record_span(start, end)
+        job.done.add(slot)
+        job.remaining -= 1
+        if not job.remaining:
+            self._finish_job(job)
+
+    def _finish_job(self, job: _Job) -> None:
+        self._jobs.pop(job.index, None)
+        self._finished.append(job)
+
+    def _next_deadline(self) -> Optional[float]:
+        """Seconds until the earliest line deadline (None = wait for a result)."""
+        deadlines = [job.deadline for job in self._jobs.values() if job.deadline is not None]
+        deadlines += [batch.deadline for batch in self._llm_batches if batch.deadline is not None]
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.time())
+
+    def _expire_overdue(self) -> None:
+        now = time.time()
+        for job in [job for job in self._jobs.values() if job.deadline is not None and job.deadline <= now]:
+            self._expire(job, now)
+        for batch in [batch for batch in self._llm_batches if batch.deadline is not None and batch.deadline <= now]:
+            self._expire_llm_batch(batch, now)
+
+    def _expire(self, job: _Job, now: float) -> None:
+        """Emit an overdue line with what finished; the rest time out."""
+        job.expired = True
+        if job.awaiting_metadata:
+            self._awaiting_metadata -= 1
+        for key in [key for key, (queued, _, _) in self._llm_items.items() if queued is job]:
+            _, slot, _ = self._llm_items.pop(key)
+            self._share(job, slot, None)
+
+        for slot, metric in enumerate(job.metrics):
+            if slot not in job.done:
+                # Its task may still be running on this very object (async
+                # engine, thread pools): time out a detached copy instead
+                metric = job.metrics[slot] = copy.copy(metric)
+                metric.spans, metric.counts = list(metric.spans), Counter(metric.counts)
+                metric.set_timeout_score()
+                metric.latency = int((now - job.submitted) * 1000)
+        job.record_span(job.submitted, now)
+        self._finish_job(job)
+
+    def _expire_llm_batch(self, batch: _LLMBatch, now: float) -> None:
+        """Time out the metrics of a GenAI request that overran metric_timeout."""
+        batch.expired = True
+        self._llm_batches.remove(batch)
+        if batch.future is not None:
+            batch.future.cancel()
+        for job, slot, _ in batch.items.values():
+            if job.expired:
+                self._share(job, slot, None)
+                continue
+            metric = job.metrics[slot]
+            metric.set_timeout_score()
+            metric.latency = int((now - batch.submitted) * 1000)
+            self._share(job, slot, metric)
+            self._complete(job, slot, batch.submitted, now)
+
+    def _finish(self, job: _Job) -> str:
+        if self.state is not None and job.metadata is not None:
+            self.state.update(job.model_url.raw, job.metrics, job.metadata.revisions)
+        if self.stats is not None:
+            self.stats.add_model(job.metrics)
+        if self.trace is not None:
+            groups = [({"metric": metric.name}, metric.spans) for metric in job.metrics]
+            if job.prefetch is not None:
+                groups.append(({}, [new_span("prefetch", *job.prefetch)]))
+            self.trace.write_model(job.model_url.raw, job.start, job.end, groups)
+        return build_output(job.model_url, job.metrics, self.weights, job.net_latency())
@@ -0,0 +1,169 @@
+"""
+sessions.py
+-------------
+Process-wide registry of pooled HTTP clients.
+
+Summary
+- One requests.Session per process with a keep-alive connection pool and
+  urllib3 Retry/backoff, used for GenAI calls and, through
+  huggingface_hub.configure_http_backend, for every Hub call (HfApi,
+  ModelCard.load, hf_hub_download).
+- One HfApi and one Github client per process, created on first use. The
+  Github client gets the same Retry (not GithubRetry) and no request
+  spacing of its own: rate limits are throttled and retried per upstream
+  by src/ratelimit.py alone.
+- aiohttp sessions for the async engine are built here too so they share
+  the same per-host pool limit.
+- Clients are rebuilt after a fork (pid check) so pool workers never share
+  sockets with the parent.
+- Hub progress bars are disabled and the huggingface_hub logger only
+  reports errors, so downloads from worker threads stay off stdout/stderr
+  without touching the process streams.
+- GITHUB_API_URL points the GitHub client at another server (e.g. the
+  local stub); the Hub honours HF_ENDPOINT itself.
+
+Usage:
+    configure_sessions(pool_size=32, retries=3)   # once per process
+    get_http_session().post(url, json=body)
+    get_hf_api().model_info(repo)
+"""
+
+import os
+import threading
+from typing import Optional
+
+import aiohttp
+import requests  # type: ignore[import-untyped]
+from github import Auth, Github
+from huggingface_hub import HfApi, configure_http_backend
+from huggingface_hub.utils import disable_progress_bars
+from huggingface_hub.utils import logging as hf_logging
+from requests.adapters import HTTPAdapter  # type: ignore[import-untyped]
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 32
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+# Transient upstream statuses worth retrying; 429 is retried per upstream
+# by src/ratelimit.py, which also slows the other requests down
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class TransientRetry(Retry):
+    """
+    urllib3 Retry for transient errors only. Plain Retry also retries a 429
+    that carries Retry-After, inside the adapter where src/ratelimit.py
+    never sees it; here only a 503 honours Retry-After.
+    """
+
+    RETRY_AFTER_STATUS_CODES = frozenset({503})
+
+
+class SessionRegistry:
+    """Lazily created, per-process shared clients."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF):
+        self.pool_size = max(1, pool_size)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._http: Optional[requests.Session] = None
+        self._hf_api: Optional[HfApi] = None
+        self._github: Optional[Github] = None
+
+    def _check_pid(self) -> None:
+        if self._pid != os.getpid():
+            self._reset()
+
+    def new_retry(self) -> Retry:
+        """Retry/backoff on transient errors for idempotent and POST calls; never on rate limits."""
+        return TransientRetry(
+            total=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=None,
+            raise_on_status=False,
+        )
+
+    def new_http_session(self) -> requests.Session:
+        """A fresh pooled session with retry/backoff on idempotent and POST calls."""
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                              max_retries=self.new_retry())
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def http_session(self) -> requests.Session:
+        with self._lock:
+            self._check_pid()
+            if self._http is None:
+                self._http = self.new_http_session()
+            return self._http
+
+    def hf_api(self) -> HfApi:
+        with self._lock:
+            self._check_pid()
+            if self._hf_api is None:
+                self._hf_api = HfApi()
+            return self._hf_api
+
+    def github(self) -> Github:
+        with self._lock:
+            self._check_pid()
+            if self._github is None:
+                token = os.getenv("GITHUB_TOKEN")
+                self._github = Github(
+                    auth=Auth.Token(token) if token else None,
+                    base_url=GITHUB_API_URL,
+                    pool_size=self.pool_size,
+                    retry=self.new_retry(),
+                    seconds_between_requests=None,
+                    seconds_between_writes=None,
+                )
+            return self._github
+
+    def aiohttp_session(self, limit: int) -> aiohttp.ClientSession:
+        """New aiohttp session (call on the loop that will use it)."""
+        connector = aiohttp.TCPConnector(limit=limit, limit_per_host=self.pool_size)
+        return aiohttp.ClientSession(connector=connector)
+
+
+_registry = SessionRegistry()
+
+
+def configure_sessions(pool_size: int = DEFAULT_POOL_SIZE, retries: int = DEFAULT_RETRIES,
+                       backoff: float = DEFAULT_BACKOFF) -> SessionRegistry:
+    """Replace the process-wide registry and route Hub traffic through it."""
+    global _registry
+    _registry = SessionRegistry(pool_size, retries, backoff)
+    # huggingface_hub keeps one session per thread, built by this factory
+    configure_http_backend(backend_factory=_registry.new_http_session)
+    # Keep Hub downloads quiet: no tqdm bars, only errors from its logger
+    disable_progress_bars()
+    hf_logging.set_verbosity_error()
+    return _registry
+
+
+def get_http_session() -> requests.Session:
+    return _registry.http_session()
+
+
+def get_hf_api() -> HfApi:
+    return _registry.hf_api()
+
+
+def get_github() -> Github:
+    return _registry.github()
+
+
+def create_aiohttp_session(limit: int) -> aiohttp.ClientSession:
+    return _registry.aiohttp_session(limit)
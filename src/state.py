@@ -0,0 +1,94 @@
+"""
+state.py
+----------
+Revision state for incremental re-scoring (--state PATH).
+
+Summary
+- Records, per model URL, the revisions each metric was computed against
+  (Hub model sha, GitHub HEAD, Hub dataset sha, base model sha) and the
+  metric's own inputs (Metric.state_inputs(): score version, GenAI
+  template version and model) plus its score and latency.
+- On the next run the scheduler resolves the current revisions with one
+  lightweight lookup each and reuses every metric whose inputs are unchanged.
+  When that covers every metric of a line, nothing else is fetched for it.
+- Stored as a single JSON file, rewritten atomically at the end of a batch.
+
+File layout:
+    {
+      "<model url>": {
+        "revisions": {"model": "owner/name@sha", "code": "...", "dataset": "",
+                      "base_model": ""},
+        "metrics": {
+          "<metric name>": {"inputs": {"model": ..., "version": 1, ...},
+                            "score": ..., "latency": ...}
+        }
+      }
+    }
+
+Revision ids are "name@sha", "" for an empty column, or None when unknown;
+metrics depending on an unknown revision are always recomputed.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from src.metrics.metric import Metric
+
+
+def metric_inputs(metric: Metric, revisions: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """The revision ids and metric inputs (version, template) a score depends on."""
+    return dict(metric.state_inputs(), **{dep: revisions.get(dep) for dep in metric.depends_on})
+
+
+def reusable(entry: Optional[Dict[str, Any]], metric: Metric, revisions: Dict[str, Optional[str]]) -> bool:
+    """Whether a stored model entry holds a score of metric computed from the same inputs."""
+    if any(revisions.get(dep) is None for dep in metric.depends_on):
+        return False
+    prior = (entry or {}).get("metrics", {}).get(metric.name)
+    return bool(prior) and prior.get("inputs") == metric_inputs(metric, revisions)
+
+
+class ScoreState:
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def restore(self, key: str, metric: Metric, revisions: Dict[str, Optional[str]]) -> bool:
+        """
+        Copy a previous score into `metric` if everything it depends on is
+        unchanged. Returns True when the metric was restored.
+        """
+        entry = self.entries.get(key)
+        if not reusable(entry, metric, revisions):
+            return False
+
+        prior = entry["metrics"][metric.name]
+        metric.score = prior["score"]
+        metric.latency = prior["latency"]
+        metric.data = {}
+        return True
+
+    def update(self, key: str, metrics: list, revisions: Dict[str, Optional[str]]) -> None:
+        """Record the revisions and scores of a finished record (failures are not kept)."""
+        self.entries[key] = {
+            "revisions": revisions,
+            "metrics": {
+                m.name: {
+                    "inputs": metric_inputs(m, revisions),
+                    "score": m.score,
+                    "latency": m.latency,
+                }
+                for m in metrics
+                if not m.failed
+            },
+        }
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
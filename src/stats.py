@@ -0,0 +1,202 @@
+"""
+stats.py
+----------
+Aggregated statistics of one batch run (--stats).
+
+Summary
+- Per-metric latency histograms (fixed millisecond buckets) with
+  p50/p95/p99, plus how often each metric fell back to 0 (Metric.failed)
+  or hit its deadline (Metric.timed_out).
+- Response cache hits / misses per source ("hub", "github", "llm", ...).
+- HTTP calls (and error responses, and rate-limited retries) per
+  upstream: "hub", "github" and "genai" by endpoint prefix, anything else
+  by host name.
+- Wall-clock vs CPU time of the whole run, pool workers included.
+
+Counters are bumped with count() wherever the work happens (often a pool
+worker) into the Counter of the enclosing counting() block. Metric.run,
+the metadata prefetch and GenAI batches each carry their Counter back to
+the scheduler, which merges them into RunStats.
+
+Usage:
+    configure_stats(True, upstreams)            # once per process
+    stats = RunStats()
+    ... BatchScheduler(executor, stats=stats) ...
+    stats.write("-")                            # JSON report to stderr
+"""
+
+import json
+import math
+import os
+import resource
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional
+
+import requests  # type: ignore[import-untyped]
+
+from src.transport import Send, add_hook, match_upstream, remove_hook
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# Counter kind -> field of the per-upstream "http" report
+HTTP_COUNTERS = {"http": "calls", "http_errors": "errors", "http_retries": "retries"}
+
+_enabled = False
+_upstreams: Dict[str, str] = {}
+_current: ContextVar[Optional[Counter]] = ContextVar("stats_current", default=None)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in [0, 100]) of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def count(*key: Hashable, n: int = 1) -> None:
+    """Add n to key in the enclosing counting() block, if any."""
+    counter = _current.get()
+    if counter is not None:
+        counter[key] += n
+
+
+@contextmanager
+def counting(counter: Counter) -> Iterator[Counter]:
+    """Collect count() calls made inside the block into counter."""
+    if not _enabled:
+        yield counter
+        return
+
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+def upstream(url: str) -> str:
+    """Name of the configured upstream url belongs to (longest prefix), else its host."""
+    return match_upstream(url, _upstreams)
+
+
+def count_http(url: str, status: int) -> None:
+    name = upstream(url)
+    count("http", name)
+    if status >= 400:
+        count("http_errors", name)
+
+
+def _http_hook(request: requests.PreparedRequest, send: Send) -> requests.Response:
+    response = send(request)
+    count_http(request.url or "", response.status_code)
+    return response
+
+
+def configure_stats(enable: bool, upstreams: Optional[Mapping[str, str]] = None) -> None:
+    """Turn counting (and the per-request HTTP counter) on or off."""
+    global _enabled, _upstreams
+    _enabled = enable
+    _upstreams = {name: prefix.rstrip("/") for name, prefix in (upstreams or {}).items()}
+    remove_hook(_http_hook)
+    if enable:
+        add_hook(_http_hook)
+
+
+def _histogram(latencies: List[int]) -> Dict[str, int]:
+    buckets = {f"<={bound}": 0 for bound in LATENCY_BUCKETS_MS}
+    buckets[f">{LATENCY_BUCKETS_MS[-1]}"] = 0
+    for latency in latencies:
+        bound = next((b for b in LATENCY_BUCKETS_MS if latency <= b), None)
+        buckets[f"<={bound}" if bound is not None else f">{LATENCY_BUCKETS_MS[-1]}"] += 1
+    return buckets
+
+
+class RunStats:
+    """Accumulates metric results and counters over one run."""
+
+    def __init__(self) -> None:
+        self.models = 0
+        self.skipped = 0
+        self.latencies: Dict[str, List[int]] = {}
+        self.failed: Counter = Counter()
+        self.timed_out: Counter = Counter()
+        self.counters: Counter = Counter()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = self._cpu()
+
+    @staticmethod
+    def _cpu() -> float:
+        # Children covers the pool workers once they are reaped
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+    def add_counts(self, counts: Optional[Counter]) -> None:
+        if counts:
+            self.counters.update(counts)
+
+    def add_model(self, metrics: Iterable[Any]) -> None:
+        """Record the finished metrics of one model."""
+        self.models += 1
+        for metric in metrics:
+            if metric.latency is not None:
+                self.latencies.setdefault(metric.name, []).append(metric.latency)
+            self.failed[metric.name] += metric.failed
+            self.timed_out[metric.name] += metric.timed_out
+            self.add_counts(getattr(metric, "counts", None))
+
+    def report(self) -> Dict[str, Any]:
+        wall = time.perf_counter() - self._wall_start
+        cpu = self._cpu() - self._cpu_start
+
+        metrics = {}
+        for name, latencies in sorted(self.latencies.items()):
+            metrics[name] = {
+                "count": len(latencies),
+                "mean_ms": round(sum(latencies) / len(latencies), 1),
+                **{f"p{q}_ms": percentile(latencies, q) for q in (50, 95, 99)},
+                "max_ms": max(latencies),
+                "failed": self.failed[name],
+                "timed_out": self.timed_out[name],
+                "histogram_ms": _histogram(latencies),
+            }
+
+        cache: Dict[str, Dict[str, Any]] = {}
+        http: Dict[str, Dict[str, int]] = {}
+        for key, value in sorted(self.counters.items(), key=lambda item: str(item[0])):
+            if key[0] == "cache":
+                _, source, outcome = key
+                cache.setdefault(source, {"hits": 0, "misses": 0})["hits" if outcome == "hit" else "misses"] += value
+            elif key[0] in HTTP_COUNTERS:
+                http.setdefault(key[1], {kind: 0 for kind in HTTP_COUNTERS.values()})[HTTP_COUNTERS[key[0]]] += value
+        for entry in cache.values():
+            lookups = entry["hits"] + entry["misses"]
+            entry["hit_ratio"] = round(entry["hits"] / lookups, 3) if lookups else None
+
+        return {
+            "models": self.models,
+            "skipped_lines": self.skipped,
+            "wall_s": round(wall, 3),
+            "cpu_s": round(cpu, 3),
+            "cpu_per_wall": round(cpu / wall, 2) if wall > 0 else None,
+            "metrics": metrics,
+            "cache": cache,
+            "http": http,
+        }
+
+    def write(self, path: str) -> None:
+        """JSON report to path ("-" = stderr)."""
+        text = json.dumps(self.report(), indent=2)
+        if path == "-":
+            print(text, file=sys.stderr)
+            return
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        os.replace(tmp, path)
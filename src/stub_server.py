@@ -0,0 +1,439 @@
+"""
+stub_server.py
+----------------
+Local stand-in for the Hugging Face Hub, GitHub and GenAI APIs.
+
+Summary
+- Serves the routes the metrics hit: Hub model/dataset info and file
+  downloads (HfApi.model_info, ModelCard.load, hf_hub_download), GitHub
+  user / contributors / HEAD commit, and GenAI chat completions.
+- Responses are synthetic but deterministic per repo id, so repeated
+  benchmark runs see identical payloads.
+- Configurable (StubConfig): injected latency with jitter, random error
+  rate (503), per-upstream rate limits with X-RateLimit-* headers (GitHub
+  answers 403 when exhausted, Hub and GenAI 429 with Retry-After), and
+  payload sizes (README bytes, Python files and lines, extra siblings).
+- Point the clients at it with HF_ENDPOINT, GITHUB_API_URL and GENAI_URL
+  (see StubServer.env()). GitHub lives under /github, like an Enterprise
+  API prefix, so each upstream has its own URL prefix.
+
+Usage:
+    with StubServer(StubConfig(latency_ms=50, error_rate=0.01)) as server:
+        subprocess.run([...], env={**os.environ, **server.env()})
+
+    python -m src.stub_server --port 8000 --rate-limit 5000
+    # prints the export lines for the three env vars
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+LICENSES = ["mit", "apache-2.0", "lgpl-2.1", "cc-by-nc-4.0", "other"]
+
+README_TEMPLATE = """---
+license: {license}
+---
+# {repo}
+
+{repo} reaches state-of-the-art accuracy on GLUE and SQuAD (F1 {score}%).
+It outperforms the baseline and is competitive with larger models.
+
+## Usage
+
+```python
+from transformers import AutoModel
+model = AutoModel.from_pretrained("{repo}")
+```
+"""
+
+PY_TEMPLATE = '''"""Synthetic module {index} of {repo}."""
+
+import os
+
+
+def load(path):
+    with open(path) as f:
+        return f.read()
+
+
+def unused( x ):
+    return x+1
+'''
+
+_ITEM_ID = re.compile(r"^### Item id: (.+)$", re.MULTILINE)
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server; the defaults answer instantly and never fail."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    # Requests allowed per upstream ("hub", "github", "genai") per window; 0 = unlimited
+    rate_limit: int = 0
+    rate_window: float = 60.0
+    readme_bytes: int = 0
+    py_files: Optional[int] = None  # None = 1-3 per repo
+    py_lines: int = 0
+    extra_siblings: int = 0
+    seed: int = 0
+
+
+DEFAULT_CONFIG = StubConfig()
+
+
+def _seed(*parts: str) -> int:
+    return int.from_bytes(hashlib.sha256("/".join(parts).encode()).digest()[:4], "big")
+
+
+def _sha(*parts: str) -> str:
+    return hashlib.sha1("/".join(parts).encode()).hexdigest()
+
+
+def model_files(repo: str, config: StubConfig = DEFAULT_CONFIG) -> Dict[str, str]:
+    """Synthetic repo contents: a README and some Python files."""
+    seed = _seed(repo)
+    readme = README_TEMPLATE.format(repo=repo, license=LICENSES[seed % len(LICENSES)], score=50 + seed % 50)
+    if len(readme) < config.readme_bytes:
+        readme += "\n" + "Filler text without claims.\n" * ((config.readme_bytes - len(readme)) // 27 + 1)
+    files = {"README.md": readme}
+
+    py_files = config.py_files if config.py_files is not None else 1 + seed % 3
+    padding = "".join(f"VALUE_{i} = {i}\n" for i in range(config.py_lines))
+    for index in range(py_files):
+        files[f"module_{index}.py"] = PY_TEMPLATE.format(repo=repo, index=index) + padding
+    return files
+
+
+def model_info(repo: str, config: StubConfig = DEFAULT_CONFIG, blobs: bool = False) -> Dict[str, Any]:
+    """HfApi.model_info payload for repo; blobs adds file sizes (files_metadata=True)."""
+    seed = _seed(repo)
+    params = (seed % 8000 + 1) * 10**6
+    sizes = {name: len(content.encode()) for name, content in model_files(repo, config).items()}
+    sizes.update({f"weights/shard_{i:05d}.safetensors": 5 * 10**9 for i in range(config.extra_siblings)})
+    return {
+        "id": repo,
+        "modelId": repo,
+        "sha": _sha(repo),
+        "likes": seed % 1000,
+        "downloads": seed % 100000,
+        "tags": [],
+        "cardData": {"license": LICENSES[seed % len(LICENSES)]},
+        "safetensors": {"parameters": {"F32": params}, "total": params},
+        "siblings": [{"rfilename": name, "size": size} if blobs else {"rfilename": name}
+                     for name, size in sizes.items()],
+    }
+
+
+def contributor_count(repo: str) -> int:
+    return _seed("contributors", repo) % 60 + 1
+
+
+class RateLimiter:
+    """Fixed-window request counter per upstream."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Tuple[float, int]] = {}
+
+    def hit(self, upstream: str) -> Tuple[int, float]:
+        """Count one request; returns (remaining, reset epoch). remaining < 0 = over."""
+        now = time.time()
+        with self._lock:
+            start, count = self._windows.get(upstream, (now, 0))
+            if now - start >= self.window:
+                start, count = now, 0
+            count += 1
+            self._windows[upstream] = (start, count)
+        return self.limit - count, start + self.window
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: "StubHTTPServer"
+    protocol_version = "HTTP/1.1"
+    extra_headers: Dict[str, str] = {}
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    # -----------------
+    # Plumbing
+    # -----------------
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None,
+              content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in {**self.extra_headers, **(headers or {})}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _json(self, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(data).encode(), headers)
+
+    def _not_found(self) -> None:
+        self._json({"error": "not found"}, 404)
+
+    def _route(self) -> None:
+        url = urlsplit(self.path)
+        path, query = url.path, parse_qs(url.query)
+        for prefix, upstream, handler in self.routes():
+            if path.startswith(prefix):
+                if self._admit(upstream):
+                    handler(path[len(prefix):], query)
+                return
+        self._not_found()
+
+    def routes(self) -> List[Tuple[str, str, Any]]:
+        return [
+            ("/api/models/", "hub", self.hub_model_info),
+            ("/api/datasets/", "hub", self.hub_dataset_info),
+            ("/api/chat/completions", "genai", self.genai_completion),
+            ("/github/user", "github", self.github_user),
+            ("/github/repos/", "github", self.github_repo),
+            ("/", "hub", self.hub_file),
+        ]
+
+    def _admit(self, upstream: str) -> bool:
+        """Apply latency, error injection and rate limiting; False = already answered."""
+        config = self.server.config
+        delay = config.latency_ms + self.server.uniform(0, config.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        self.extra_headers = {}
+        if self.server.limiter is not None:
+            remaining, reset = self.server.limiter.hit(upstream)
+            self.extra_headers = {
+                "X-RateLimit-Limit": str(config.rate_limit),
+                "X-RateLimit-Remaining": str(max(0, remaining)),
+                "X-RateLimit-Reset": str(int(reset)),
+            }
+            if remaining < 0:
+                if upstream == "github":
+                    self._json({"message": "API rate limit exceeded"}, 403)
+                else:
+                    retry_after = str(max(1, int(reset - time.time())))
+                    self._json({"error": "rate limited"}, 429, {"Retry-After": retry_after})
+                return False
+
+        if self.server.uniform(0, 1) < config.error_rate:
+            self._json({"error": "injected failure"}, 503)
+            return False
+        return True
+
+    def do_GET(self) -> None:
+        self._route()
+
+    def do_HEAD(self) -> None:
+        self._route()
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+        self._route()
+
+    # -----------------
+    # Hugging Face Hub
+    # -----------------
+    def hub_model_info(self, rest: str, query: Dict[str, List[str]]) -> None:
+        repo = rest.split("/revision/")[0]
+        blobs = query.get("blobs", ["false"])[0].lower() == "true"
+        self._json(model_info(repo, self.server.config, blobs))
+
+    def hub_dataset_info(self, rest: str, query: Dict[str, List[str]]) -> None:
+        repo = rest.split("/revision/")[0]
+        self._json({"id": repo, "sha": _sha("dataset", repo)})
+
+    def hub_file(self, rest: str, query: Dict[str, List[str]]) -> None:
+        # <owner>/<name>/resolve/<revision>/<filename>
+        match = re.match(r"^(?:datasets/)?(.+?)/resolve/([^/]+)/(.+)$", rest)
+        if not match:
+            self._not_found()
+            return
+        repo, _, filename = match.groups()
+        content = model_files(repo, self.server.config).get(filename)
+        if content is None:
+            self._not_found()
+            return
+        body = content.encode()
+        self._send(200, body, {
+            "X-Repo-Commit": _sha(repo),
+            "ETag": f'"{hashlib.sha1(body).hexdigest()}"',
+        }, content_type="text/plain; charset=utf-8")
+
+    # -----------------
+    # GitHub
+    # -----------------
+    def github_user(self, rest: str, query: Dict[str, List[str]]) -> None:
+        self._json({"login": "bench", "id": 1, "type": "User"})
+
+    def github_repo(self, rest: str, query: Dict[str, List[str]]) -> None:
+        parts = rest.split("/")
+        if len(parts) < 3:
+            self._not_found()
+            return
+        repo, resource = "/".join(parts[:2]), parts[2]
+        if resource == "contributors":
+            self.github_contributors(repo, query)
+        elif resource == "commits":
+            self._json({"sha": _sha("code", repo)})
+        else:
+            self._not_found()
+
+    def github_contributors(self, repo: str, query: Dict[str, List[str]]) -> None:
+        total = contributor_count(repo)
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        last = max(1, -(-total // per_page))
+        start = (page - 1) * per_page
+        items = [{"login": f"user{i}", "id": i, "contributions": total - i}
+                 for i in range(start, min(total, start + per_page))]
+
+        base = f"http://{self.headers.get('Host')}/github/repos/{repo}/contributors"
+        links = []
+        if page < last:
+            links.append(f'<{base}?per_page={per_page}&page={page + 1}>; rel="next"')
+            links.append(f'<{base}?per_page={per_page}&page={last}>; rel="last"')
+        self._json(items, headers={"Link": ", ".join(links)} if links else None)
+
+    # -----------------
+    # GenAI
+    # -----------------
+    def genai_completion(self, rest: str, query: Dict[str, List[str]]) -> None:
+        try:
+            prompt = json.loads(self.body)["messages"][0]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            self._json({"error": "bad request"}, 400)
+            return
+
+        ids = _ITEM_ID.findall(prompt)
+        if ids:
+            content = json.dumps({item: (_seed(item) % 11) / 10 for item in ids})
+        else:
+            content = str((_seed(prompt) % 11) / 10)
+        self._json({"choices": [{"message": {"role": "assistant", "content": content}}]})
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: StubConfig):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.limiter = RateLimiter(config.rate_limit, config.rate_window) if config.rate_limit else None
+        self._rng = random.Random(config.seed)
+        self._rng_lock = threading.Lock()
+
+    def handle_error(self, request: Any, client_address: Tuple[str, int]) -> None:
+        # Clients that give up on a slow response (timeouts) hang up mid-write; not a server error
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def uniform(self, low: float, high: float) -> float:
+        if high <= low:
+            return low
+        with self._rng_lock:
+            return self._rng.uniform(low, high)
+
+
+class StubServer:
+    """Stub server on a background thread; port 0 picks a free port."""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.httpd = StubHTTPServer((host, port), self.config)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point every client at this server."""
+        return {
+            "HF_ENDPOINT": self.url,
+            "GITHUB_API_URL": f"{self.url}/github",
+            "GENAI_URL": f"{self.url}/api/chat/completions",
+        }
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def add_arguments(p: argparse.ArgumentParser) -> None:
+    """Stub behaviour flags, shared by this module's CLI and ./run bench."""
+    p.add_argument('--latency-ms', type=float, default=0.0, help='delay added to every response')
+    p.add_argument('--jitter-ms', type=float, default=0.0, help='extra uniform random delay')
+    p.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered 503')
+    p.add_argument('--rate-limit', type=int, default=0,
+                   help='requests per upstream per window (0 = unlimited)')
+    p.add_argument('--rate-window', type=float, default=60.0, help='rate-limit window in seconds')
+    p.add_argument('--readme-bytes', type=int, default=0, help='minimum README size')
+    p.add_argument('--py-files', type=int, default=None, help='Python files per model (default 1-3)')
+    p.add_argument('--py-lines', type=int, default=0, help='extra lines per Python file')
+    p.add_argument('--extra-siblings', type=int, default=0, help='extra files listed in model_info')
+
+
+def config_from_args(ns: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        latency_ms=ns.latency_ms,
+        jitter_ms=ns.jitter_ms,
+        error_rate=ns.error_rate,
+        rate_limit=ns.rate_limit,
+        rate_window=ns.rate_window,
+        readme_bytes=ns.readme_bytes,
+        py_files=ns.py_files,
+        py_lines=ns.py_lines,
+        extra_siblings=ns.extra_siblings,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(prog='python -m src.stub_server',
+                                description='Local stand-in for the Hub, GitHub and GenAI APIs')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8000)
+    add_arguments(p)
+    ns = p.parse_args(argv)
+
+    server = StubServer(config_from_args(ns), ns.host, ns.port)
+    for key, value in server.env().items():
+        print(f"export {key}={value}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+tracing.py
+------------
+Phase-level tracing of metric runs.
+
+Summary
+- Spans are timed with time.perf_counter_ns (monotonic) and stamped with a
+  Unix-epoch start derived from it, so spans from different pool workers
+  line up on one timeline.
+- Metric.run opens a "metric" root span with "get_data" and "score"
+  children; code underneath adds finer phases with span(): "fetch"
+  (cached upstream lookups), "http" (every outbound request), "download"
+  (Hub file downloads) and "parse" (README / flake8).
+- Spans are collected on the metric (Metric.spans) and travel back with it
+  from the worker, so no cross-process channel is needed.
+- TraceWriter exports one line per model, as flat JSONL spans or as OTLP
+  JSON (ExportTraceServiceRequest per line, the OpenTelemetry file format).
+- Disabled unless configured (--trace FILE); span() is then a no-op.
+
+Usage:
+    configure_tracing(True)                      # once per process
+    with span("download", file=name):
+        hf_hub_download(...)
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+import requests  # type: ignore[import-untyped]
+
+from src.transport import Send, add_hook, remove_hook
+
+TRACE_FORMATS = ("jsonl", "otlp")
+
+# perf_counter_ns is monotonic but has no epoch; anchor it once per process
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+_enabled = False
+# (span list being filled, id of the innermost open span)
+_current: ContextVar[Optional[Tuple[List["Span"], Optional[str]]]] = ContextVar("trace_current", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int  # Unix epoch nanoseconds
+    duration_ns: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def end_ns(self) -> int:
+        return self.start_ns + self.duration_ns
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def new_span(name: str, start: float, end: float, **attrs: Any) -> Span:
+    """Root span from time.time() bounds, for phases timed elsewhere."""
+    start_ns = int(start * 1e9)
+    return Span(name, _new_id(8), None, start_ns, max(0, int(end * 1e9) - start_ns), attrs)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time the block as a child of the innermost open span. Yields the
+    attribute dict so the block can add results (e.g. status, files).
+    No-op outside collect() or when tracing is off.
+    """
+    state = _current.get()
+    if state is None:
+        yield attrs
+        return
+
+    spans, parent_id = state
+    span_id = _new_id(8)
+    token = _current.set((spans, span_id))
+    start = time.perf_counter_ns()
+    try:
+        yield attrs
+    finally:
+        end = time.perf_counter_ns()
+        _current.reset(token)
+        spans.append(Span(name, span_id, parent_id, start + _EPOCH_OFFSET_NS, end - start, attrs))
+
+
+@contextmanager
+def collect(spans: List[Span], name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Record a root span and everything under it into spans."""
+    if not _enabled:
+        yield attrs
+        return
+
+    token = _current.set((spans, None))
+    try:
+        with span(name, **attrs) as root:
+            yield root
+    finally:
+        _current.reset(token)
+
+
+def _http_hook(request: requests.PreparedRequest, send: Send) -> requests.Response:
+    with span("http", method=request.method, url=request.url) as attrs:
+        response = send(request)
+        attrs["status"] = response.status_code
+        return response
+
+
+def configure_tracing(enable: bool) -> None:
+    """Turn span collection (and the per-request "http" spans) on or off."""
+    global _enabled
+    _enabled = enable
+    remove_hook(_http_hook)
+    if enable:
+        add_hook(_http_hook)
+
+
+# -----------------
+# Export
+# -----------------
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace_id: str, span: Span) -> Dict[str, Any]:
+    otlp = {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)}
+                       for key, value in span.attrs.items() if value is not None],
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    return otlp
+
+
+class TraceWriter:
+    """Writes the spans of each finished model to a trace file."""
+
+    def __init__(self, path: str, fmt: str = "jsonl"):
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format: {fmt}")
+        self.format = fmt
+        self._out: IO[str] = open(path, "w", encoding="utf-8")
+
+    def write_model(self, model: str, start: Optional[float], end: Optional[float],
+                    groups: List[Tuple[Dict[str, Any], List[Span]]]) -> None:
+        """
+        One trace per model: a "model" root span over [start, end] (epoch
+        seconds) and each (attributes, spans) group under it; the
+        attributes (e.g. metric name) are copied onto every span.
+        """
+        trace_id = _new_id(16)
+        root = new_span("model", start or 0, end or 0)
+
+        spans = [root]
+        for attrs, group in groups:
+            for s in group:
+                spans.append(Span(s.name, s.span_id, s.parent_id or root.span_id, s.start_ns,
+                                  s.duration_ns, {**attrs, **s.attrs}))
+
+        if self.format == "otlp":
+            request = {"resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "ece-30861"}}]},
+                "scopeSpans": [{"scope": {"name": "src.tracing"},
+                                "spans": [_otlp_span(trace_id, s) for s in spans]}],
+            }]}
+            self._out.write(json.dumps(request, separators=(",", ":")) + "\n")
+        else:
+            for s in spans:
+                self._out.write(json.dumps({
+                    "trace_id": trace_id, "span_id": s.span_id, "parent_id": s.parent_id,
+                    "name": s.name, "start_ns": s.start_ns, "duration_ns": s.duration_ns,
+                    "model": model, **s.attrs,
+                }, separators=(",", ":")) + "\n")
+        self._out.flush()
+
+    def close(self) -> None:
+        self._out.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
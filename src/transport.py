@@ -0,0 +1,276 @@
+"""
+transport.py
+--------------
+Hook chain around every outbound HTTP request, with record/replay.
+
+Summary
+- Wraps requests' HTTPAdapter.send once per process. Every blocking client
+  goes through it: HfApi / ModelCard / hf_hub_download, PyGithub and the
+  pooled GenAI session.
+- Hooks are middleware: hook(request, send) -> Response; each may inspect,
+  short-circuit or pass the request on with send(request).
+- Recorder (--record DIR) stores every response as one JSON fixture keyed by
+  method, URL and body; Replayer (--replay DIR) serves them from disk and
+  never touches the network.
+- Replay can inject latency (--replay-latency): "recorded", a fixed number
+  of milliseconds, or per-host "host=ms,...,*=ms".
+- The async GenAI path uses request_async(), which honours the same
+  record/replay settings and fixture keys, so a run recorded with one engine
+  replays with the other.
+
+Record with --no-cache so cached responses do not hide requests.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests  # type: ignore[import-untyped]
+from requests.adapters import HTTPAdapter  # type: ignore[import-untyped]
+from requests.structures import CaseInsensitiveDict  # type: ignore[import-untyped]
+
+Send = Callable[[requests.PreparedRequest], requests.Response]
+Hook = Callable[[requests.PreparedRequest, Send], requests.Response]
+
+_original_send = HTTPAdapter.send
+_hooks: List[Hook] = []
+
+
+def _send(adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+    def call(index: int, req: requests.PreparedRequest) -> requests.Response:
+        if index == len(_hooks):
+            return _original_send(adapter, req, **kwargs)
+        return _hooks[index](req, lambda r: call(index + 1, r))
+
+    return call(0, request)
+
+
+def match_upstream(url: str, upstreams: Mapping[str, str]) -> str:
+    """Name of the upstream whose URL prefix url starts with (longest wins), else url's host."""
+    matches = [(len(prefix), name) for name, prefix in upstreams.items() if prefix and url.startswith(prefix)]
+    if matches:
+        return max(matches)[1]
+    return urlsplit(url).hostname or "unknown"
+
+
+def add_hook(hook: Hook) -> None:
+    """Append a hook (outermost first) and make sure the adapter is wrapped."""
+    HTTPAdapter.send = _send
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+# -----------------
+# Fixtures
+# -----------------
+def _body_bytes(body: Any) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, bytes):
+        return body
+    # Streams / generators are not replayable by content
+    return b""
+
+
+class FixtureStore:
+    """One JSON file per distinct (method, url, body) under directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, method: str, url: str, body: bytes) -> str:
+        digest = hashlib.sha256(b"\0".join([method.upper().encode(), url.encode(), body])).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def save(self, method: str, url: str, body: bytes, status: int, reason: str,
+             headers: Mapping[str, str], content: bytes, elapsed: float) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fixture = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "reason": reason,
+            "headers": dict(headers),
+            "content": base64.b64encode(content).decode("ascii"),
+            "elapsed": elapsed,
+        }
+        path = self.path(method, url, body)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(fixture, f)
+        os.replace(tmp, path)
+
+    def load(self, method: str, url: str, body: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path(method, url, body), "r", encoding="utf-8") as f:
+                fixture = json.load(f)
+        except FileNotFoundError:
+            return None
+        fixture["content"] = base64.b64decode(fixture["content"])
+        return fixture
+
+
+@dataclass
+class LatencyProfile:
+    """Delay injected before each replayed response."""
+    recorded: bool = False
+    per_host_ms: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> "LatencyProfile":
+        """"" -> none, "recorded", "120" -> 120ms each, "host=ms,...,*=ms"."""
+        spec = (spec or "").strip()
+        if not spec:
+            return cls()
+        if spec == "recorded":
+            return cls(recorded=True)
+        if "=" not in spec:
+            return cls(per_host_ms={"*": float(spec)})
+
+        per_host: Dict[str, float] = {}
+        for part in spec.split(","):
+            host, _, ms = part.partition("=")
+            per_host[host.strip()] = float(ms)
+        return cls(per_host_ms=per_host)
+
+    def delay(self, url: str, recorded_elapsed: float) -> float:
+        """Seconds to wait before serving a response for url."""
+        if self.recorded:
+            return recorded_elapsed
+        host = urlsplit(url).hostname or ""
+        return self.per_host_ms.get(host, self.per_host_ms.get("*", 0.0)) / 1000
+
+
+def build_response(request: requests.PreparedRequest, fixture: Dict[str, Any]) -> requests.Response:
+    """A requests.Response equivalent to the recorded one, body preloaded."""
+    response = requests.Response()
+    response.status_code = fixture["status"]
+    response.reason = fixture["reason"]
+    response.headers = CaseInsensitiveDict(fixture["headers"])
+    response.url = fixture["url"]
+    response.request = request
+    response._content = fixture["content"]
+    response._content_consumed = True
+    response.raw = None
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+class Recorder:
+    """Hook that passes requests through and saves every response."""
+
+    def __init__(self, store: FixtureStore):
+        self.store = store
+
+    def __call__(self, request: requests.PreparedRequest, send: Send) -> requests.Response:
+        start = time.perf_counter()
+        response = send(request)
+        content = response.content  # reads streamed bodies into memory
+        self.store.save(request.method or "GET", request.url or "", _body_bytes(request.body),
+                        response.status_code, response.reason or "", response.headers,
+                        content, time.perf_counter() - start)
+        return response
+
+
+class Replayer:
+    """Hook that serves recorded responses and never calls send."""
+
+    def __init__(self, store: FixtureStore, latency: Optional[LatencyProfile] = None):
+        self.store = store
+        self.latency = latency or LatencyProfile()
+
+    def lookup(self, method: str, url: str, body: bytes) -> Dict[str, Any]:
+        fixture = self.store.load(method, url, body)
+        if fixture is None:
+            raise requests.ConnectionError(f"No recorded response for {method} {url}")
+        return fixture
+
+    def __call__(self, request: requests.PreparedRequest, send: Send) -> requests.Response:
+        fixture = self.lookup(request.method or "GET", request.url or "", _body_bytes(request.body))
+        time.sleep(self.latency.delay(fixture["url"], fixture["elapsed"]))
+        return build_response(request, fixture)
+
+
+_recorder: Optional[Recorder] = None
+_replayer: Optional[Replayer] = None
+
+
+def configure_transport(record_dir: Optional[str] = None, replay_dir: Optional[str] = None,
+                        latency: Optional[str] = None) -> None:
+    """Set up record or replay for this process (None, None disables both)."""
+    global _recorder, _replayer
+    for hook in (_recorder, _replayer):
+        if hook is not None:
+            remove_hook(hook)
+    _recorder = _replayer = None
+
+    if replay_dir:
+        _replayer = Replayer(FixtureStore(replay_dir), LatencyProfile.parse(latency))
+        add_hook(_replayer)
+    elif record_dir:
+        _recorder = Recorder(FixtureStore(record_dir))
+        add_hook(_recorder)
+
+
+# -----------------
+# Async path
+# -----------------
+@dataclass
+class AsyncResponse:
+    """Fully read aiohttp response (or replayed fixture)."""
+    url: str
+    status: int
+    reason: str
+    headers: Dict[str, str]
+    content: bytes
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise requests.HTTPError(f"{self.status} {self.reason} for url: {self.url}")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+async def request_async(session: aiohttp.ClientSession, method: str, url: str,
+                        headers: Optional[Dict[str, str]] = None, json_body: Any = None,
+                        timeout: Optional[aiohttp.ClientTimeout] = None) -> AsyncResponse:
+    """
+    Send one request on an aiohttp session and read the whole body, going
+    through record/replay like the blocking clients. JSON bodies are
+    serialized like requests does so fixture keys match across engines.
+    """
+    headers = dict(headers or {})
+    body = b""
+    if json_body is not None:
+        body = json.dumps(json_body).encode("utf-8")
+        headers.setdefault("Content-Type", "application/json")
+
+    if _replayer is not None:
+        fixture = _replayer.lookup(method, url, body)
+        await asyncio.sleep(_replayer.latency.delay(fixture["url"], fixture["elapsed"]))
+        return AsyncResponse(fixture["url"], fixture["status"], fixture["reason"],
+                             fixture["headers"], fixture["content"])
+
+    start = time.perf_counter()
+    async with session.request(method, url, headers=headers, data=body or None, timeout=timeout) as resp:
+        response = AsyncResponse(str(resp.url), resp.status, resp.reason or "",
+                                 dict(resp.headers), await resp.read())
+
+    if _recorder is not None:
+        _recorder.store.save(method, url, body, response.status, response.reason,
+                             response.headers, response.content, time.perf_counter() - start)
+    return response
@@ -0,0 +1,106 @@
+"""
+test_async_executor.py
+---------------
+Basic unit tests for AsyncExecutor and the async metric path.
+
+Tests cover:
+- blocking and coroutine tasks both return concurrent futures
+- concurrency cap is respected
+- Metric.run_async default path and fallback score
+- BatchScheduler driven by the async engine
+"""
+
+import asyncio
+import json
+import threading
+
+from src.async_executor import AsyncExecutor
+from src.cli.url import ModelURL
+from src.metrics.metric import Metric
+from src.scheduler import BatchScheduler
+
+
+class DummyMetric(Metric):
+    def __init__(self, name="dummy"):
+        super().__init__(name)
+
+    def get_data(self):
+        return {"thread": threading.current_thread().name}
+
+    def calculate_score(self) -> float:
+        return 0.5
+
+
+class AsyncMetric(DummyMetric):
+    async def get_data_async(self, session):
+        await asyncio.sleep(0)
+        return {"session": session is not None}
+
+
+class FailingMetric(DummyMetric):
+    async def get_data_async(self, session):
+        raise RuntimeError("boom")
+
+
+def test_submit_blocking_and_coroutine():
+    async def coro(value, session):
+        return value, session is not None
+
+    with AsyncExecutor(concurrency=2) as executor:
+        assert executor.submit(lambda x: x * 2, 21).result() == 42
+        assert executor.submit_coroutine(coro, "v").result() == ("v", True)
+
+
+def test_concurrency_cap():
+    state = {"active": 0, "peak": 0}
+
+    async def task(session):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+
+    with AsyncExecutor(concurrency=3) as executor:
+        futures = [executor.submit_coroutine(task) for _ in range(12)]
+        for f in futures:
+            f.result()
+
+    assert state["peak"] == 3
+
+
+def test_run_async_default_uses_thread():
+    metric = DummyMetric()
+    asyncio.run(metric.run_async(None))
+    assert metric.score == 0.5
+    assert metric.data["thread"] != threading.main_thread().name
+
+
+def test_run_async_override_and_fallback():
+    metric = AsyncMetric()
+    asyncio.run(metric.run_async(object()))
+    assert metric.data == {"session": True}
+
+    failing = FailingMetric("size_score")
+    asyncio.run(failing.run_async(None))
+    assert failing.score == {
+        "raspberry_pi": 0.0, "jetson_nano": 0.0, "desktop_pc": 0.0, "aws_server": 0.0,
+    }
+    assert isinstance(failing.latency, int)
+
+
+def test_scheduler_on_async_engine(monkeypatch):
+    class DummyApi:
+        def model_info(self, repo_id, **kwargs):
+            return repo_id
+
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: DummyApi())
+
+    def factory(code_url, dataset_url, model_url):
+        return [AsyncMetric("a"), DummyMetric("b")]
+
+    lines = [[None, None, ModelURL(f"https://huggingface.co/owner/m{i}")] for i in range(4)]
+    with AsyncExecutor(concurrency=8) as executor:
+        results = dict(BatchScheduler(executor, {"a": 0.5, "b": 0.5}, factory).run(lines))
+
+    assert sorted(results) == [0, 1, 2, 3]
+    assert json.loads(results[0])["net_score"] == 0.5
@@ -0,0 +1,54 @@
+"""
+test_bench.py
+---------------
+Basic unit tests for the benchmark harness.
+
+Tests cover:
+- deterministic synthetic manifests with varied column mixes
+- nearest-rank percentiles and per-metric latency summaries
+- throughput comparison against a baseline
+"""
+
+import json
+
+from src.bench import compare, generate_manifest, percentile, summarize_latencies
+from src.cli.cli import parse_url_file
+
+
+def test_generate_manifest(tmp_path):
+    path = tmp_path / "urls.txt"
+    generate_manifest(str(path), 200, seed=1)
+    rows = parse_url_file(str(path))
+
+    assert len(rows) == 200
+    assert any(model is None for _, _, model in rows)
+    assert any(code and dataset and model for code, dataset, model in rows)
+    assert any(code is None and dataset is None and model for code, dataset, model in rows)
+
+    again = tmp_path / "again.txt"
+    generate_manifest(str(again), 200, seed=1)
+    assert again.read_text() == path.read_text()
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) is None
+
+
+def test_summarize_latencies(tmp_path):
+    path = tmp_path / "records.ndjson"
+    path.write_text("\n".join(json.dumps({"name": f"m{i}", "license": 1.0, "license_latency": i})
+                              for i in range(1, 11)) + "\n")
+
+    summary = summarize_latencies(str(path))
+    assert summary == {"license": {"p50": 5, "p95": 10, "p99": 10}}
+
+
+def test_compare():
+    baseline = {"commit": "abc", "runs": [{"lines": 100, "throughput_lines_per_s": 10.0}]}
+    results = {"runs": [{"lines": 100, "throughput_lines_per_s": 12.0},
+                        {"lines": 1, "throughput_lines_per_s": 1.0}]}
+    assert compare(results, baseline) == ["   100 lines: +20.0% throughput vs abc"]
@@ -4,7 +4,8 @@ test_bus_factor.py
 Basic unit tests for BusFactorMetric.
 
 Tests cover:
-- 
+- contributor counting via a single request, full list only on request
+- shared contributor count (same code repo) used without a GitHub call
 """
 
 import pytest
@@ -109,3 +110,60 @@ def test_calculate_score_very_high_ratio():
     )
     metric.data = {"params": int(1e9), "num_contributors": 20}  # 20 contrib/B
     assert pytest.approx(metric.calculate_score(), 0.01) == 1.0
+
+
+class CountingRepo:
+    def __init__(self, total):
+        self.total = total
+        self.walked = False
+
+    def get_contributors(self):
+        repo = self
+
+        class Contributors:
+            totalCount = repo.total
+
+            def __iter__(self):
+                repo.walked = True
+                return iter([type("C", (), {"login": f"user{i}"})() for i in range(repo.total)])
+
+        return Contributors()
+
+
+@pytest.mark.parametrize("list_contributors, walked", [(False, False), (True, True)])
+def test_get_data_counts_contributors(monkeypatch, list_contributors, walked):
+    from types import SimpleNamespace
+
+    repo = CountingRepo(7)
+    gh = SimpleNamespace(get_repo=lambda name, lazy=False: repo,
+                         requester=SimpleNamespace(rate_limiting=(-1, -1), rate_limiting_resettime=0))
+    monkeypatch.setattr("src.git.get_github", lambda: gh)
+    monkeypatch.setattr("src.metadata.get_hf_api",
+                        lambda: SimpleNamespace(model_info=lambda repo_id, **kwargs: SimpleNamespace(safetensors={"total": int(1e9)})))
+
+    metric = BusFactorMetric(
+        CodeURL("https://github.com/fake/fake"),
+        ModelURL("https://huggingface.co/fake/fake-model"),
+        list_contributors=list_contributors,
+    )
+    metric.run()
+    assert metric.data == {"params": int(1e9), "num_contributors": 7}
+    assert repo.walked is walked
+
+
+def test_shared_contributor_count(monkeypatch):
+    from types import SimpleNamespace
+
+    monkeypatch.setattr("src.git.get_github", lambda: 1 / 0)
+    monkeypatch.setattr("src.metadata.get_hf_api",
+                        lambda: SimpleNamespace(model_info=lambda repo_id, **kwargs: SimpleNamespace(safetensors={"total": int(2e9)})))
+
+    code_url = CodeURL("https://github.com/fake/fake")
+    metric = BusFactorMetric(code_url, ModelURL("https://huggingface.co/fake/fake-model"))
+    assert metric.shared_key() == BusFactorMetric(code_url, ModelURL("https://huggingface.co/other/model")).shared_key()
+
+    metric.shared = {"num_contributors": 5}
+    metric.run()
+    assert metric.data == {"params": int(2e9), "num_contributors": 5}
+    assert metric.shared_data() == {"num_contributors": 5}
+    assert BusFactorMetric(None, ModelURL("https://huggingface.co/fake/fake-model")).shared_key() is None
@@ -0,0 +1,169 @@
+"""
+test_cache.py
+---------------
+Basic unit tests for the persistent response cache.
+
+Tests cover:
+- hit / miss and persistence across instances
+- per-source TTL expiry
+- LRU eviction past max_bytes; total size kept by triggers, access times
+  written in batches
+- cached() bypass when disabled, no caching of failures
+- CLI --cache-dir / --no-cache
+"""
+
+import asyncio
+
+import pytest
+
+from src import cache
+from src.cache import ResponseCache, cached, cached_async, configure_cache, make_key
+from src.cli.cli import parse_args
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    yield
+    configure_cache(None)
+
+
+def test_hit_miss_and_persistence(tmp_path):
+    store = ResponseCache(str(tmp_path))
+    key = make_key("model_info", "owner/model", "main")
+    assert store.get("hub", key) == (False, None)
+
+    store.set("hub", key, {"sha": "abc"})
+    assert store.get("hub", key) == (True, {"sha": "abc"})
+    assert ResponseCache(str(tmp_path)).get("hub", key) == (True, {"sha": "abc"})
+
+
+def test_key_includes_revision():
+    assert make_key("model_info", "owner/model", "main") != make_key("model_info", "owner/model", "abc")
+
+
+def test_ttl_expiry(tmp_path, monkeypatch):
+    store = ResponseCache(str(tmp_path), ttls={"hub": 10})
+    store.set("hub", "k", 1)
+    store.set("llm", "k2", 2)
+
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 60)
+    assert store.get("hub", "k") == (False, None)
+    assert store.get("llm", "k2") == (True, 2)
+
+
+def test_lru_eviction(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(cache.time, "time", lambda: next(clock))
+    store = ResponseCache(str(tmp_path), max_bytes=2500, ttls={"hub": 1000})
+
+    store.set("hub", "a", b"x" * 1000)
+    store.set("hub", "b", b"x" * 1000)
+    store.get("hub", "a")  # a is now more recent than b
+    store.set("hub", "c", b"x" * 1000)
+
+    assert store.get("hub", "a")[0]
+    assert not store.get("hub", "b")[0]
+    assert store.get("hub", "c")[0]
+
+
+def test_size_tracked_without_scans(tmp_path, monkeypatch):
+    store = ResponseCache(str(tmp_path), ttls={"hub": 10})
+    store.set("hub", "a", b"x" * 100)
+    store.set("hub", "b", b"x" * 200)
+    store.set("hub", "a", b"x" * 50)  # replaced, not added
+    blob_sizes = len(cache.pickle.dumps(b"x" * 50, protocol=cache.pickle.HIGHEST_PROTOCOL)) + \
+        len(cache.pickle.dumps(b"x" * 200, protocol=cache.pickle.HIGHEST_PROTOCOL))
+    assert store.size() == blob_sizes
+
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 60)
+    store.get("hub", "b")  # expired and dropped
+    assert ResponseCache(str(tmp_path)).size() == blob_sizes - len(
+        cache.pickle.dumps(b"x" * 200, protocol=cache.pickle.HIGHEST_PROTOCOL))
+
+
+def test_access_times_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "TOUCH_BATCH", 3)
+    store = ResponseCache(str(tmp_path))
+    for key in "abc":
+        store.set("hub", key, 1)
+
+    def accessed():
+        conn = cache.sqlite3.connect(store.path)
+        try:
+            return dict(conn.execute("SELECT key, accessed FROM entries").fetchall())
+        finally:
+            conn.close()
+
+    written = accessed()
+    store.get("hub", "a")
+    store.get("hub", "b")
+    assert accessed() == written
+    store.get("hub", "c")
+    assert all(accessed()[key] > written[key] for key in "abc")
+
+    store.get("hub", "a")
+    written = accessed()
+    store.flush()
+    assert accessed()["a"] > written["a"]
+
+
+def test_cached_fetches_once(tmp_path):
+    configure_cache(str(tmp_path))
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return "value"
+
+    assert cached("hub", "model_info", "owner/model", "main", fetch) == "value"
+    assert cached("hub", "model_info", "owner/model", "main", fetch) == "value"
+    assert len(calls) == 1
+
+
+def test_cached_does_not_store_failures(tmp_path):
+    configure_cache(str(tmp_path))
+
+    def fail():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        cached("github", "contributors", "org/repo", None, fail)
+    assert cached("github", "contributors", "org/repo", None, lambda: ["a"]) == ["a"]
+
+
+def test_cached_async(tmp_path):
+    configure_cache(str(tmp_path))
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return 0.5
+
+    async def twice():
+        a = await cached_async("llm", "url", "llama", None, fetch, "prompt")
+        b = await cached_async("llm", "url", "llama", None, fetch, "prompt")
+        return a, b
+
+    assert asyncio.run(twice()) == (0.5, 0.5)
+    assert len(calls) == 1
+
+
+def test_cached_disabled_always_fetches():
+    configure_cache(None)
+    calls = []
+    for _ in range(2):
+        cached("hub", "model_info", "owner/model", "main", lambda: calls.append(1))
+    assert len(calls) == 2
+
+
+def test_cli_cache_options(tmp_path):
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text(",,https://huggingface.co/owner/model1\n")
+
+    args = parse_args([str(url_file), "--cache-dir", str(tmp_path / "c")])
+    assert args.cache_dir == str(tmp_path / "c")
+
+    args = parse_args([str(url_file), "--no-cache"])
+    assert args.cache_dir is None
@@ -3,7 +3,7 @@ import tempfile
 
 import pytest
 
-from src.cli.cli import CLIArgs, parse_args, parse_url_file
+from src.cli.cli import CLIArgs, iter_url_file, parse_args, parse_url_file
 from src.cli.url import URL, classify_url
 
 # -----------------------------
@@ -101,3 +101,27 @@ def test_parse_url_file_valid_and_none_urls(tmp_path):
     assert code is None
     assert dataset is None
     assert model is not None
+
+
+def test_iter_url_file_from_stdin(monkeypatch):
+    import io
+
+    monkeypatch.setattr("sys.stdin", io.StringIO(",,https://huggingface.co/owner/model1\n\n,,bad\n"))
+    rows = iter_url_file("-")
+    assert not isinstance(rows, list)
+
+    code, dataset, model = next(rows)
+    assert model.name == "model1"
+    assert next(rows) == [None, None, None]
+    assert next(rows, None) is None
+
+
+def test_parse_args_stdin_target():
+    args = parse_args(["-"])
+    assert args.command == "process" and args.url_file == "-"
+
+
+def test_parse_args_timeouts():
+    args = parse_args(["-", "--metric-timeout", "2.5", "--model-timeout", "10"])
+    assert args.metric_timeout == 2.5 and args.model_timeout == 10.0
+    assert parse_args(["-"]).model_timeout is None
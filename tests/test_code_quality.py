@@ -43,13 +43,87 @@ def test_get_data_handles_no_python_files(monkeypatch):
         cardData = {}
 
     class DummyApi:
-        def model_info(self, full_name):
+        def model_info(self, full_name, **kwargs):
             return DummyInfo()
 
-    monkeypatch.setattr("src.metrics.code_quality.HfApi", lambda: DummyApi())
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: DummyApi())
     metric.code_url = CodeURL(raw="https://github.com/dummy/repo")
     metric.model_url = ModelURL(raw="https://huggingface.co/dummy/model")
 
     result = metric.get_data()
     assert result["Issues"] is None
     assert result["Lines of Code"] is None
+
+
+def test_get_data_downloads_filtered_files_pinned_to_sha(monkeypatch, tmp_path):
+    """Oversized files are skipped; the rest download at the repo sha."""
+    from types import SimpleNamespace
+
+    siblings = [
+        SimpleNamespace(rfilename="model.py", size=100),
+        SimpleNamespace(rfilename="utils.py", size=None),
+        SimpleNamespace(rfilename="generated.py", size=10 * 1024 * 1024),
+        SimpleNamespace(rfilename="weights.bin", size=10),
+    ]
+    info = SimpleNamespace(siblings=siblings, cardData={}, sha="abc123")
+
+    class DummyApi:
+        def model_info(self, full_name, **kwargs):
+            return info
+
+    downloads = []
+
+    def fake_download(repo_id, filename, revision=None):
+        downloads.append((repo_id, filename, revision))
+        path = tmp_path / filename
+        path.write_text("x = 1\ny = 2\n")
+        return str(path)
+
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: DummyApi())
+    monkeypatch.setattr("src.metrics.code_quality.hf_hub_download", fake_download)
+
+    result = DummyMetric().get_data()
+    assert sorted(downloads) == [("dummy/model", "model.py", "abc123"), ("dummy/model", "utils.py", "abc123")]
+    assert result == {"Issues": 0, "Lines of Code": 4, "Truncated": False}
+
+
+def test_python_files_capped_deterministically(monkeypatch):
+    """Beyond the cap, top-level then smallest files are kept and truncation is flagged."""
+    from types import SimpleNamespace
+    from src.metrics import code_quality
+
+    monkeypatch.setattr(code_quality, "MAX_PY_FILES", 3)
+    siblings = [
+        SimpleNamespace(rfilename="pkg/a.py", size=1),
+        SimpleNamespace(rfilename="big.py", size=900),
+        SimpleNamespace(rfilename="small.py", size=10),
+        SimpleNamespace(rfilename="mid.py", size=50),
+    ]
+    info = SimpleNamespace(siblings=siblings)
+
+    assert code_quality.python_files(info) == (["small.py", "mid.py", "big.py"], True)
+    info.siblings = list(reversed(siblings))
+    assert code_quality.python_files(info) == (["small.py", "mid.py", "big.py"], True)
+    info.siblings = siblings[:2]
+    assert code_quality.python_files(info) == (["big.py", "pkg/a.py"], False)
+
+
+def test_oversized_files_do_not_fall_back_to_base_model(monkeypatch):
+    """Only a repo with no .py files at all is replaced by its base model."""
+    from types import SimpleNamespace
+
+    oversized = SimpleNamespace(rfilename="generated.py", size=10 * 1024 * 1024)
+    info = SimpleNamespace(siblings=[oversized], cardData={"base_model": "org/base"}, sha="abc123")
+    requested = []
+
+    class DummyApi:
+        def model_info(self, full_name, **kwargs):
+            requested.append(full_name)
+            return info
+
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: DummyApi())
+    metric = DummyMetric()
+
+    assert metric.get_data() == {"Issues": None, "Lines of Code": None, "Truncated": False}
+    assert requested == ["dummy/model"]
+    assert metric.shared_key() is None
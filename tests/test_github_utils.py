@@ -25,7 +25,7 @@ class DummyGithub:
 
 def test_validate_github_token_valid(monkeypatch):
     monkeypatch.setenv("GITHUB_TOKEN", "fake-token")
-    monkeypatch.setattr(src.git, "Github", lambda token: DummyGithub(token))
+    monkeypatch.setattr(src.git, "Github", lambda token, **kwargs: DummyGithub(token))
 
     # should not raise if valid
     src.git.validate_github_token()
@@ -43,10 +43,21 @@ def test_validate_github_token_invalid(monkeypatch, capsys):
             raise BadCredentialsException(
                 status=401, data="bad token", headers={})
 
-    monkeypatch.setattr(src.git, "Github", lambda token: BadGithub(token))
+    monkeypatch.setattr(src.git, "Github", lambda token, **kwargs: BadGithub(token))
 
     with pytest.raises(SystemExit):
         src.git.validate_github_token()
 
     captured = capsys.readouterr()
     assert "Invalid GITHUB_TOKEN" in captured.err
+
+
+def test_validate_github_token_memoized(monkeypatch):
+    monkeypatch.setenv("GITHUB_TOKEN", "memo-token")
+    monkeypatch.setattr(src.git, "_validated", {})
+    created = []
+    monkeypatch.setattr(src.git, "Github", lambda token, **kwargs: created.append(token) or DummyGithub(token))
+
+    first = src.git.validate_github_token()
+    assert src.git.validate_github_token() is first
+    assert created == ["memo-token"]
@@ -0,0 +1,115 @@
+"""
+test_lint.py
+---------------
+Unit tests for src/lint.py.
+
+Tests cover:
+- one warm style guide reused across calls, built with --jobs 1
+- per-file counts add up to a combined flake8 run
+- identical content linted once (memo), and across analyzers via the response cache
+- cached results not reused under different flake8 options
+- process pool path (jobs > 0)
+- scan_file: streamed line count and hash match readlines / sha256
+"""
+
+import hashlib
+
+import pytest
+from flake8.api import legacy as flake8_api
+
+from src import lint
+from src.cache import ResponseCache
+from src.lint import Flake8Analyzer, file_digest, scan_file
+
+CLEAN = "x = 1\n"
+DIRTY = "import os\nx=1\n"  # F401 + E225
+
+
+def write(directory, name, content):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(content)
+    return str(path)
+
+
+def counting_guides(monkeypatch):
+    built = []
+    original = flake8_api.StyleGuide
+
+    def style_guide(application):
+        built.append(application)
+        return original(application)
+
+    monkeypatch.setattr(lint.flake8_api, "StyleGuide", style_guide)
+    return built
+
+
+def test_style_guide_reused(monkeypatch, tmp_path):
+    built = counting_guides(monkeypatch)
+    analyzer = Flake8Analyzer()
+
+    analyzer.count_issues([write(tmp_path, "a.py", DIRTY)])
+    analyzer.count_issues([write(tmp_path, "b.py", CLEAN), write(tmp_path, "c.py", "y = 2\n")])
+    assert len(built) == 1
+    assert built[0].options.jobs.n_jobs == 1
+
+
+def test_counts_match_combined_run(tmp_path):
+    paths = [write(tmp_path, "a.py", DIRTY), write(tmp_path, "b.py", CLEAN), write(tmp_path, "c.py", DIRTY + DIRTY)]
+    combined = flake8_api.get_style_guide(quiet=2).check_files(paths).total_errors
+
+    assert Flake8Analyzer().count_issues(paths) == combined
+
+
+def test_identical_files_linted_once(monkeypatch, tmp_path):
+    analyzer = Flake8Analyzer()
+    checked = []
+    original = analyzer.check_file
+    monkeypatch.setattr(analyzer, "check_file", lambda path: checked.append(path) or original(path))
+
+    first = analyzer.count_issues([write(tmp_path / "repo1", "modeling.py", DIRTY)])
+    second = analyzer.count_issues([write(tmp_path / "repo2", "modeling.py", DIRTY)])
+    assert first == second == 2
+    assert len(checked) == 1
+
+
+def test_results_shared_through_response_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.cache._cache", ResponseCache(str(tmp_path / "cache")))
+    path = write(tmp_path, "modeling.py", DIRTY)
+    assert Flake8Analyzer().count_issues([path]) == 2
+
+    fresh = Flake8Analyzer()
+    monkeypatch.setattr(fresh, "check_file", lambda path: 1 / 0)
+    assert fresh.count_issues([path], [file_digest(path)]) == 2
+
+
+def test_cache_keyed_by_options(monkeypatch, tmp_path):
+    monkeypatch.setattr("src.cache._cache", ResponseCache(str(tmp_path / "cache")))
+    path = write(tmp_path, "modeling.py", DIRTY)
+    default = Flake8Analyzer()
+    assert default.count_issues([path]) == 2
+
+    monkeypatch.setattr(lint, "FLAKE8_ARGV", lint.FLAKE8_ARGV + ("--extend-ignore", "E225"))
+    relaxed = Flake8Analyzer()
+    assert relaxed.options() != default.options()
+    assert relaxed.count_issues([path]) == 1
+
+
+def test_process_pool(tmp_path):
+    analyzer = Flake8Analyzer(jobs=2)
+    try:
+        paths = [write(tmp_path, "a.py", DIRTY), write(tmp_path, "b.py", DIRTY + DIRTY)]
+        assert analyzer.count_issues(paths) == Flake8Analyzer().count_issues(paths)
+    finally:
+        analyzer.close()
+
+
+@pytest.mark.parametrize("content", ["", "x = 1\n", "x = 1\ny = 2", "\n\n\n", "a\r\nb\r\n" * 50])
+def test_scan_file_matches_readlines(monkeypatch, tmp_path, content):
+    monkeypatch.setattr(lint, "SCAN_BLOCK", 7)  # force lines across block boundaries
+    path = tmp_path / "f.py"
+    path.write_bytes(content.encode())
+
+    with open(path, "r", encoding="utf-8") as f:
+        expected_lines = len(f.readlines())
+    assert scan_file(str(path)) == (expected_lines, hashlib.sha256(content.encode()).hexdigest())
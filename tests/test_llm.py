@@ -0,0 +1,271 @@
+"""
+test_llm.py
+---------------
+Basic unit tests for the shared GenAI client.
+
+Tests cover:
+- request body / score parsing
+- 0.0 on missing key or prompt, errors raised on bad replies
+- async path through a shared session
+- scheduler batching, with one rating per dataset shared by all lines
+- a batched request that overruns the metric timeout times its metrics out
+- ratings cached by template version and content hash: forks sharing a
+  README hit, a template version bump misses
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.metrics import llm
+
+
+class DummyResponse:
+    def __init__(self, content, status=200):
+        self.content = content
+        self.status = status
+
+    def raise_for_status(self):
+        if self.status >= 400:
+            raise RuntimeError(f"HTTP {self.status}")
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.content}}]}
+
+
+class DummyAsyncResponse(DummyResponse):
+    url = llm.GENAI_URL
+    reason = "OK"
+    headers = {}
+
+    async def read(self):
+        return json.dumps(DummyResponse.json(self)).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class DummySession:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        return DummyAsyncResponse(self.content)
+
+
+def patch_post(monkeypatch, post):
+    monkeypatch.setattr(llm, "get_http_session", lambda: SimpleNamespace(post=post))
+
+
+def test_build_request():
+    headers, body = llm.build_request("rate this", "key")
+    assert headers["Authorization"] == "Bearer key"
+    assert body["messages"] == [{"role": "user", "content": "rate this"}]
+
+
+def test_score_prompt(monkeypatch):
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    patch_post(monkeypatch, lambda *a, **k: DummyResponse(" 0.7\n"))
+    assert llm.score_prompt("rate this") == 0.7
+
+
+@pytest.mark.parametrize("content, status", [("not a float", 200), ("0.9", 500)])
+def test_score_prompt_bad_reply(monkeypatch, content, status):
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    patch_post(monkeypatch, lambda *a, **k: DummyResponse(content, status))
+    with pytest.raises(Exception):
+        llm.score_prompt("rate this")
+
+
+def test_metric_marks_bad_reply_as_failed(monkeypatch):
+    from src.cli.url import ModelURL
+    from src.metrics.ramp_up_time import RampUpTimeMetric
+
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    patch_post(monkeypatch, lambda *a, **k: DummyResponse("n/a"))
+    metric = RampUpTimeMetric(ModelURL("https://huggingface.co/owner/model"))
+    metric.run()
+    assert metric.score == 0.0 and metric.failed
+
+
+def test_score_prompt_missing_key_or_prompt(monkeypatch):
+    monkeypatch.delenv("GEN_AI_STUDIO_API_KEY", raising=False)
+    assert llm.score_prompt("rate this") == 0.0
+
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    assert llm.score_prompt(None) == 0.0
+
+
+def test_score_prompt_async(monkeypatch):
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    session = DummySession("0.4")
+    assert asyncio.run(llm.score_prompt_async(session, "rate this")) == 0.4
+    assert session.calls == 1
+
+
+def test_parse_batch_scores():
+    content = 'Sure: {"0.ramp_up_time": 0.8, "0.dataset_quality": "0.3", "0.x": "n/a"}'
+    scores = llm.parse_batch_scores(content, ["0.ramp_up_time", "0.dataset_quality", "0.x", "0.y"])
+    assert scores == {"0.ramp_up_time": 0.8, "0.dataset_quality": 0.3, "0.x": None, "0.y": None}
+    assert llm.parse_batch_scores("no json here", ["a"]) == {"a": None}
+
+
+def test_score_prompts_single_request(monkeypatch):
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    bodies = []
+
+    def post(url, headers=None, json=None, timeout=None):
+        bodies.append(json)
+        return DummyResponse('{"a": 0.1, "b": 0.2, "c": 0.3}')
+
+    patch_post(monkeypatch, post)
+    scores = llm.score_prompts({"a": "rate a", "b": "rate b", "c": "rate c"})
+
+    assert scores == {"a": 0.1, "b": 0.2, "c": 0.3}
+    assert len(bodies) == 1
+    assert "### Item id: b" in bodies[0]["messages"][0]["content"]
+
+
+def test_score_prompts_uses_cache_and_plain_prompt(monkeypatch, tmp_path):
+    from src.cache import configure_cache
+
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    configure_cache(str(tmp_path))
+    try:
+        patch_post(monkeypatch, lambda *a, **k: DummyResponse('{"a": 0.1, "b": 0.2}'))
+        llm.score_prompts({"a": "rate a", "b": "rate b"})
+
+        # "a" is cached, "b2" is the only miss -> plain single-prompt request
+        prompts = []
+        patch_post(monkeypatch, lambda url, json=None, **k: prompts.append(json) or DummyResponse("0.9"))
+        scores = llm.score_prompts({"a": "rate a", "b2": "rate b2"})
+    finally:
+        configure_cache(None)
+
+    assert scores == {"a": 0.1, "b2": 0.9}
+    assert [p["messages"][0]["content"] for p in prompts] == ["rate b2"]
+
+
+def test_score_prompts_failure_maps_to_none(monkeypatch):
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    patch_post(monkeypatch, lambda *a, **k: DummyResponse("x", 500))
+    assert llm.score_prompts({"a": "rate a", "b": "rate b"}) == {"a": None, "b": None}
+
+
+def test_scheduler_batches_llm_metrics(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.cli.url import DatasetURL, ModelURL
+    from src.metrics.dataset_and_code import DatasetAndCodeMetric
+    from src.metrics.dataset_quality import DatasetQualityMetric
+    from src.metrics.ramp_up_time import RampUpTimeMetric
+    from src.scheduler import BatchScheduler
+
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: None)
+    monkeypatch.setattr("src.metadata.load_readme", lambda repo, revision=None: "")
+    requests_made = []
+
+    def post(url, headers=None, json=None, timeout=None):
+        content = json["messages"][0]["content"]
+        requests_made.append(content)
+        ids = [line.split(": ")[1] for line in content.splitlines() if line.startswith("### Item id")]
+        return DummyResponse("{" + ", ".join(f'"{i}": {0.3 if "quality" in i else 0.5}' for i in ids) + "}")
+
+    patch_post(monkeypatch, post)
+
+    def factory(code_url, dataset_url, model_url):
+        return [RampUpTimeMetric(model_url), DatasetAndCodeMetric(model_url), DatasetQualityMetric(dataset_url)]
+
+    dataset = DatasetURL("https://huggingface.co/datasets/org/data")
+    lines = [[None, dataset, ModelURL(f"https://huggingface.co/owner/m{i}")] for i in range(4)]
+    weights = {"ramp_up_time": 0.5, "dataset_and_code_score": 0.5, "dataset_quality": 0.0}
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = dict(BatchScheduler(pool, weights, factory, llm_batch=2).run(lines))
+
+    assert len(requests_made) == 2
+    # The dataset shared by every line is rated once and fanned out
+    assert sum(content.count(".dataset_quality") for content in requests_made) == 1
+    for record in map(json.loads, results.values()):
+        assert record["ramp_up_time"] == 0.5 and record["dataset_quality"] == 0.3
+
+
+def test_scheduler_times_out_slow_llm_batch(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.cli.url import ModelURL
+    from src.metrics.dataset_and_code import DatasetAndCodeMetric
+    from src.metrics.ramp_up_time import RampUpTimeMetric
+    from src.scheduler import BatchScheduler
+
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: None)
+    monkeypatch.setattr("src.metadata.load_readme", lambda repo, revision=None: "")
+    release = threading.Event()
+
+    def post(url, headers=None, json=None, timeout=None):
+        release.wait(5)
+        return DummyResponse('{"0.ramp_up_time": 0.5, "0.dataset_and_code_score": 0.5}')
+
+    patch_post(monkeypatch, post)
+
+    def factory(code_url, dataset_url, model_url):
+        return [RampUpTimeMetric(model_url), DatasetAndCodeMetric(model_url)]
+
+    lines = [[None, None, ModelURL("https://huggingface.co/owner/m0")]]
+    weights = {"ramp_up_time": 0.5, "dataset_and_code_score": 0.5}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = dict(BatchScheduler(pool, weights, factory, metric_timeout=0.2).run(lines))
+        release.set()
+
+    record = json.loads(results[0])
+    assert record["ramp_up_time"] == 0.0 and record["dataset_and_code_score"] == 0.0
+    assert sorted(record["timed_out"]) == ["dataset_and_code_score", "ramp_up_time"]
+    assert record["ramp_up_time_latency"] < 2000
+
+
+def test_cache_keyed_by_template_and_content(monkeypatch, tmp_path):
+    from src.cache import configure_cache
+    from src.cli.url import ModelURL
+    from src.metadata import ModelMetadata
+    from src.metrics.ramp_up_time import RampUpTimeMetric
+
+    monkeypatch.setenv("GEN_AI_STUDIO_API_KEY", "key")
+    monkeypatch.setattr("src.metadata.load_readme", lambda repo, revision=None: "# Shared card\nUsage: pip install")
+    posts = []
+    patch_post(monkeypatch, lambda *a, **k: posts.append(1) or DummyResponse("0.6"))
+
+    def rate(url):
+        metric = RampUpTimeMetric(ModelURL(url))
+        metric.set_metadata(ModelMetadata(metric.model_url))
+        metric.run()
+        return metric.score
+
+    configure_cache(str(tmp_path))
+    try:
+        assert rate("https://huggingface.co/org/model") == 0.6
+        # A quantized fork with the same README is answered from the cache
+        assert rate("https://huggingface.co/someone/model-GGUF") == 0.6
+        assert len(posts) == 1
+
+        monkeypatch.setattr(RampUpTimeMetric, "TEMPLATE_VERSION", 2)
+        rate("https://huggingface.co/org/model")
+        assert len(posts) == 2
+    finally:
+        configure_cache(None)
+
+
+def test_scoring_prompt_key():
+    a = llm.ScoringPrompt.for_content("prompt A", "ramp_up_time", 1, "readme")
+    b = llm.ScoringPrompt.for_content("prompt B", "ramp_up_time", 1, "readme")
+    assert a.cache_key == b.cache_key
+    assert a.cache_key[0] == "ramp_up_time@v1"
+    assert llm.ScoringPrompt.for_content("x", "ramp_up_time", 1, "other").cache_key != a.cache_key
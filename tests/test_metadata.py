@@ -0,0 +1,125 @@
+"""
+test_metadata.py
+---------------
+Basic unit tests for the shared ModelMetadata provider.
+
+Tests cover:
+- model_info fetched once and shared by several metrics
+- base model lookups cached by repo id
+- prefetch swallowing Hub errors
+- README downloaded and parsed once; empty when the repo has none, a
+  failed download raises (once) instead
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from huggingface_hub.errors import EntryNotFoundError
+
+from src.cli.url import ModelURL
+from src.metadata import ModelMetadata, ReadmeUnavailable
+from src.metrics.license import LicenseMetric
+from src.metrics.size import SizeMetric
+
+
+class DummyInfo:
+    safetensors = {"total": 42}
+    cardData = {"license": "mit"}
+    siblings = []
+
+
+class CountingApi:
+    calls: list = []
+
+    def model_info(self, repo_id, **kwargs):
+        CountingApi.calls.append(repo_id)
+        return DummyInfo()
+
+
+@pytest.fixture
+def counting_api(monkeypatch):
+    CountingApi.calls = []
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: CountingApi())
+    return CountingApi
+
+
+def test_model_info_fetched_once_across_metrics(counting_api):
+    url = ModelURL(raw="https://huggingface.co/owner/model")
+    metadata = ModelMetadata(url).prefetch()
+
+    size = SizeMetric(url)
+    license_metric = LicenseMetric(url)
+    for metric in (size, license_metric):
+        metric.set_metadata(metadata)
+        metric.run()
+
+    assert counting_api.calls == ["owner/model"]
+    assert license_metric.data == {"license": "mit"}
+    assert size.data == {"size": 42}
+
+
+def test_model_info_cached_per_repo(counting_api):
+    metadata = ModelMetadata(ModelURL(raw="https://huggingface.co/owner/model"))
+    metadata.model_info()
+    metadata.model_info("base/model")
+    metadata.model_info("base/model")
+
+    assert counting_api.calls == ["owner/model", "base/model"]
+
+
+def test_metric_without_injected_metadata_creates_its_own(counting_api):
+    metric = SizeMetric(ModelURL(raw="https://huggingface.co/owner/model"))
+    metric.run()
+
+    assert metric.metadata is not None
+    assert counting_api.calls == ["owner/model"]
+
+
+def test_prefetch_swallows_errors(monkeypatch):
+    class FailingApi:
+        def model_info(self, repo_id, **kwargs):
+            raise RuntimeError("hub down")
+
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: FailingApi())
+    metadata = ModelMetadata(ModelURL(raw="https://huggingface.co/owner/model"))
+    assert metadata.prefetch() is metadata
+
+    with pytest.raises(RuntimeError):
+        metadata.model_info()
+
+
+def test_readme_fetched_once_pinned_to_revision(monkeypatch):
+    calls = []
+    monkeypatch.setattr("src.metadata.load_readme",
+                        lambda repo, revision=None: calls.append((repo, revision)) or "---\nlicense: mit\n---\nHello")
+    metadata = ModelMetadata(ModelURL(raw="https://huggingface.co/owner/model"))
+    metadata.revision = "abc"
+
+    assert metadata.readme().body == "Hello"
+    assert metadata.readme() is metadata.readme()
+    assert metadata.readme().front_matter == {"license": "mit"}
+    assert calls == [("owner/model", "abc")]
+
+
+def test_readme_empty_when_missing(monkeypatch):
+    def missing(repo, filename, revision=None):
+        raise EntryNotFoundError("404 README.md")
+
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: SimpleNamespace(hf_hub_download=missing))
+    assert ModelMetadata(ModelURL(raw="https://huggingface.co/owner/model")).readme().body == ""
+    assert ModelMetadata().readme().text == ""
+
+
+def test_readme_failure_raises(monkeypatch):
+    calls = []
+
+    def fail(repo, revision=None):
+        calls.append(repo)
+        raise ConnectionError("hub down")
+
+    monkeypatch.setattr("src.metadata.load_readme", fail)
+    metadata = ModelMetadata(ModelURL(raw="https://huggingface.co/owner/model"))
+    assert metadata.prefetch() is metadata
+    with pytest.raises(ReadmeUnavailable):
+        metadata.readme()
+    assert calls == ["owner/model"]
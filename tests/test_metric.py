@@ -7,8 +7,12 @@ Tests cover:
 - set, score, latency
 - None data field
 - as_dict function
+- timeout: overrunning get_data is abandoned and scored 0 (sync and async)
 """
 
+import asyncio
+import threading
+
 import pytest
 
 from src.metrics.metric import Metric
@@ -52,3 +56,49 @@ def test_as_dict_format():
     assert "dummy_latency" in result
     assert result["dummy"] == 0.5
     assert isinstance(result["dummy_latency"], int)
+
+
+class SlowMetric(DummyMetric):
+    def __init__(self, release):
+        super().__init__()
+        self.release = release
+
+    def get_data(self):
+        self.release.wait(5)
+        return {"field": "late"}
+
+    async def get_data_async(self, session):
+        await asyncio.sleep(5)
+        return {"field": "late"}
+
+
+def test_run_timeout_abandons_get_data():
+    release = threading.Event()
+    m = SlowMetric(release)
+    m.timeout = 0.05
+    m.run()
+    release.set()
+
+    assert m.timed_out and m.failed
+    assert m.score == 0.0 and m.data == {}
+    assert m.latency < 5000
+
+
+def test_run_within_timeout_scores_normally():
+    release = threading.Event()
+    release.set()
+    m = SlowMetric(release)
+    m.timeout = 5
+    m.run()
+
+    assert not m.timed_out
+    assert m.score == 0.5 and m.data == {"field": "late"}
+
+
+def test_run_async_timeout_cancels_fetch():
+    m = SlowMetric(threading.Event())
+    m.timeout = 0.05
+    asyncio.run(m.run_async(None))
+
+    assert m.timed_out
+    assert m.score == 0.0
@@ -93,3 +93,42 @@ def test_build_output_json_format():
     assert isinstance(data, dict)
     assert ":" in output_str
     assert "\n" not in output_str
+
+
+def test_ndjson_writer_streams_in_completion_order(tmp_path):
+    from src.cli.output import NDJSONWriter
+
+    path = tmp_path / "out.ndjson"
+    with NDJSONWriter(str(path)) as writer:
+        writer.write(1, '{"name": "b"}')
+        # Flushed per record, visible before close
+        assert path.read_text() == '{"name": "b"}\n'
+        writer.write(0, '{"name": "a"}')
+
+    assert path.read_text().splitlines() == ['{"name": "b"}', '{"name": "a"}']
+
+
+def test_ndjson_writer_ordered_skips_none(capsys):
+    from src.cli.output import NDJSONWriter
+
+    with NDJSONWriter("-", ordered=True) as writer:
+        writer.write(2, "c")
+        writer.write(1, None)
+        assert capsys.readouterr().out == ""
+        writer.write(0, "a")
+        writer.write(4, "e")
+
+    assert capsys.readouterr().out.splitlines() == ["a", "c", "e"]
+
+
+def test_build_output_lists_timed_out_metrics():
+    model = ModelURL("https://huggingface.co/owner/model")
+    slow = DummyMetric("slow", 0.0)
+    slow.timed_out = True
+    metrics = [DummyMetric("fast", 1.0), slow]
+
+    result = json.loads(build_output(model, metrics, {"fast": 0.5, "slow": 0.5}, 7))
+    assert result["timed_out"] == ["slow"]
+    assert result["net_score"] == 0.5
+
+    assert "timed_out" not in json.loads(build_output(model, metrics[:1], {"fast": 1.0}, 7))
@@ -8,6 +8,8 @@ Tests cover:
 - Model does not have any likes or downloads
 - Model or download data is unavailable (Should be the same as previous case)
 - Model and download numbers create the correct metric score
+- Single-pass category counts agree with per-term counting
+- Only the README body is scanned, not its YAML front matter
 
 """
 
@@ -18,11 +20,6 @@ from src.metrics.performance_claims import PerformanceClaimsMetric
 from src.cli.url import ModelURL
 
 
-class DummyCard:
-    def __init__(self, text):
-        self.text = text
-
-
 @pytest.mark.parametrize(
     "readme_text, expected_total, expected_score",
     [
@@ -46,12 +43,9 @@ class DummyCard:
     ],
 )
 def test_calculate_score(monkeypatch, readme_text, expected_total, expected_score):
-    from src.metrics import performance_claims
-
     monkeypatch.setattr(
-        performance_claims.ModelCard,
-        "load",
-        lambda repo_id: DummyCard(readme_text),
+        "src.metadata.load_readme",
+        lambda repo, revision=None: "---\nmetrics:\n- accuracy\n- f1\n---\n" + readme_text,
     )
 
     metric = PerformanceClaimsMetric(ModelURL(raw="https://huggingface.co/dummy/model"))
@@ -62,18 +56,26 @@ def test_calculate_score(monkeypatch, readme_text, expected_total, expected_scor
 
 
 def test_handles_exception(monkeypatch):
-    # Simulate ModelCard.load raising
-    from src.metrics import performance_claims
-
+    # Simulate the README download raising
     monkeypatch.setattr(
-        performance_claims.ModelCard,
-        "load",
-        lambda repo_id: (_ for _ in ()).throw(RuntimeError("boom")),
+        "src.metadata.load_readme",
+        lambda repo, revision=None: (_ for _ in ()).throw(RuntimeError("boom")),
     )
 
     metric = PerformanceClaimsMetric(ModelURL(raw="https://huggingface.co/dummy/model"))
-    metric.data = metric.get_data()
-    assert metric.data["total"] == 0
-    assert metric.calculate_score() == 0.0
+    metric.run()
+    # A failed download is a failed metric, not a README without claims
+    assert metric.failed and metric.score == 0.0
+
 
+def test_count_categories_matches_per_term_counts():
+    from src.metrics.performance_claims import KEY_TERMS, count_categories, count_matches
 
+    readme = (
+        "Our model is State-of-the-Art on SuperGLUE and GLUE, beats baseline "
+        "on MS MARCO (exact match 81 percent) and outperforms BERT. "
+        "Accuracy/F1 results: accuracy 0.9, f1 0.8, loss 0.1. SOTA score; glue, \u017fota."
+    )
+    expected = {cat: count_matches(readme, terms) for cat, terms in KEY_TERMS.items()}
+    assert count_categories(readme) == expected
+    assert count_categories("") == {cat: 0 for cat in KEY_TERMS}
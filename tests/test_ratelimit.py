@@ -0,0 +1,141 @@
+"""
+test_ratelimit.py
+---------------
+Unit tests for src/ratelimit.py.
+
+Tests cover:
+- AIMD window: halved on 429, widened by 1/window per answered request
+- an empty quota (X-RateLimit-Remaining: 0) holds requests until its reset
+- throttled requests retried after Retry-After, then returned as is once
+  retries run out or the wait is too long
+- one limiter per upstream; async path through send_async
+- end to end against the rate-limited stub server
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from src import ratelimit
+from src.ratelimit import HostLimiter, RateController, configure_ratelimit, send_async
+from src.stub_server import StubConfig, StubServer
+
+
+def response(status=200, **headers):
+    return SimpleNamespace(status_code=status, status=status, headers=headers, close=lambda: None)
+
+
+def scripted(*responses):
+    calls = []
+
+    def send(request):
+        calls.append(request)
+        return responses[min(len(calls), len(responses)) - 1]
+
+    return send, calls
+
+
+def test_aimd_window():
+    limiter = HostLimiter("hub", max_concurrency=8, backoff=0.0)
+    limiter.acquire()
+    assert limiter.release(429, {"Retry-After": "0"}) == 0.0
+    assert limiter.window == 4.0
+
+    for _ in range(4):
+        limiter.acquire()
+        assert limiter.release(200, {}) is None
+    assert 4.0 < limiter.window < 5.0
+
+
+def test_concurrency_window_limits_slots():
+    limiter = HostLimiter("hub", max_concurrency=2)
+    assert limiter.try_acquire() == 0.0 and limiter.try_acquire() == 0.0
+    assert limiter.try_acquire() > 0
+    limiter.release()
+    assert limiter.try_acquire() == 0.0
+
+
+def test_empty_quota_waits_for_reset():
+    limiter = HostLimiter("github", max_concurrency=4)
+    limiter.acquire()
+    limiter.release(200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.2"})
+
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start >= 0.15
+
+
+def test_retries_after_retry_after(monkeypatch):
+    monkeypatch.setattr(ratelimit.random, "uniform", lambda a, b: 0.0)
+    send, calls = scripted(response(429, **{"Retry-After": "0.1"}), response(200))
+
+    start = time.monotonic()
+    assert RateController(retries=3)(SimpleNamespace(url="https://hub/x"), send).status_code == 200
+    assert len(calls) == 2 and time.monotonic() - start >= 0.1
+
+
+def test_github_403_without_quota_is_retried(monkeypatch):
+    monkeypatch.setattr(ratelimit.random, "uniform", lambda a, b: 0.0)
+    send, calls = scripted(response(403, **{"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.05"}),
+                           response(200))
+    assert RateController()(SimpleNamespace(url="https://api.github.com/x"), send).status_code == 200
+    assert len(calls) == 2
+
+    # A plain 403 (no quota headers) is not a rate limit
+    send, calls = scripted(response(403))
+    assert RateController()(SimpleNamespace(url="https://api.github.com/x"), send).status_code == 403
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("retries, retry_after, attempts", [(2, "0", 3), (3, "3600", 1)])
+def test_gives_up(retries, retry_after, attempts):
+    send, calls = scripted(response(429, **{"Retry-After": retry_after}))
+    result = RateController(retries=retries, backoff=0.0)(SimpleNamespace(url="https://hub/x"), send)
+    assert result.status_code == 429 and len(calls) == attempts
+
+
+def test_send_errors_release_the_slot():
+    controller = RateController(max_concurrency=1)
+
+    def fail(request):
+        raise requests.ConnectionError("down")
+
+    with pytest.raises(requests.ConnectionError):
+        controller(SimpleNamespace(url="https://hub/x"), fail)
+    assert controller.limiter("https://hub/x").in_flight == 0
+
+
+def test_one_limiter_per_upstream():
+    controller = RateController({"hub": "http://stub", "github": "http://stub/github"})
+    assert controller.limiter("http://stub/github/user").name == "github"
+    assert controller.limiter("http://stub/api/models/a").name == "hub"
+    assert controller.limiter("https://other.org/x").name == "other.org"
+    assert controller.limiter("http://stub/api") is controller.limiter("http://stub/x")
+
+
+def test_send_async_retries(monkeypatch):
+    monkeypatch.setattr(ratelimit.random, "uniform", lambda a, b: 0.0)
+    replies = [response(429, **{"Retry-After": "0"}), response(200)]
+
+    async def send():
+        return replies.pop(0)
+
+    configure_ratelimit(True, retries=2)
+    try:
+        assert asyncio.run(send_async("https://genai/x", send)).status == 200
+    finally:
+        configure_ratelimit(False)
+    assert not replies
+
+
+def test_stub_rate_limit_retried():
+    with StubServer(StubConfig(rate_limit=2, rate_window=1.0)) as stub:
+        configure_ratelimit(True, {"hub": stub.url}, retries=3)
+        try:
+            statuses = [requests.get(f"{stub.url}/api/models/org/model").status_code for _ in range(4)]
+        finally:
+            configure_ratelimit(False)
+    assert statuses == [200] * 4
@@ -0,0 +1,67 @@
+"""
+test_readme.py
+---------------
+Unit tests for src/readme.py.
+
+Tests cover:
+- YAML front matter split from the body; malformed or missing front matter
+- sections by heading, ignoring "#" lines inside fenced code blocks
+- excerpt truncation and the content hash
+"""
+
+import hashlib
+
+from src.readme import ModelReadme
+
+CARD = """---
+license: apache-2.0
+datasets:
+- squad
+---
+# My model
+
+Intro text.
+
+## Usage
+
+```python
+# load the model
+model = load()
+```
+
+## Results ##
+Accuracy 91%.
+"""
+
+
+def test_front_matter_and_body():
+    readme = ModelReadme.parse(CARD)
+    assert readme.front_matter == {"license": "apache-2.0", "datasets": ["squad"]}
+    assert readme.body.startswith("# My model") and "license" not in readme.body
+    assert readme.sha256 == hashlib.sha256(CARD.encode()).hexdigest()
+
+
+def test_without_or_with_bad_front_matter():
+    assert ModelReadme.parse("# Title\ntext").front_matter == {}
+    readme = ModelReadme.parse("---\n: [bad\n---\nbody")
+    assert readme.front_matter == {} and readme.body == "body"
+
+
+def test_sections_skip_fenced_code():
+    readme = ModelReadme.parse(CARD)
+    assert [name for name, _ in readme.sections] == ["My model", "Usage", "Results"]
+    assert "# load the model" in readme.section("usage")
+    assert readme.section("Results") == "Accuracy 91%."
+    assert readme.section("Training") is None
+
+
+def test_preamble_section_and_empty_readme():
+    assert ModelReadme.parse("plain text\n# H\nx").sections == [("", "plain text"), ("H", "x")]
+    empty = ModelReadme.parse("")
+    assert empty.sections == [] and empty.body == "" and empty == ModelReadme()
+
+
+def test_excerpt():
+    readme = ModelReadme.parse("a" * 100)
+    assert readme.excerpt(200) == "a" * 100
+    assert readme.excerpt(10) == "a" * 10 + "\n[...]"
@@ -0,0 +1,292 @@
+"""
+test_scheduler.py
+---------------
+Basic unit tests for BatchScheduler.
+
+Tests cover:
+- one record per line with a model url, lines without one yield None
+- records assembled from every metric of the line
+- metadata fetched once per model and shared with its metrics
+- input read lazily, never more than max_inflight lines ahead, counting
+  records held in an ordered writer's reorder buffer
+- model deadline: overdue line emitted with partial scores and timed_out;
+  a late result does not write into the emitted metrics
+- a broken worker pool fails only the affected metrics, every line is
+  still emitted
+- metrics with a shared_key computed once and fanned out; fetched per
+  line when the first one fails
+"""
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.cli.output import NDJSONWriter
+from src.cli.url import CodeURL, ModelURL
+from src.metrics.metric import Metric
+from src.scheduler import BatchScheduler, run_metric
+
+
+class DummyMetric(Metric):
+    def __init__(self, name, score):
+        super().__init__(name)
+        self.fixed = score
+
+    def get_data(self):
+        return {"model": self.get_metadata().model_info().name}
+
+    def calculate_score(self) -> float:
+        return self.fixed
+
+
+class DummyInfo:
+    def __init__(self, name):
+        self.name = name
+
+
+class CountingApi:
+    calls: list = []
+
+    def model_info(self, repo_id, **kwargs):
+        CountingApi.calls.append(repo_id)
+        return DummyInfo(repo_id)
+
+
+@pytest.fixture(autouse=True)
+def counting_api(monkeypatch):
+    CountingApi.calls = []
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: CountingApi())
+    return CountingApi
+
+
+def dummy_factory(code_url, dataset_url, model_url):
+    return [DummyMetric("a", 1.0), DummyMetric("b", 0.5)]
+
+
+def run_batch(lines):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, dummy_factory)
+        return {index: record for index, record in scheduler.run(lines) if record is not None}
+
+
+def test_one_record_per_model_line(capsys):
+    lines = [
+        [None, None, ModelURL("https://huggingface.co/owner/one")],
+        [CodeURL("https://github.com/org/repo"), None, None],
+        [None, None, ModelURL("https://huggingface.co/owner/two")],
+    ]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, dummy_factory)
+        pairs = list(scheduler.run(lines))
+    assert (1, None) in pairs
+
+    results = {index: record for index, record in pairs if record is not None}
+    assert sorted(results) == [0, 2]
+    assert "Skipping line" in capsys.readouterr().err
+    assert json.loads(results[0])["name"] == "one"
+    assert json.loads(results[2])["name"] == "two"
+
+
+def test_record_contains_every_metric():
+    results = run_batch([[None, None, ModelURL("https://huggingface.co/owner/one")]])
+    record = json.loads(results[0])
+
+    assert record["a"] == 1.0 and record["b"] == 0.5
+    assert record["net_score"] == 0.75
+    assert isinstance(record["net_score_latency"], int)
+
+
+def test_metadata_fetched_once_per_model(counting_api):
+    lines = [[None, None, ModelURL(f"https://huggingface.co/owner/m{i}")] for i in range(5)]
+    run_batch(lines)
+
+    assert sorted(counting_api.calls) == [f"owner/m{i}" for i in range(5)]
+
+
+def test_input_read_lazily_within_window():
+    read = []
+
+    def lines():
+        for i in range(10):
+            read.append(i)
+            yield [None, None, ModelURL(f"https://huggingface.co/owner/m{i}")]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, dummy_factory, max_inflight=3)
+        results = scheduler.run(lines())
+        next(results)
+        # One record out: at most the window plus one refill has been read
+        assert len(read) <= 4
+        assert len(list(results)) == 9
+
+
+class StuckMetric(DummyMetric):
+    release = threading.Event()
+
+    def get_data(self):
+        StuckMetric.release.wait(5)
+        return {}
+
+
+def test_ordered_backlog_counts_against_window(tmp_path):
+    StuckMetric.release.clear()
+    yielded, ahead = [], []
+
+    def factory(code_url, dataset_url, model_url):
+        # Line 0 is stuck, so every later record waits in the reorder buffer
+        stuck = model_url.name == "m0"
+        return [StuckMetric("a", 1.0) if stuck else DummyMetric("a", 1.0), DummyMetric("b", 0.5)]
+
+    with NDJSONWriter(str(tmp_path / "out.ndjson"), ordered=True) as writer, \
+            ThreadPoolExecutor(max_workers=4) as pool:
+        def lines():
+            for i in range(10):
+                # Lines read beyond the last record actually written out
+                ahead.append(i - (len(yielded) - writer.backlog()))
+                yield [None, None, ModelURL(f"https://huggingface.co/owner/m{i}")]
+
+        threading.Timer(0.3, StuckMetric.release.set).start()
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, factory, max_inflight=3, backlog=writer.backlog)
+        for index, record in scheduler.run(lines()):
+            writer.write(index, record)
+            yielded.append(index)
+
+    assert max(ahead) < 3
+    assert sorted(yielded) == list(range(10))
+
+
+def test_model_timeout_emits_partial_record():
+    StuckMetric.release.clear()
+
+    def factory(code_url, dataset_url, model_url):
+        return [DummyMetric("a", 1.0), StuckMetric("b", 0.5)]
+
+    lines = [[None, None, ModelURL("https://huggingface.co/owner/one")]]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, factory, model_timeout=0.2)
+        pairs = list(scheduler.run(lines))
+        StuckMetric.release.set()
+
+    record = json.loads(pairs[0][1])
+    assert record["a"] == 1.0 and record["b"] == 0.0
+    assert record["timed_out"] == ["b"]
+    assert record["net_score"] == 0.5
+    assert record["net_score_latency"] < 5000
+
+
+def test_model_timeout_detaches_running_metrics():
+    StuckMetric.release.clear()
+    created = []
+
+    def factory(code_url, dataset_url, model_url):
+        created.extend([DummyMetric("a", 1.0), StuckMetric("b", 0.5)])
+        return created[-2:]
+
+    lines = [[None, None, ModelURL("https://huggingface.co/owner/one")]]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, factory, model_timeout=0.2)
+        pairs = list(scheduler.run(lines))
+        StuckMetric.release.set()
+
+    # The thread pool shares metric objects like the async engine: the late
+    # run finishes on its own object, the timed-out record used a copy
+    stuck = created[1]
+    assert json.loads(pairs[0][1])["timed_out"] == ["b"]
+    assert stuck.score == 0.5 and not stuck.timed_out
+
+
+class BreakingPool(ThreadPoolExecutor):
+    """Breaks like a ProcessPoolExecutor whose worker died while running m1's metrics."""
+
+    broken = False
+
+    def submit(self, fn, *args):
+        if self.broken:
+            raise BrokenProcessPool("pool is broken")
+        if fn is run_metric and args[0].metadata.model_url.name == "m1" and args[0].name == "b":
+            self.broken = True
+            fut = Future()
+            fut.set_exception(BrokenProcessPool("worker died"))
+            return fut
+        return super().submit(fn, *args)
+
+
+def test_broken_pool_fails_only_affected_metrics():
+    lines = [[None, None, ModelURL(f"https://huggingface.co/owner/m{i}")] for i in range(4)]
+    with BreakingPool(max_workers=1) as pool:
+        # One line at a time, so the break happens between m1 and m2
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, dummy_factory, max_inflight=1)
+        results = dict(scheduler.run(lines))
+
+    records = {index: json.loads(record) for index, record in results.items()}
+    assert sorted(records) == [0, 1, 2, 3]
+    assert records[0]["a"] == 1.0 and records[0]["b"] == 0.5
+    assert records[1]["a"] == 1.0 and records[1]["b"] == 0.0
+    # Nothing could be submitted after the break
+    assert all(records[i]["a"] == 0.0 and records[i]["b"] == 0.0 for i in (2, 3))
+
+
+def test_metric_timeout_passed_to_metrics():
+    seen = []
+
+    def factory(code_url, dataset_url, model_url):
+        metrics = dummy_factory(code_url, dataset_url, model_url)
+        seen.extend(metrics)
+        return metrics
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        scheduler = BatchScheduler(pool, {"a": 0.5, "b": 0.5}, factory, metric_timeout=3.0)
+        list(scheduler.run([[None, None, ModelURL("https://huggingface.co/owner/one")]]))
+
+    assert [m.timeout for m in seen] == [3.0, 3.0]
+
+
+class SharedMetric(Metric):
+    fetched: list = []
+    fail = False
+
+    def __init__(self, code_url):
+        super().__init__("shared")
+        self.code_url = code_url
+
+    def shared_key(self):
+        return ("shared", self.code_url.display_name()) if self.code_url else None
+
+    def get_data(self):
+        if self.shared is not None:
+            return dict(self.shared)
+        SharedMetric.fetched.append(self.code_url.raw)
+        if SharedMetric.fail:
+            raise RuntimeError("upstream down")
+        return {"contributors": 3}
+
+    def calculate_score(self) -> float:
+        return self.data["contributors"] / 10
+
+
+def run_shared(fail):
+    SharedMetric.fetched, SharedMetric.fail = [], fail
+
+    def factory(code_url, dataset_url, model_url):
+        return [SharedMetric(code_url)]
+
+    repo, other = CodeURL("https://github.com/org/repo"), CodeURL("https://github.com/org/other")
+    lines = [[repo if i % 3 else other, None, ModelURL(f"https://huggingface.co/owner/m{i}")] for i in range(6)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = dict(BatchScheduler(pool, {"shared": 1.0}, factory).run(lines))
+    return {index: json.loads(record)["shared"] for index, record in results.items()}
+
+
+def test_shared_key_computed_once():
+    scores = run_shared(fail=False)
+    assert sorted(SharedMetric.fetched) == ["https://github.com/org/other", "https://github.com/org/repo"]
+    assert set(scores.values()) == {0.3} and len(scores) == 6
+
+
+def test_shared_key_failure_falls_back_to_own_fetch():
+    scores = run_shared(fail=True)
+    assert len(SharedMetric.fetched) == 6
+    assert set(scores.values()) == {0.0}
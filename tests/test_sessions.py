@@ -0,0 +1,75 @@
+"""
+test_sessions.py
+---------------
+Basic unit tests for the process-wide client registry.
+
+Tests cover:
+- one pooled session / HfApi / Github client per process
+- retry and pool size configuration; rate limits (429/403) left to
+  src/ratelimit.py, including for the Github client
+- clients rebuilt after a fork
+- Hub progress bars and non-error logging silenced by configure_sessions
+"""
+
+from huggingface_hub.utils import are_progress_bars_disabled, enable_progress_bars
+from huggingface_hub.utils import logging as hf_logging
+
+from src import sessions
+from src.sessions import SessionRegistry
+
+
+def test_clients_shared_within_process():
+    registry = SessionRegistry()
+    assert registry.http_session() is registry.http_session()
+    assert registry.hf_api() is registry.hf_api()
+    assert registry.github() is registry.github()
+
+
+def test_session_pool_and_retry_config():
+    registry = SessionRegistry(pool_size=7, retries=5, backoff=0.1)
+    adapter = registry.http_session().get_adapter("https://huggingface.co")
+
+    assert adapter._pool_maxsize == 7
+    assert adapter.max_retries.total == 5
+    assert 503 in adapter.max_retries.status_forcelist
+
+
+def test_retry_leaves_rate_limits_alone():
+    retry = SessionRegistry(retries=3).new_retry()
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("GET", 429, has_retry_after=True)
+    assert not retry.is_retry("GET", 403, has_retry_after=True)
+
+    requester = SessionRegistry().github().requester
+    assert type(requester._Requester__retry) is sessions.TransientRetry
+
+
+def test_clients_rebuilt_after_fork(monkeypatch):
+    registry = SessionRegistry()
+    session = registry.http_session()
+
+    monkeypatch.setattr(sessions.os, "getpid", lambda: -1)
+    assert registry.http_session() is not session
+
+
+def test_configure_sessions_replaces_registry(monkeypatch):
+    factories = []
+    monkeypatch.setattr(sessions, "configure_http_backend", lambda backend_factory: factories.append(backend_factory))
+    monkeypatch.setattr(sessions, "_registry", sessions._registry)
+
+    registry = sessions.configure_sessions(pool_size=4, retries=1)
+    assert sessions.get_http_session() is registry.http_session()
+    assert factories == [registry.new_http_session]
+
+
+def test_configure_sessions_silences_hub(monkeypatch):
+    monkeypatch.setattr(sessions, "configure_http_backend", lambda backend_factory: None)
+    monkeypatch.setattr(sessions, "_registry", sessions._registry)
+    verbosity = hf_logging.get_verbosity()
+    try:
+        sessions.configure_sessions()
+        assert are_progress_bars_disabled()
+        assert hf_logging.get_verbosity() == hf_logging.ERROR
+    finally:
+        enable_progress_bars()
+        hf_logging.set_verbosity(verbosity)
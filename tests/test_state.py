@@ -0,0 +1,162 @@
+"""
+test_state.py
+---------------
+Basic unit tests for incremental re-scoring.
+
+Tests cover:
+- restore only when every dependent revision is unchanged
+- unknown revisions and failed metrics are never reused
+- a new score version, GenAI template or base model revision invalidates
+- state persisted to disk
+- scheduler skips unchanged metrics on a second run, and the prefetch
+  when every metric of the line is reusable
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from src.cli.url import CodeURL, DatasetURL, ModelURL
+from src.metadata import ModelMetadata
+from src.metrics.metric import Metric
+from src.scheduler import BatchScheduler
+from src.state import ScoreState
+
+
+class ModelMetric(Metric):
+    runs = 0
+
+    def __init__(self, name="model_metric"):
+        super().__init__(name)
+
+    def calculate_score(self) -> float:
+        type(self).runs += 1
+        return 0.7
+
+
+class CodeMetric(ModelMetric):
+    depends_on = ("model", "code")
+    runs = 0
+
+
+REVISIONS = {"model": "owner/model@a", "code": "org/repo@b", "dataset": ""}
+
+
+def finished(metric):
+    metric.run()
+    return metric
+
+
+def test_restore_when_unchanged(tmp_path):
+    state = ScoreState(str(tmp_path / "state.json"))
+    state.update("m", [finished(ModelMetric()), finished(CodeMetric("code_metric"))], REVISIONS)
+
+    model_metric = ModelMetric()
+    assert state.restore("m", model_metric, dict(REVISIONS, code="org/repo@c"))
+    assert model_metric.score == 0.7
+
+    # code HEAD moved -> code-dependent metric recomputed
+    assert not state.restore("m", CodeMetric("code_metric"), dict(REVISIONS, code="org/repo@c"))
+
+
+def test_unknown_revision_never_reused(tmp_path):
+    state = ScoreState(str(tmp_path / "state.json"))
+    unknown = dict(REVISIONS, model=None)
+    state.update("m", [finished(ModelMetric())], unknown)
+    assert not state.restore("m", ModelMetric(), unknown)
+
+
+def test_failed_metric_not_recorded(tmp_path):
+    state = ScoreState(str(tmp_path / "state.json"))
+    metric = ModelMetric()
+    metric.set_fallback_score()
+    state.update("m", [metric], REVISIONS)
+    assert not state.restore("m", ModelMetric(), REVISIONS)
+
+
+def test_save_and_reload(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = ScoreState(path)
+    state.update("m", [finished(ModelMetric())], REVISIONS)
+    state.save()
+
+    assert ScoreState(path).entries["m"]["revisions"] == REVISIONS
+
+
+def test_version_template_and_base_model_invalidate(tmp_path, monkeypatch):
+    from src.metrics.code_quality import CodeQualityMetric
+    from src.metrics.ramp_up_time import RampUpTimeMetric
+
+    state = ScoreState(str(tmp_path / "state.json"))
+    model_url = ModelURL("https://huggingface.co/owner/model")
+    revisions = dict(REVISIONS, base_model="org/base@1")
+    llm, code = RampUpTimeMetric(model_url), CodeQualityMetric(None, model_url)
+    for metric in (llm, code):
+        metric.score, metric.latency = 0.5, 10
+    state.update("m", [ModelMetric(), llm, code], revisions)
+    state.entries["m"]["metrics"]["model_metric"] = {
+        "inputs": {"model": "owner/model@a", "version": 0}, "score": 0.7, "latency": 1}
+
+    assert not state.restore("m", ModelMetric(), revisions)
+    assert state.restore("m", RampUpTimeMetric(model_url), revisions)
+    monkeypatch.setattr(RampUpTimeMetric, "TEMPLATE_VERSION", RampUpTimeMetric.TEMPLATE_VERSION + 1)
+    assert not state.restore("m", RampUpTimeMetric(model_url), revisions)
+
+    assert state.restore("m", CodeQualityMetric(None, model_url), revisions)
+    assert not state.restore("m", CodeQualityMetric(None, model_url), dict(revisions, base_model="org/base@2"))
+
+
+def test_resolve_base_model_revision(monkeypatch):
+    shas = {"owner/model": ("sha1", "org/base"), "org/base": ("sha2", None)}
+    monkeypatch.setattr("src.metadata.model_revision", lambda repo: shas[repo])
+
+    metadata = ModelMetadata(ModelURL("https://huggingface.co/owner/model"))
+    assert metadata.resolve_revisions(None, None)["base_model"] == "org/base@sha2"
+
+
+def test_resolve_revisions(monkeypatch):
+    monkeypatch.setattr("src.metadata.model_revision", lambda repo: ("sha1", None))
+    monkeypatch.setattr("src.metadata.get_head_sha", lambda owner, repo: "head1")
+    monkeypatch.setattr("src.metadata.dataset_revision", lambda url: (_ for _ in ()).throw(RuntimeError()))
+
+    metadata = ModelMetadata(ModelURL("https://huggingface.co/owner/model"))
+    revisions = metadata.resolve_revisions(
+        CodeURL("https://github.com/org/repo"),
+        DatasetURL("https://huggingface.co/datasets/org/data"),
+    )
+    assert revisions == {"model": "owner/model@sha1", "code": "org/repo@head1", "dataset": None, "base_model": ""}
+    assert metadata.revision == "sha1"
+
+    assert metadata.resolve_revisions(None, None)["code"] == ""
+
+
+def test_scheduler_reuses_unchanged_metrics(tmp_path, monkeypatch):
+    prefetched = []
+    original = ModelMetadata.prefetch
+    monkeypatch.setattr(ModelMetadata, "prefetch", lambda self: prefetched.append(1) or original(self))
+
+    class DummyApi:
+        def model_info(self, repo_id, revision=None, **kwargs):
+            return repo_id
+
+    monkeypatch.setattr("src.metadata.get_hf_api", lambda: DummyApi())
+    monkeypatch.setattr("src.metadata.model_revision", lambda repo: ("sha1", None))
+
+    def factory(code_url, dataset_url, model_url):
+        return [ModelMetric("a"), CodeMetric("b")]
+
+    lines = [[None, None, ModelURL("https://huggingface.co/owner/model")]]
+    state = ScoreState(str(tmp_path / "state.json"))
+
+    def run():
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            return dict(BatchScheduler(pool, {"a": 0.5, "b": 0.5}, factory, state).run(lines))
+
+    ModelMetric.runs = CodeMetric.runs = 0
+    first = run()
+    assert ModelMetric.runs == 1 and CodeMetric.runs == 1
+    assert len(prefetched) == 1
+
+    second = run()
+    assert ModelMetric.runs == 1 and CodeMetric.runs == 1
+    # Only the revision lookups: nothing left to compute needs model_info or the README
+    assert len(prefetched) == 1
+    assert first[0].split('"net_score_latency"')[0] == second[0].split('"net_score_latency"')[0]
@@ -0,0 +1,102 @@
+"""
+test_stats.py
+---------------
+Unit tests for src/stats.py.
+
+Tests cover:
+- count() only collects inside counting() with stats enabled
+- upstream classification by longest endpoint prefix, else host
+- cache hits / misses and HTTP calls counted per source / upstream
+- RunStats report: latency histogram, percentiles, fallbacks, ratios
+"""
+
+import json
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from src import stats
+from src.cache import ResponseCache
+from src.stats import RunStats, count, counting
+
+
+@pytest.fixture
+def stats_on(monkeypatch):
+    # Flip the flag only; the HTTP hook is exercised directly
+    monkeypatch.setattr(stats, "_enabled", True)
+    monkeypatch.setattr(stats, "_upstreams", {
+        "hub": "http://stub", "github": "http://stub/github", "genai": "http://stub/api/chat",
+    })
+
+
+def metric(name, latency, failed=False, timed_out=False, counts=None):
+    return SimpleNamespace(name=name, latency=latency, failed=failed, timed_out=timed_out,
+                           counts=counts or Counter())
+
+
+def test_count_noop_when_disabled():
+    counter = Counter()
+    with counting(counter):
+        count("http", "hub")
+    assert not counter
+
+
+def test_counting_collects(stats_on):
+    with counting(Counter()) as counter:
+        count("http", "hub")
+        count("http", "hub", n=2)
+    count("http", "hub")  # outside any block
+    assert counter == Counter({("http", "hub"): 3})
+
+
+def test_upstream_longest_prefix(stats_on):
+    assert stats.upstream("http://stub/api/models/org/m") == "hub"
+    assert stats.upstream("http://stub/github/repos/o/r") == "github"
+    assert stats.upstream("http://stub/api/chat/completions") == "genai"
+    assert stats.upstream("https://cdn.example.org/file") == "cdn.example.org"
+
+
+def test_http_hook_counts_calls_and_errors(stats_on):
+    request = SimpleNamespace(url="http://stub/github/user")
+    with counting(Counter()) as counter:
+        stats._http_hook(request, lambda r: SimpleNamespace(status_code=200))
+        stats._http_hook(request, lambda r: SimpleNamespace(status_code=403))
+    assert counter == Counter({("http", "github"): 2, ("http_errors", "github"): 1})
+
+
+def test_cache_hits_and_misses_counted(tmp_path, stats_on):
+    cache = ResponseCache(str(tmp_path))
+    with counting(Counter()) as counter:
+        cache.get_or_fetch("hub", "k", lambda: 1)
+        cache.get_or_fetch("hub", "k", lambda: 2)
+    assert counter == Counter({("cache", "hub", "miss"): 1, ("cache", "hub", "hit"): 1})
+
+
+def test_run_stats_report(tmp_path):
+    run = RunStats()
+    run.skipped = 1
+    run.add_model([metric("license", 5), metric("code_quality", 300, failed=True)])
+    run.add_model([metric("license", 40, counts=Counter({("cache", "hub", "hit"): 3, ("cache", "hub", "miss"): 1})),
+                   metric("code_quality", 60000, failed=True, timed_out=True,
+                          counts=Counter({("http", "hub"): 4, ("http_errors", "hub"): 1}))])
+    run.add_counts(Counter({("http", "genai"): 1, ("http_retries", "genai"): 2}))
+
+    path = tmp_path / "stats.json"
+    run.write(str(path))
+    report = json.loads(path.read_text())
+
+    assert report["models"] == 2 and report["skipped_lines"] == 1
+    assert report["wall_s"] >= 0 and report["cpu_s"] >= 0
+
+    license = report["metrics"]["license"]
+    assert license["count"] == 2 and license["p50_ms"] == 5 and license["max_ms"] == 40
+    assert license["histogram_ms"]["<=10"] == 1 and license["histogram_ms"]["<=50"] == 1
+
+    code_quality = report["metrics"]["code_quality"]
+    assert code_quality["failed"] == 2 and code_quality["timed_out"] == 1
+    assert code_quality["histogram_ms"][">30000"] == 1
+
+    assert report["cache"] == {"hub": {"hits": 3, "misses": 1, "hit_ratio": 0.75}}
+    assert report["http"] == {"genai": {"calls": 1, "errors": 0, "retries": 2},
+                              "hub": {"calls": 4, "errors": 1, "retries": 0}}
@@ -0,0 +1,110 @@
+"""
+test_stub_server.py
+---------------
+Basic unit tests for the local Hub / GitHub / GenAI stand-in server.
+
+Tests cover:
+- HfApi.model_info and file downloads served by the stub
+- contributor counting through the Link header
+- single and batched GenAI completions
+- injected latency, errors, rate limits and payload sizes
+- clients hanging up mid-response are not reported as server errors
+"""
+
+import json
+
+import pytest
+import requests
+from github import Github
+from huggingface_hub import HfApi, hf_hub_download
+
+from src.stub_server import StubConfig, StubHTTPServer, StubServer, contributor_count, model_files, model_info
+
+
+@pytest.fixture(scope="module")
+def server():
+    with StubServer() as stub:
+        yield stub
+
+
+def test_model_info_and_download(server, tmp_path):
+    info = HfApi(endpoint=server.url).model_info("org/model")
+    assert info.safetensors.total > 0
+    assert any(s.rfilename.endswith(".py") for s in info.siblings)
+    assert all(s.size is None for s in info.siblings)
+
+    sized = HfApi(endpoint=server.url).model_info("org/model", files_metadata=True)
+    readme = next(s for s in sized.siblings if s.rfilename == "README.md")
+    assert readme.size == len(model_files("org/model")["README.md"].encode())
+
+    path = hf_hub_download("org/model", "README.md", endpoint=server.url, cache_dir=str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == model_files("org/model")["README.md"]
+
+
+def test_contributor_count(server):
+    gh = Github(base_url=server.env()["GITHUB_API_URL"], retry=0)
+    contributors = gh.get_repo("org/repo", lazy=True).get_contributors()
+    assert contributors.totalCount == contributor_count("org/repo")
+    assert len(list(contributors)) == contributor_count("org/repo")
+
+
+def test_genai_completion(server):
+    url = server.env()["GENAI_URL"]
+    single = requests.post(url, json={"messages": [{"role": "user", "content": "rate"}]}).json()
+    assert 0.0 <= float(single["choices"][0]["message"]["content"]) <= 1.0
+
+    batch = requests.post(url, json={"messages": [{"role": "user", "content": "### Item id: a\nx\n### Item id: b\ny"}]})
+    assert set(json.loads(batch.json()["choices"][0]["message"]["content"])) == {"a", "b"}
+
+
+def test_injected_latency_and_errors():
+    import time
+
+    with StubServer(StubConfig(latency_ms=50, error_rate=1.0)) as stub:
+        start = time.perf_counter()
+        response = requests.get(f"{stub.url}/api/models/org/model")
+        assert time.perf_counter() - start >= 0.05
+        assert response.status_code == 503
+
+
+def test_rate_limit_headers():
+    with StubServer(StubConfig(rate_limit=2)) as stub:
+        first = requests.get(f"{stub.url}/github/repos/org/repo/contributors")
+        assert first.headers["X-RateLimit-Limit"] == "2"
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+
+        requests.get(f"{stub.url}/github/user")
+        assert requests.get(f"{stub.url}/github/user").status_code == 403
+
+        # Separate budget per upstream; Hub answers 429 with Retry-After
+        requests.get(f"{stub.url}/api/models/org/model")
+        requests.get(f"{stub.url}/api/models/org/model")
+        limited = requests.get(f"{stub.url}/api/models/org/model")
+        assert limited.status_code == 429 and int(limited.headers["Retry-After"]) >= 1
+
+
+def test_payload_sizes():
+    config = StubConfig(readme_bytes=10000, py_files=5, py_lines=100, extra_siblings=20)
+    files = model_files("org/model", config)
+
+    assert len(files["README.md"]) >= 10000
+    assert len([name for name in files if name.endswith(".py")]) == 5
+    assert files["module_0.py"].count("\n") > 100
+    assert len(model_info("org/model", config)["siblings"]) == 26
+
+
+def test_client_disconnects_not_reported(capsys):
+    httpd = StubHTTPServer(("127.0.0.1", 0), StubConfig())
+    try:
+        for exc in (BrokenPipeError(), ConnectionResetError(), ValueError("bug")):
+            try:
+                raise exc
+            except Exception:
+                httpd.handle_error(None, ("127.0.0.1", 0))
+    finally:
+        httpd.server_close()
+
+    err = capsys.readouterr().err
+    assert "ValueError" in err
+    assert "BrokenPipeError" not in err and "ConnectionResetError" not in err
@@ -0,0 +1,114 @@
+"""
+test_tracing.py
+---------------
+Unit tests for src/tracing.py.
+
+Tests cover:
+- span() is a no-op when tracing is off
+- nested spans keep their parent ids and attributes
+- Metric.run records get_data / score phases with finer spans underneath
+- TraceWriter JSONL and OTLP exports
+"""
+
+import json
+
+import pytest
+
+from src import tracing
+from src.metrics.metric import Metric
+from src.tracing import TraceWriter, collect, new_span, span
+
+
+@pytest.fixture
+def tracing_on(monkeypatch):
+    # Flip the flag only; the HTTP hook is not needed here
+    monkeypatch.setattr(tracing, "_enabled", True)
+
+
+class DownloadMetric(Metric):
+    def __init__(self):
+        super().__init__("dummy")
+
+    def get_data(self):
+        with span("download", file="a.py"):
+            pass
+        return {"x": 1}
+
+    def calculate_score(self):
+        return 1.0
+
+
+def test_span_noop_when_disabled():
+    spans = []
+    with collect(spans, "root"):
+        with span("child") as attrs:
+            attrs["x"] = 1
+    assert spans == []
+
+
+def test_nested_spans_link_parents(tracing_on):
+    spans = []
+    with collect(spans, "root", kind="test"):
+        with span("child") as attrs:
+            attrs["status"] = 200
+
+    child, root = spans
+    assert root.name == "root" and root.parent_id is None and root.attrs == {"kind": "test"}
+    assert child.parent_id == root.span_id and child.attrs == {"status": 200}
+    assert root.start_ns <= child.start_ns and child.end_ns <= root.end_ns
+
+
+def test_metric_run_records_phases(tracing_on):
+    m = DownloadMetric()
+    m.run()
+
+    names = {s.name: s for s in m.spans}
+    assert set(names) == {"metric", "get_data", "score", "download"}
+    assert names["download"].parent_id == names["get_data"].span_id
+    assert names["get_data"].parent_id == names["metric"].span_id
+    assert names["metric"].attrs["failed"] is False
+
+
+def test_metric_run_with_timeout_keeps_spans(tracing_on):
+    m = DownloadMetric()
+    m.timeout = 5
+    m.run()
+    assert "download" in {s.name for s in m.spans}
+
+
+def test_trace_writer_jsonl(tmp_path, tracing_on):
+    m = DownloadMetric()
+    m.run()
+
+    path = tmp_path / "trace.jsonl"
+    with TraceWriter(str(path)) as writer:
+        writer.write_model("https://huggingface.co/o/m", 1.0, 2.0,
+                           [({"metric": m.name}, m.spans), ({}, [new_span("prefetch", 1.0, 1.5)])])
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    root = rows[0]
+    assert root["name"] == "model" and root["duration_ns"] == 1_000_000_000
+    assert {row["trace_id"] for row in rows} == {root["trace_id"]}
+    by_name = {row["name"]: row for row in rows}
+    assert by_name["metric"]["parent_id"] == root["span_id"]
+    assert by_name["download"]["metric"] == "dummy"
+    assert by_name["prefetch"]["parent_id"] == root["span_id"]
+
+
+def test_trace_writer_otlp(tmp_path):
+    path = tmp_path / "trace.json"
+    with TraceWriter(str(path), "otlp") as writer:
+        writer.write_model("m", 1.0, 2.0, [({"metric": "x"}, [new_span("prefetch", 1.0, 1.5, files=2)])])
+
+    request = json.loads(path.read_text())
+    spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, child = spans
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+    assert child["parentSpanId"] == root["spanId"]
+    assert child["endTimeUnixNano"] == "1500000000"
+    assert {"key": "files", "value": {"intValue": "2"}} in child["attributes"]
+
+
+def test_trace_writer_rejects_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        TraceWriter(str(tmp_path / "t"), "xml")
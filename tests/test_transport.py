@@ -0,0 +1,79 @@
+"""
+test_transport.py
+---------------
+Basic unit tests for the HTTP hook chain and record/replay.
+
+Tests cover:
+- responses recorded to disk and replayed without the network
+- missing fixtures fail like a connection error
+- latency profiles
+- fixtures recorded by the blocking path replay on the async path
+"""
+
+import asyncio
+
+import pytest
+import requests
+
+from src import transport
+from src.transport import LatencyProfile
+
+
+@pytest.fixture
+def network(monkeypatch):
+    """Fake upstream behind HTTPAdapter.send; records every request it sees."""
+    seen = []
+
+    def send(adapter, request, **kwargs):
+        seen.append(request.url)
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = b'{"answer": 42}'
+        response.url = request.url
+        return response
+
+    monkeypatch.setattr(transport, "_original_send", send)
+    yield seen
+    transport.configure_transport()
+
+
+def test_record_then_replay(tmp_path, network):
+    transport.configure_transport(record_dir=str(tmp_path))
+    assert requests.get("https://huggingface.co/api/models/a/b").json() == {"answer": 42}
+    assert len(network) == 1
+
+    transport.configure_transport(replay_dir=str(tmp_path))
+    response = requests.get("https://huggingface.co/api/models/a/b")
+    assert response.status_code == 200 and response.json() == {"answer": 42}
+    assert len(network) == 1
+
+
+def test_replay_missing_fixture(tmp_path, network):
+    transport.configure_transport(replay_dir=str(tmp_path))
+    with pytest.raises(requests.ConnectionError):
+        requests.get("https://api.github.com/repos/org/repo")
+    assert network == []
+
+
+def test_latency_profile():
+    assert LatencyProfile.parse(None).delay("https://x.org/a", 0.3) == 0.0
+    assert LatencyProfile.parse("recorded").delay("https://x.org/a", 0.3) == 0.3
+    assert LatencyProfile.parse("250").delay("https://x.org/a", 0.3) == 0.25
+
+    profile = LatencyProfile.parse("huggingface.co=100, *=20")
+    assert profile.delay("https://huggingface.co/api", 0) == 0.1
+    assert profile.delay("https://api.github.com/x", 0) == 0.02
+
+
+def test_async_replays_blocking_recording(tmp_path, network):
+    url = "https://genai.example/api/chat/completions"
+    body = {"model": "m", "messages": [{"role": "user", "content": "rate"}]}
+
+    transport.configure_transport(record_dir=str(tmp_path))
+    requests.post(url, json=body)
+
+    transport.configure_transport(replay_dir=str(tmp_path))
+    response = asyncio.run(transport.request_async(None, "POST", url, json_body=body))
+    assert response.json() == {"answer": 42}
+    assert len(network) == 1